@@ -0,0 +1,179 @@
+"""
+Headless benchmark suite for inventory, crafting and cooking hot paths.
+
+    python -m bench.bench                                  # all ops, default sizes
+    python -m bench.bench --ops add,sort --capacity 64
+    python -m bench.bench --save bench/baselines/local.json
+    python -m bench.bench --compare bench/baselines/local.json --tolerance 0.15
+    python -m bench.bench --ops craft --profile craft.folded
+
+Exit status is 1 when --compare finds an op slower than the baseline by more
+than the tolerance.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from bench.scenarios import Params, Workload, WORKLOADS, opNames
+from profiling.hooks import profiled
+
+def timeWorkload(w : Workload, p : Params, *, min_time : float = 0.2, max_rounds : int = 1000) -> Dict[str, float]:
+    """
+    Run fresh rounds of the workload until min_time of op time has accumulated.
+    Setup cost is excluded; only the op loop is timed.
+    """
+    rng = random.Random(p.seed)
+    n = w.size(p)
+    total_ops = 0
+    total_time = 0.0
+    rounds = 0
+    while total_time < min_time and rounds < max_rounds:
+        state = w.setup(p, rng)
+        op = w.op
+        t0 = time.perf_counter()
+        for i in range(n):
+            op(state, i)
+        total_time += time.perf_counter() - t0
+        total_ops += n
+        rounds += 1
+
+    return {
+        "ops" : total_ops,
+        "seconds" : total_time,
+        "ops_per_sec" : total_ops / total_time if total_time > 0 else 0.0,
+    }
+
+def measureAllocations(w : Workload, p : Params) -> Dict[str, float]:
+    """
+    One extra round under tracemalloc: peak and retained bytes, per op.
+    Kept separate from timing since tracing slows every allocation down.
+    """
+    rng = random.Random(p.seed)
+    n = w.size(p)
+    state = w.setup(p, rng)
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot()
+        for i in range(n):
+            w.op(state, i)
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(max(0, s.count_diff) for s in after.compare_to(before, "lineno"))
+
+    return {
+        "alloc_peak_bytes_per_op" : (peak - base) / n if n else 0.0,
+        "alloc_retained_bytes_per_op" : (current - base) / n if n else 0.0,
+        "alloc_blocks_per_op" : blocks / n if n else 0.0,
+    }
+
+def runSuite(p : Params, ops : List[str], *, min_time : float = 0.2,
+             allocations : bool = True) -> Dict[str, Dict[str, float]]:
+    results : Dict[str, Dict[str, float]] = {}
+    for name in ops:
+        w = WORKLOADS[name]
+        res = timeWorkload(w, p, min_time = min_time)
+        if allocations:
+            res.update(measureAllocations(w, p))
+        results[name] = res
+
+    return results
+
+def formatTable(results : Dict[str, Dict[str, float]]) -> str:
+    lines = [f"{'op':<10} {'ops/sec':>14} {'peak B/op':>11} {'kept B/op':>11} {'blocks/op':>10}"]
+    for name, r in results.items():
+        lines.append(f"{name:<10} {r['ops_per_sec']:>14,.0f} "
+                     f"{r.get('alloc_peak_bytes_per_op', 0.0):>11.1f} "
+                     f"{r.get('alloc_retained_bytes_per_op', 0.0):>11.1f} "
+                     f"{r.get('alloc_blocks_per_op', 0.0):>10.2f}")
+
+    return "\n".join(lines)
+
+def saveBaseline(path : Path, p : Params, results : Dict[str, Dict[str, float]]) -> None:
+    path.parent.mkdir(parents = True, exist_ok = True)
+    doc = {
+        "params" : asdict(p),
+        "python" : sys.version.split()[0],
+        "created" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results" : results,
+    }
+    path.write_text(json.dumps(doc, indent = 2), encoding = "utf-8")
+
+def compareBaseline(path : Path, p : Params, results : Dict[str, Dict[str, float]],
+                    tolerance : float) -> List[str]:
+    """
+    Return one message per op that regressed more than 'tolerance' (a fraction)
+    against the saved baseline. Ops missing from either side are skipped.
+    """
+    doc = json.loads(path.read_text(encoding = "utf-8"))
+    if doc.get("params") != asdict(p):
+        print(f"note: baseline params {doc.get('params')} differ from current {asdict(p)}")
+    regressions : List[str] = []
+    for name, r in results.items():
+        old = doc.get("results", {}).get(name)
+        if not old or not old.get("ops_per_sec"):
+            continue
+        change = r["ops_per_sec"] / old["ops_per_sec"] - 1.0
+        status = "REGRESSION" if change < -tolerance else "ok"
+        print(f"{name:<10} {old['ops_per_sec']:>14,.0f} -> {r['ops_per_sec']:>14,.0f} ({change:+.1%}) {status}")
+        if change < -tolerance:
+            regressions.append(f"{name}: {change:+.1%}")
+
+    return regressions
+
+def main(argv : Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--ops", default = ",".join(opNames()), help = "comma separated subset of: " + ", ".join(opNames()))
+    ap.add_argument("--capacity", type = int, default = Params.capacity, help = "inventory slots")
+    ap.add_argument("--catalog", type = int, default = Params.catalog, help = "number of item defs")
+    ap.add_argument("--recipes", type = int, default = Params.recipes, help = "crafting/cooking recipe count")
+    ap.add_argument("--stations", type = int, default = Params.stations, help = "cooking stations advanced per round")
+    ap.add_argument("--chests", type = int, default = Params.chests, help = "linked chests in the storage network")
+    ap.add_argument("--seed", type = int, default = Params.seed)
+    ap.add_argument("--min-time", type = float, default = 0.2, help = "seconds of timed ops per workload")
+    ap.add_argument("--no-alloc", action = "store_true", help = "skip the tracemalloc pass")
+    ap.add_argument("--save", type = Path, help = "write results as a JSON baseline")
+    ap.add_argument("--compare", type = Path, help = "compare against a JSON baseline")
+    ap.add_argument("--tolerance", type = float, default = 0.15, help = "allowed ops/sec drop vs baseline")
+    ap.add_argument("--profile", type = Path, help = "run once more with hot-path hooks; write collapsed stacks here")
+    args = ap.parse_args(argv)
+
+    ops = [o.strip() for o in args.ops.split(",") if o.strip()]
+    unknown = [o for o in ops if o not in WORKLOADS]
+    if unknown:
+        ap.error(f"unknown ops: {', '.join(unknown)}")
+
+    p = Params(capacity = args.capacity, catalog = args.catalog, recipes = args.recipes,
+               stations = args.stations, chests = args.chests, seed = args.seed)
+    results = runSuite(p, ops, min_time = args.min_time, allocations = not args.no_alloc)
+    print(formatTable(results))
+
+    if args.profile:
+        # separate pass: the hooks would skew the timings above
+        with profiled() as prof:
+            runSuite(p, ops, min_time = args.min_time, allocations = False)
+        print(prof.table())
+        prof.writeCollapsed(args.profile)
+        print(f"collapsed stacks -> {args.profile}")
+
+    if args.save:
+        saveBaseline(args.save, p, results)
+        print(f"saved baseline -> {args.save}")
+    if args.compare:
+        regressions = compareBaseline(args.compare, p, results, args.tolerance)
+        if regressions:
+            print("regressions: " + "; ".join(regressions))
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
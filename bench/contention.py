@@ -0,0 +1,107 @@
+"""
+Multi-thread contention benchmark for a shared chest.
+
+Each thread plays one player handler: random deposits and withdrawals
+against one ConcurrentInventory. Checks that no item was created or lost
+and reports throughput per thread count.
+
+    python -m bench.contention
+    python -m bench.contention --threads 1,2,4,8,16 --ops 4000 --capacity 64
+
+Throughput is bounded by the interpreter lock on a standard CPython build,
+so it should stay flat as threads are added; a drop means lock overhead.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bench.scenarios import makeCatalog, idsWithTag
+from inventory.inventory import Inventory
+from inventory.concurrent import ConcurrentInventory
+
+def makeSchedule(ids : List[str], n : int, seed : int) -> List[Tuple[bool, str, int]]:
+    rng = random.Random(seed)
+    return [(rng.random() < 0.5, rng.choice(ids), rng.randint(1, 8)) for _ in range(n)]
+
+def runThreads(inv : Inventory, schedules : List[List[Tuple[bool, str, int]]]) -> Tuple[float, Counter]:
+    """Run one thread per schedule; returns (seconds, net items moved in per id)."""
+    nets = [Counter() for _ in schedules]
+    barrier = threading.Barrier(len(schedules) + 1)
+
+    def worker(k : int) -> None:
+        net = nets[k]
+        barrier.wait()
+        for deposit, item_id, qty in schedules[k]:
+            if deposit:
+                net[item_id] += inv.add(item_id, qty)
+            else:
+                net[item_id] -= inv.remove(item_id, qty)
+
+    threads = [threading.Thread(target = worker, args = (k,)) for k in range(len(schedules))]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - t0
+    total : Counter = Counter()
+    for net in nets:
+        total.update(net)
+
+    return seconds, total
+
+def conserved(inv : Inventory, start : Dict[str, int], net : Counter) -> bool:
+    ids = set(start) | set(net)
+    return all(inv.count(i) == start.get(i, 0) + net.get(i, 0) for i in ids)
+
+def trial(make : Callable[[], Inventory], ids : List[str], threads : int, ops : int, seed : int) -> Dict[str, float]:
+    inv = make()
+    rng = random.Random(seed)
+    for item_id in rng.sample(ids, k = min(len(ids), inv.capacity // 2)):
+        inv.add(item_id, rng.randint(1, inv._maxStack(item_id)))
+    start = {i : inv.count(i) for i in ids}
+    schedules = [makeSchedule(ids, ops // threads, seed + k) for k in range(threads)]
+    seconds, net = runThreads(inv, schedules)
+    total_ops = sum(len(s) for s in schedules)
+
+    return {
+        "ops_per_sec" : total_ops / seconds if seconds > 0 else 0.0,
+        "conflicts" : getattr(inv, "conflicts", 0),
+        "conflict_rate" : getattr(inv, "conflicts", 0) / total_ops if total_ops else 0.0,
+        "ok" : conserved(inv, start, net),
+    }
+
+def main(argv : Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--threads", default = "1,2,4,8")
+    ap.add_argument("--ops", type = int, default = 8000, help = "operations per trial, split across threads")
+    ap.add_argument("--capacity", type = int, default = 64)
+    ap.add_argument("--catalog", type = int, default = 40)
+    ap.add_argument("--seed", type = int, default = 1234)
+    args = ap.parse_args(argv)
+
+    items = makeCatalog(args.catalog, args.seed)
+    ids = idsWithTag(items, "material") or list(items.defs)
+    kinds = {
+        "locked" : lambda : ConcurrentInventory(args.capacity, items),
+    }
+
+    status = 0
+    print(f"{'inventory':<10} {'threads':>7} {'ops/sec':>12} {'conflicts':>10} {'rate':>7}  check")
+    for n in [int(t) for t in args.threads.split(",") if t.strip()]:
+        for name, make in kinds.items():
+            r = trial(make, ids, n, args.ops, args.seed)
+            print(f"{name:<10} {n:>7} {r['ops_per_sec']:>12,.0f} {r['conflicts']:>10} "
+                  f"{r['conflict_rate']:>6.1%}  {'ok' if r['ok'] else 'ITEMS LOST/CREATED'}")
+            if not r["ok"]:
+                status = 1
+
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
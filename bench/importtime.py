@@ -0,0 +1,119 @@
+"""
+Cold-start import cost of the headless simulation modules, measured with
+'python -X importtime' in fresh interpreters.
+
+    python -m bench.importtime
+    python -m bench.importtime --save bench/baselines/import.json
+    python -m bench.importtime --compare bench/baselines/import.json
+
+Also fails (exit 1) if importing a headless module drags in a module from
+FORBIDDEN, e.g. pygame on the dedicated server path.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEADLESS_MODULES : Tuple[str, ...] = (
+    "inventory.items",
+    "inventory.inventory",
+    "crafting.crafting",
+    "cooking.cooking",
+)
+
+# never imported as a side effect of importing a headless module
+FORBIDDEN : Tuple[str, ...] = ("pygame", "json5")
+
+def parseImportTime(stderr : str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse '-X importtime' lines into {module: (self_us, cumulative_us)}.
+    """
+    out : Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        out[name.strip()] = (int(self_us), int(cum_us))
+
+    return out
+
+def measure(module : str) -> Tuple[int, Dict[str, Tuple[int, int]], List[str]]:
+    """
+    Import 'module' in a fresh interpreter.
+    Returns (cumulative us, per-module timings, forbidden modules that got loaded).
+    """
+    probe = (f"import sys, {module}; "
+             f"print(','.join(m for m in {FORBIDDEN!r} if m in sys.modules))")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                          cwd = ROOT, capture_output = True, text = True, check = True)
+    timings = parseImportTime(proc.stderr)
+    leaked = [m for m in proc.stdout.strip().split(",") if m]
+
+    return timings.get(module, (0, 0))[1], timings, leaked
+
+def run(modules : List[str], repeats : int) -> Tuple[Dict[str, float], Dict[str, List[str]], Dict[str, Dict[str, Tuple[int, int]]]]:
+    medians : Dict[str, float] = {}
+    leaks : Dict[str, List[str]] = {}
+    last : Dict[str, Dict[str, Tuple[int, int]]] = {}
+    for module in modules:
+        samples = []
+        for _ in range(repeats):
+            cum, timings, leaked = measure(module)
+            samples.append(cum)
+            last[module] = timings
+            if leaked:
+                leaks[module] = leaked
+        medians[module] = statistics.median(samples)
+
+    return medians, leaks, last
+
+def main(argv : Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--modules", default = ",".join(HEADLESS_MODULES))
+    ap.add_argument("--repeats", type = int, default = 7, help = "fresh interpreters per module (median is reported)")
+    ap.add_argument("--top", type = int, default = 5, help = "show the N slowest dependencies by self time")
+    ap.add_argument("--save", type = Path)
+    ap.add_argument("--compare", type = Path)
+    ap.add_argument("--tolerance", type = float, default = 0.25, help = "allowed cumulative time growth vs baseline")
+    args = ap.parse_args(argv)
+
+    modules = [m.strip() for m in args.modules.split(",") if m.strip()]
+    medians, leaks, last = run(modules, args.repeats)
+
+    print(f"{'module':<24} {'cumulative ms':>14}")
+    for module, us in medians.items():
+        print(f"{module:<24} {us / 1000:>14.2f}")
+        slowest = sorted(last[module].items(), key = lambda kv : kv[1][0], reverse = True)[:args.top]
+        for name, (self_us, _) in slowest:
+            print(f"    {name:<32} self {self_us / 1000:>7.2f} ms")
+
+    status = 0
+    for module, leaked in leaks.items():
+        print(f"FORBIDDEN: importing {module} loaded {', '.join(leaked)}")
+        status = 1
+
+    if args.save:
+        args.save.parent.mkdir(parents = True, exist_ok = True)
+        args.save.write_text(json.dumps({"python" : sys.version.split()[0], "cumulative_us" : medians}, indent = 2),
+                             encoding = "utf-8")
+        print(f"saved baseline -> {args.save}")
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding = "utf-8")).get("cumulative_us", {})
+        for module, us in medians.items():
+            if module not in old or not old[module]:
+                continue
+            change = us / old[module] - 1.0
+            flag = "REGRESSION" if change > args.tolerance else "ok"
+            print(f"{module:<24} {old[module] / 1000:>8.2f} -> {us / 1000:>8.2f} ms ({change:+.1%}) {flag}")
+            if change > args.tolerance:
+                status = 1
+
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
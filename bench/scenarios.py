@@ -0,0 +1,353 @@
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+from inventory.items import ItemDef, Items
+from inventory.inventory import Inventory
+from crafting.crafting import Crafting, Recipe
+from crafting.solver import BundleSolver
+from cooking.cooking import CookingStation
+from cooking.recipes import CookingRecipe
+from cooking.hoppers import HopperNetwork
+from network.diff import Codebook, InventoryMirror, InventoryPublisher
+from storage.storage import Storage
+from storage.network import StorageNetwork
+
+@dataclass
+class Params:
+    capacity : int = 30
+    catalog : int = 200
+    recipes : int = 50
+    stations : int = 100
+    chests : int = 1000
+    seed : int = 1234
+
+@dataclass
+class Workload:
+    """
+    One benchmarked operation.
+    setup(params, rng) builds fresh state; op(state, i) performs the i-th op.
+    size(params) is the number of ops run against one setup.
+    """
+    name : str
+    setup : Callable[[Params, random.Random], object]
+    op : Callable[[object, int], object]
+    size : Callable[[Params], int]
+
+# <<----------- Synthetic catalog / recipes ----------->>
+def makeCatalog(n : int, seed : int = 1234) -> Items:
+    """
+    Build an Items catalog of n synthetic defs shaped like items.json:
+    mostly stackable materials and food, with ~1 in 10 weapons/armor.
+    """
+    rng = random.Random(seed)
+    defs : Dict[str, ItemDef] = {}
+    for i in range(n):
+        kind = i % 10
+        if kind == 0:
+            defs[f"weapon_{i}"] = ItemDef(id = f"weapon_{i}", name = f"Weapon {i:04d}", stack_size = 1,
+                                          weight = 3.0, tags = ("weapon", "craftable"),
+                                          base_damage = rng.randint(2, 20), max_durability = 100.0)
+        elif kind == 1:
+            defs[f"armor_{i}"] = ItemDef(id = f"armor_{i}", name = f"Armor {i:04d}", stack_size = 1,
+                                         weight = 1.0, tags = ("armor",),
+                                         max_durability = 60.0, base_protection = 1.0)
+        elif kind in (2, 3, 4):
+            defs[f"food_{i}"] = ItemDef(id = f"food_{i}", name = f"Food {i:04d}", stack_size = 20,
+                                        weight = 0.2, tags = ("food", "cookable"),
+                                        hunger_fill = 2.0, health_fill = 2.0)
+        else:
+            defs[f"mat_{i}"] = ItemDef(id = f"mat_{i}", name = f"Material {i:04d}", stack_size = 99,
+                                       weight = 0.1, tags = ("material",))
+
+    return Items(defs)
+
+def idsWithTag(items : Items, tag : str) -> List[str]:
+    return [d.id for d in items.defs.values() if tag in d.tags]
+
+def makeCraftingRecipes(items : Items, n : int, seed : int = 1234) -> Dict[str, Recipe]:
+    rng = random.Random(seed)
+    mats = idsWithTag(items, "material")
+    outs = idsWithTag(items, "weapon") + mats
+    recipes : Dict[str, Recipe] = {}
+    for i in range(n):
+        out = outs[i % len(outs)]
+        ins = rng.sample(mats, k = min(len(mats), rng.randint(1, 3)))
+        recipes[out] = Recipe(output_id = out, output_qty = 1 if out.startswith("weapon") else rng.randint(1, 4),
+                              inputs = [(m, rng.randint(1, 4)) for m in ins if m != out] or [(mats[0], 1)])
+
+    return recipes
+
+def makeCookingRecipes(items : Items, n : int, seed : int = 1234) -> Dict[str, CookingRecipe]:
+    """
+    Cooking outputs reuse food ids as both cooked and burned results so the
+    synthetic catalog needs no extra defs; only timing and counts matter here.
+    """
+    rng = random.Random(seed)
+    foods = idsWithTag(items, "food")
+    recipes : Dict[str, CookingRecipe] = {}
+    for i in range(n):
+        out = foods[i % len(foods)]
+        key = f"cook_{i}"
+        ins = rng.sample(foods, k = min(len(foods), rng.randint(1, 2)))
+        recipes[key] = CookingRecipe(key = key, inputs = [(f, 1) for f in ins], cooked_output = (out, 1),
+                                     burned_output = (foods[(i + 1) % len(foods)], 1),
+                                     cook_time = 5.0, burn_time = 5.0)
+
+    return recipes
+
+def fillRandom(inv : Inventory, rng : random.Random, ids : List[str], fraction : float = 0.75) -> None:
+    for i in range(int(inv.capacity * fraction)):
+        item_id = rng.choice(ids)
+        inv.add(item_id, rng.randint(1, inv._maxStack(item_id)))
+
+# <<----------- Workloads ----------->>
+def _setupAdd(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    ids = list(items.defs)
+    ops = [(rng.choice(ids), rng.randint(1, 40)) for _ in range(p.capacity)]
+    return Inventory(p.capacity, items), ops
+
+def _opAdd(state, i : int):
+    inv, ops = state
+    item_id, qty = ops[i]
+    return inv.add(item_id, qty)
+
+def _setupRemove(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    inv = Inventory(p.capacity, items)
+    fillRandom(inv, rng, list(items.defs), 1.0)
+    present = [s.item_id for s in inv.slots if s]
+    ops = [(rng.choice(present), rng.randint(1, 10)) for _ in range(p.capacity)]
+    return inv, ops
+
+def _opRemove(state, i : int):
+    inv, ops = state
+    item_id, qty = ops[i]
+    return inv.remove(item_id, qty)
+
+def _setupMove(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    inv = Inventory(p.capacity, items)
+    fillRandom(inv, rng, list(items.defs))
+    ops = [(rng.randrange(p.capacity), rng.randrange(p.capacity)) for _ in range(p.capacity * 4)]
+    return inv, ops
+
+def _opMove(state, i : int):
+    inv, ops = state
+    src, dst = ops[i]
+    return inv.move(src, dst)
+
+def _setupSort(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    ids = list(items.defs)
+    invs = []
+    for _ in range(32):
+        inv = Inventory(p.capacity, items)
+        fillRandom(inv, rng, ids)
+        invs.append(inv)
+    return invs
+
+def _opSort(state, i : int):
+    return state[i].sort()
+
+def _setupDescribe(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    inv = Inventory(p.capacity, items)
+    fillRandom(inv, rng, list(items.defs), 1.0)
+    return inv
+
+def _opDescribe(state, i : int):
+    # one detailed listing of the container, like Storage.showInventory(detailed = True)
+    return [state.describeSlot(j) for j in range(state.capacity)]
+
+def _setupNet(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    inv = Inventory(p.capacity, items)
+    ids = list(items.defs)
+    fillRandom(inv, rng, ids)
+    publisher = InventoryPublisher(inv, Codebook(items))
+    # alternate adds and removes so every op changes a slot or two
+    ops = [(rng.choice(ids), rng.randint(1, 5), bool(i % 2)) for i in range(p.capacity * 4)]
+    return inv, publisher, ops
+
+def _opEncodeDiff(state, i : int):
+    inv, publisher, ops = state
+    item_id, qty, take = ops[i]
+    if take:
+        inv.remove(item_id, qty)
+    else:
+        inv.add(item_id, qty)
+    return publisher.poll()
+
+def _setupDecodeDiff(p : Params, rng : random.Random):
+    inv, publisher, ops = _setupNet(p, rng)
+    mirror = InventoryMirror(publisher.codebook)
+    mirror.apply(publisher.full())
+    msgs = []
+    for i in range(len(ops)):
+        msgs.append(_opEncodeDiff((inv, publisher, ops), i))
+    return mirror, msgs
+
+def _opDecodeDiff(state, i : int):
+    mirror, msgs = state
+    return msgs[i] is not None and mirror.apply(msgs[i])
+
+def _setupCrafting(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    crafting = Crafting(items, recipes = makeCraftingRecipes(items, p.recipes, p.seed))
+    inv = Inventory(p.capacity, items)
+    mats = idsWithTag(items, "material")
+    # enough materials that most crafts succeed, leaving a few slots free for outputs
+    for _ in range(max(1, p.capacity - 4)):
+        inv.add(rng.choice(mats), 99)
+    keys = list(crafting.recipes)
+    return crafting, inv, [rng.choice(keys) for _ in range(p.recipes * 4)]
+
+def _opCanCraft(state, i : int):
+    crafting, inv, keys = state
+    return crafting.canCraft(inv, keys[i])
+
+def _opCraft(state, i : int):
+    crafting, inv, keys = state
+    return crafting.craft(inv, keys[i])
+
+# hits per combat volley in the wear workloads
+VOLLEY = 64
+
+def _setupWear(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    gear = idsWithTag(items, "weapon") + idsWithTag(items, "armor")
+    iids = [items.newInstance(rng.choice(gear)) for _ in range(p.stations)]
+    volleys = []
+    for _ in range(p.stations):
+        hits = [rng.choice(iids) for _ in range(VOLLEY)]
+        volleys.append((hits, [rng.uniform(0.001, 0.02) for _ in range(VOLLEY)]))
+    return items, volleys
+
+def _opWear(state, i : int):
+    items, volleys = state
+    hits, rates = volleys[i]
+    lose = items.loseDurability
+    for iid, rate in zip(hits, rates):
+        lose(iid, rate)
+
+def _opWearMany(state, i : int):
+    items, volleys = state
+    hits, rates = volleys[i]
+    return items.wearMany(hits, rates)
+
+def _setupNetwork(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    mats = idsWithTag(items, "material")
+    chests = [Storage(items, 20, f"chest{i}") for i in range(p.chests)]
+    # a bit over half full, each chest holding a handful of materials
+    for c in chests:
+        for item_id in rng.sample(mats, 4):
+            c.addInv(item_id, rng.randint(1, 3 * 99))
+    net = StorageNetwork(items, chests)
+    ops = [(rng.choice(mats), rng.randint(1, 64)) for _ in range(p.chests)]
+    return net, chests, ops
+
+def _opNetAdd(state, i : int):
+    net, _, ops = state
+    return net.add(*ops[i])
+
+def _opNetRemove(state, i : int):
+    net, _, ops = state
+    return net.remove(*ops[i])
+
+def _opNetCount(state, i : int):
+    net, _, ops = state
+    return net.count(ops[i][0])
+
+def _opScanCount(state, i : int):
+    # the chest-by-chest search the network replaces
+    _, chests, ops = state
+    item_id = ops[i][0]
+    return sum(c.count(item_id) for c in chests)
+
+def _setupBundle(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    crafting = Crafting(items, recipes = makeCraftingRecipes(items, p.recipes, p.seed))
+    values = {iid : (rng.uniform(5, 40) if d.stack_size == 1 else rng.uniform(0.5, 3)) for iid, d in items.defs.items()}
+    solver = BundleSolver(crafting, values)
+    mats = idsWithTag(items, "material")
+    # NPC inventories; every other one repeats a loadout, so about half are cache hits
+    loadouts = []
+    for _ in range(p.stations):
+        inv = Inventory(p.capacity, items)
+        for _ in range(12):
+            inv.add(rng.choice(mats), rng.randint(1, 99))
+        loadouts.append(inv)
+    return solver, [loadouts[i // 2] for i in range(p.stations * 2)]
+
+def _opBundle(state, i : int):
+    solver, invs = state
+    return solver.solve(invs[i])
+
+def _setupAdvance(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    recipes = makeCookingRecipes(items, p.recipes, p.seed)
+    keys = list(recipes)
+    stations = []
+    for _ in range(p.stations):
+        st = CookingStation(items, recipes, burn_enabled = True)
+        rec = recipes[rng.choice(keys)]
+        for idx, (iid, _) in enumerate(rec.inputs):
+            st.addIngredient(idx, iid, 20)
+        st.selectRecipeByKey(rec.key)
+        stations.append(st)
+    return stations
+
+def _setupHoppers(p : Params, rng : random.Random):
+    items = makeCatalog(p.catalog, p.seed)
+    recipes = makeCookingRecipes(items, p.recipes, p.seed)
+    keys = list(recipes)
+    # a handful of pantries and larders shared by every station
+    pantries = [Storage(items, 60, f"pantry{i}") for i in range(4)]
+    larders = [Storage(items, 60, f"larder{i}") for i in range(4)]
+    for pantry in pantries:
+        for item_id in {iid for rec in recipes.values() for iid, _ in rec.inputs}:
+            pantry.addInv(item_id, 40)
+    hoppers = HopperNetwork()
+    stations = []
+    for n in range(p.stations):
+        st = CookingStation(items, recipes, burn_enabled = False)
+        st.setRecipe(rng.choice(keys))
+        hoppers.connect(st, source = pantries[n % 4], sink = larders[n % 4])
+        stations.append(st)
+    return hoppers, stations
+
+def _opHopperTick(state, i : int):
+    hoppers, stations = state
+    hoppers.tick()
+    for st in stations:
+        st.advance(0.5)
+
+def _opAdvance(state, i : int):
+    # 0.5s per call, so every 10th call on a station completes a cook
+    return state[i % len(state)].advance(0.5)
+
+WORKLOADS : Dict[str, Workload] = {
+    "add" : Workload("add", _setupAdd, _opAdd, lambda p : p.capacity),
+    "remove" : Workload("remove", _setupRemove, _opRemove, lambda p : p.capacity),
+    "move" : Workload("move", _setupMove, _opMove, lambda p : p.capacity * 4),
+    "sort" : Workload("sort", _setupSort, _opSort, lambda p : 32),
+    "describe" : Workload("describe", _setupDescribe, _opDescribe, lambda p : 32),
+    "encodeDiff" : Workload("encodeDiff", _setupNet, _opEncodeDiff, lambda p : p.capacity * 4),
+    "decodeDiff" : Workload("decodeDiff", _setupDecodeDiff, _opDecodeDiff, lambda p : p.capacity * 4),
+    "canCraft" : Workload("canCraft", _setupCrafting, _opCanCraft, lambda p : p.recipes * 4),
+    "craft" : Workload("craft", _setupCrafting, _opCraft, lambda p : p.recipes * 4),
+    "wear" : Workload("wear", _setupWear, _opWear, lambda p : p.stations),
+    "wearMany" : Workload("wearMany", _setupWear, _opWearMany, lambda p : p.stations),
+    "netAdd" : Workload("netAdd", _setupNetwork, _opNetAdd, lambda p : p.chests),
+    "netRemove" : Workload("netRemove", _setupNetwork, _opNetRemove, lambda p : p.chests),
+    "netCount" : Workload("netCount", _setupNetwork, _opNetCount, lambda p : p.chests),
+    "scanCount" : Workload("scanCount", _setupNetwork, _opScanCount, lambda p : p.chests // 10),
+    "bundle" : Workload("bundle", _setupBundle, _opBundle, lambda p : p.stations * 2),
+    "advance" : Workload("advance", _setupAdvance, _opAdvance, lambda p : p.stations * 20),
+    "hopperTick" : Workload("hopperTick", _setupHoppers, _opHopperTick, lambda p : 20),
+}
+
+def opNames() -> Tuple[str, ...]:
+    return tuple(WORKLOADS)
@@ -1,10 +1,15 @@
 from dataclasses import dataclass
-from typing import Optional, Dict, Tuple, List, Literal
+from typing import Optional, Dict, Tuple, List, Literal, Callable, TYPE_CHECKING
 from inventory.items import Items
-from inventory.inventory import Inventory
+from crafting.compiler import CompiledRecipes, compileRecipes
+
+if TYPE_CHECKING:
+    from inventory.inventory import Inventory
 from .recipes import CookingRecipe
+from .scheduler import CookingJob
 
 State = Literal["idle", "cooking", "ready", "burned"]
+Event = Literal["cooked", "burned"]
     
 @dataclass
 class Slot:
@@ -23,13 +28,34 @@ class CookingStation:
         self.job_elapsed : float = -1.0
         self.burn_elapsed : float = 0.0
         self.burn_enabled : bool = burn_enabled
+        # called as fn(station, event, item_id, qty) whenever output is produced
+        self.listeners : List[Callable[["CookingStation", Event, str, int], None]] = []
+        # job queue; once used, the station only cooks what is queued
+        self.jobs : List[CookingJob] = []
+        self.active_job : Optional[CookingJob] = None
+        self.queue_mode : bool = False
+        # per station, not process-wide, so a replayed cancelJob(id) hits the same job
+        self.next_job_id = 1
+        self._compiled : Optional[CompiledRecipes] = None
+
+    def subscribe(self, fn : Callable[["CookingStation", Event, str, int], None]) -> None:
+        self.listeners.append(fn)
+
+    def unsubscribe(self, fn : Callable[["CookingStation", Event, str, int], None]) -> None:
+        if fn in self.listeners:
+            self.listeners.remove(fn)
+
+    def _emit(self, event : Event, item_id : str, qty : int) -> None:
+        for fn in list(self.listeners):
+            fn(self, event, item_id, qty)
 
     def setRecipe(self, recipe_key : str) -> bool:
         if recipe_key not in self.recipes: 
             return False
-        if self.isCooking(): 
+        if self.isCooking() or self.jobs: 
             return False
         self.active_recipe = recipe_key
+        self.queue_mode = False
 
         return True
     
@@ -138,6 +164,8 @@ class CookingStation:
     def _startOne(self) -> bool:
         if self.active_recipe is None:
             return False
+        if self.queue_mode and self.active_job is None:
+            return False
         rec = self.recipes[self.active_recipe]
         cooked_id, cooked_qty = rec.cooked_output
         if not self._roomInCooked(cooked_id, cooked_qty):
@@ -156,6 +184,10 @@ class CookingStation:
         if dt <= 0:
             return
         
+        # queued jobs pick the recipe whenever the station is between cooks
+        if self.queue_mode and self.job_elapsed < 0.0:
+            self._activateNextJob()
+
         # try to start a job BEFORE tiking time (so this dt applies to it)
         if self.active_recipe and self.job_elapsed < 0.0:
             started_now = self._startOne()
@@ -174,6 +206,9 @@ class CookingStation:
                     self.job_elapsed = -1.0
                     self.burn_elapsed = 0.0
                     did_cook = True
+                    self._emit("cooked", cooked_id, cooked_qty)
+                    if self.active_job is not None:
+                        self._jobCooked()
                 else:
                     self.job_elapsed = -1.0
 
@@ -211,10 +246,13 @@ class CookingStation:
         s.qty -= 1
         if s.qty == 0:
             s.item_id = None
-        
-        return self._depositBurned(burned_id, burned_qty)
+        if not self._depositBurned(burned_id, burned_qty):
+            return False
+        self._emit("burned", burned_id, burned_qty)
+
+        return True
     
-    def collectCooked(self, inv : Inventory, slot_idx : int = 0, qty : Optional[int] = None) -> int:
+    def collectCooked(self, inv : "Inventory", slot_idx : int = 0, qty : Optional[int] = None) -> int:
         if not (0 <= slot_idx < len(self.cooked_out)):
             return 0
         s = self.cooked_out[slot_idx]
@@ -229,7 +267,7 @@ class CookingStation:
         
         return added
     
-    def collectBurned(self, inv : Inventory, slot_idx : int = 0, qty : Optional[int] = None) -> int:
+    def collectBurned(self, inv : "Inventory", slot_idx : int = 0, qty : Optional[int] = None) -> int:
         if not (0 <= slot_idx < len(self.burned_out)):
             return 0
         s = self.burned_out[slot_idx]
@@ -274,16 +312,71 @@ class CookingStation:
 
         return cap
     
+    def compiledRecipes(self) -> CompiledRecipes:
+        """
+        Flat-array form of self.recipes, rebuilt after addRecipe/setRecipes.
+        Change recipes through those or applyRecipeEdit (stations sharing a
+        RecipeBook's dict should be attached to it), not on the dict itself.
+        """
+        if self._compiled is None:
+            self._compiled = compileRecipes(self.recipes, self.items)
+        return self._compiled
+
+    def addRecipe(self, key : str, recipe : CookingRecipe) -> None:
+        self.recipes[key] = recipe
+        self._compiled = None
+
+    def setRecipes(self, recipes : Dict[str, CookingRecipe]) -> None:
+        self.recipes = recipes
+        self._compiled = None
+
+    def applyRecipeEdit(self, changed : Dict[str, CookingRecipe], removed : Dict[str, CookingRecipe]) -> None:
+        """
+        Hot-reload hook (see RecipeBook); 'removed' maps keys to the old recipes.
+        Edited recipes take effect at once; a cook of a removed recipe is
+        abandoned with its inputs handed back, and its queued jobs are dropped.
+        """
+        gone = set(removed)
+        for key, rec in removed.items():
+            self._abandonCooks(key, rec)
+            self.recipes.pop(key, None)
+        self.recipes.update(changed)
+        if gone:
+            self.jobs = [j for j in self.jobs if j.recipe_key not in gone]
+            if self.active_job is not None and self.active_job.recipe_key in gone:
+                self.active_job = None
+        if self._compiled is not None:
+            self._compiled.update(changed, removed)
+
+    def _abandonCooks(self, key : str, rec : CookingRecipe) -> None:
+        if self.active_recipe != key:
+            return
+        if self.job_elapsed >= 0.0:
+            self._refundInputs(rec, 1)
+        self.active_recipe = None
+        self.job_elapsed = -1.0
+        self.burn_elapsed = 0.0
+
+    def _refundInputs(self, rec : CookingRecipe, times : int) -> None:
+        # best effort: whatever no input slot can hold is lost
+        for iid, need in rec.inputs:
+            left = need * times
+            for idx in range(len(self.inputs)):
+                if left <= 0:
+                    break
+                left -= self.addIngredient(idx, iid, left)
+
     def recipeOptions(self) -> List[Dict[str, object]]:
         if not self.recipes:
             return []
-        counts = self._inputCounts()
+        comp = self.compiledRecipes()
+        times = comp.maxTimes(comp.vectorFromCounts(self._inputCounts()))
         opts : List[Dict[str, object]] = []
-        for key, r in self.recipes.items():
-            if not self._canMakeWithCounts(r, counts):
+        for key, max_by_mats in zip(comp.keys, times):
+            if max_by_mats <= 0:
                 continue
+            r = self.recipes[key]
             out_id, out_qty = r.cooked_output
-            max_by_mats = self._maxFromIngredients(r, counts)
             max_by_capacity = self._outputCapacityUnits(out_id, out_qty)
             name = self.items.defs.get(out_id).name if self.items.defs.get(out_id) else out_id
             opts.append({
@@ -311,6 +404,8 @@ class CookingStation:
     def selectRecipeByKey(self, key : str) -> Tuple[bool, str]:
         if self.isCooking():
             return False, "Busy: wait until current item finishes."
+        if self.jobs:
+            return False, "Busy: jobs are queued; use enqueue() or clear the queue."
         if key not in self.recipes:
             return False, f"Unkown recipe key '{key}'."
         counts = self._inputCounts()
@@ -318,6 +413,7 @@ class CookingStation:
         if not self._canMakeWithCounts(rec, counts):
             return False, "Insufficient ingredients for that recipe."
         self.active_recipe = key
+        self.queue_mode = False
         self.job_elapsed = -1.0
         self.burn_elapsed = 0.0
         out_id, out_qty = rec.cooked_output
@@ -326,6 +422,127 @@ class CookingStation:
         
         return True, "Selected."
     
+    # <<----------- Job queue ----------->>
+    def enqueue(self, recipe_key : str, qty : int = 1, *, priority : int = 0) -> Tuple[bool, str]:
+        """
+        Queue 'qty' cooks of a recipe. Accepted while busy; the station works
+        through the queue on its own, see plan() for the order.
+        """
+        if recipe_key not in self.recipes:
+            return False, f"Unkown recipe key '{recipe_key}'."
+        if qty <= 0:
+            return False, "Quantity must be positive."
+        self.jobs.append(CookingJob(recipe_key, qty, priority, job_id = self.next_job_id))
+        self.next_job_id += 1
+        self.queue_mode = True
+
+        return True, "Queued."
+
+    def cancelJob(self, job_id : int) -> bool:
+        """Drop a queued job. A cook already in progress still finishes."""
+        for i, job in enumerate(self.jobs):
+            if job.job_id == job_id:
+                del self.jobs[i]
+                if job is self.active_job:
+                    self.active_job = None
+                return True
+
+        return False
+
+    def clearQueue(self) -> None:
+        self.jobs.clear()
+        self.active_job = None
+        self.queue_mode = False
+
+    def _jobOrder(self) -> List[CookingJob]:
+        """
+        Priority first; within a priority, highest cooked units per second
+        first, which maximizes output per minute; then FIFO.
+        """
+        def key(job : CookingJob) -> Tuple[int, float, int]:
+            r = self.recipes.get(job.recipe_key)
+            rate = r.cooked_output[1] / r.cook_time if r and r.cook_time > 0 else 0.0
+            return (-job.priority, -rate, job.job_id)
+
+        return sorted(self.jobs, key = key)
+
+    def plan(self) -> List[Tuple[CookingJob, int]]:
+        """
+        Reserve inputs and cooked-output room job by job, in _jobOrder().
+        Returns (job, cooks runnable now) for every queued job; a job only gets
+        what higher-ranked jobs have not already claimed.
+        """
+        counts = self._inputCounts()
+        room = [(s.item_id, s.qty) for s in self.cooked_out]
+        planned : List[Tuple[CookingJob, int]] = []
+        for job in self._jobOrder():
+            r = self.recipes.get(job.recipe_key)
+            if r is None:
+                planned.append((job, 0))
+                continue
+            in_progress = self._cooksInProgress(job)
+            to_start = max(0, job.remaining - in_progress)
+            units = min(to_start, self._maxFromIngredients(r, counts)) if r.inputs else to_start
+            out_id, out_qty = r.cooked_output
+            units = self._reserveRoom(room, out_id, out_qty, units + in_progress) - in_progress
+            units = max(0, units)
+            for iid, need in r.inputs:
+                counts[iid] = counts.get(iid, 0) - need * units
+            planned.append((job, units))
+
+        return planned
+
+    def _cooksInProgress(self, job : CookingJob) -> int:
+        """Cooks of 'job' whose inputs are already consumed but not yet deposited."""
+        return 1 if job is self.active_job and self.isCooking() else 0
+
+    def _reserveRoom(self, room : List[Tuple[Optional[str], int]], out_id : str, unit_qty : int, units : int) -> int:
+        """Claim cooked-output room for up to 'units' cooks in the simulated slots; returns cooks that fit."""
+        maxs = self._maxStack(out_id)
+        placed = 0
+        for i, (sid, sqty) in enumerate(room):
+            if placed >= units:
+                break
+            if sid is None or sid == out_id:
+                fit = min(units - placed, (maxs - sqty) // unit_qty)
+                if fit > 0:
+                    room[i] = (out_id, sqty + fit * unit_qty)
+                    placed += fit
+
+        return placed
+
+    def _activateNextJob(self) -> None:
+        self.jobs = [j for j in self.jobs if j.remaining > 0]
+        nxt = next((job for job, units in self.plan() if units > 0), None)
+        self.active_job = nxt
+        if nxt is not None and nxt.recipe_key != self.active_recipe:
+            self.active_recipe = nxt.recipe_key
+            self.burn_elapsed = 0.0
+
+    def _jobCooked(self) -> None:
+        job = self.active_job
+        job.done += 1
+        if job.remaining <= 0:
+            if job in self.jobs:
+                self.jobs.remove(job)
+            self.active_job = None
+        # choose what cooks next before advance() tries to start again
+        self._activateNextJob()
+
+    def queuedWork(self) -> float:
+        """Seconds of cooking left in the queue, including the current cook."""
+        total = 0.0
+        for job in self.jobs:
+            r = self.recipes.get(job.recipe_key)
+            if r:
+                total += r.cook_time * job.remaining
+        if self.active_job is not None and self.isCooking():
+            r = self.recipes.get(self.active_job.recipe_key)
+            if r:
+                total -= min(self.job_elapsed, r.cook_time)
+
+        return max(0.0, total)
+
     def selectRecipeByIndex(self, index : int) -> Tuple[bool, str]:
         opts = self.recipeOptions()
         if not (0 <= index < len(opts)):
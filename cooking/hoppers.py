@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from storage.storage import Storage
+from .cooking import CookingStation, Slot
+
+@dataclass
+class Pipe:
+    """
+    One station's connections: ingredients come from 'source', cooked
+    output goes to 'sink' and burned output to 'burned_sink' (defaults to
+    'sink'). 'buffer' is how many cooks' worth of the active recipe's
+    inputs the hopper keeps loaded.
+    """
+    station : CookingStation
+    source : Optional[Storage] = None
+    sink : Optional[Storage] = None
+    burned_sink : Optional[Storage] = None
+    buffer : int = 2
+
+class HopperNetwork:
+    """
+    Auto-feed pipes between Storage chests and CookingStations, evaluated
+    once per tick as a batch rather than item by item:
+
+      1. demand:  every pipe works out what its station is short of for
+                  'buffer' cooks of its active recipe;
+      2. pull:    demand is summed per (source, item) and taken with one
+                  remove() per pair, then handed out in pipe order
+                  (anything a station can't hold goes back);
+      3. drain:   cooked / burned output is summed per (sink, item) and
+                  deposited with one add() per pair, then debited from the
+                  stations in order.
+
+    So a tick costs one inventory call per distinct (chest, item), however
+    many stations share the chest.
+
+        hoppers = HopperNetwork()
+        hoppers.connect(oven, source = pantry, sink = larder)
+        ...
+        hoppers.tick()          # then advance the stations as usual
+    """
+    def __init__(self) -> None:
+        self.pipes : List[Pipe] = []
+        # items moved by the last tick, for stats
+        self.pulled = 0
+        self.drained = 0
+
+    def connect(self, station : CookingStation, *, source : Optional[Storage] = None,
+                sink : Optional[Storage] = None, burned_sink : Optional[Storage] = None,
+                buffer : int = 2) -> Pipe:
+        """Attach station (replacing any pipe it already has)."""
+        self.disconnect(station)
+        pipe = Pipe(station, source, sink, burned_sink, max(1, buffer))
+        self.pipes.append(pipe)
+
+        return pipe
+
+    def disconnect(self, station : CookingStation) -> None:
+        self.pipes = [p for p in self.pipes if p.station is not station]
+
+    def tick(self) -> Tuple[int, int]:
+        """Run one feed/drain pass; returns (items pulled, items drained)."""
+        self.pulled = self._pull(self._demand())
+        self.drained = self._drain()
+
+        return self.pulled, self.drained
+
+    # <<----------- Phases ----------->>
+    def _demand(self) -> Dict[Tuple[int, str], List[Tuple[Pipe, int]]]:
+        """(id(source), item_id) -> [(pipe, qty wanted)], in pipe order."""
+        wants : Dict[Tuple[int, str], List[Tuple[Pipe, int]]] = {}
+        for pipe in self.pipes:
+            st = pipe.station
+            if pipe.source is None or st.active_recipe is None:
+                continue
+            rec = st.recipes.get(st.active_recipe)
+            if rec is None:
+                continue
+            counts = st._inputCounts()
+            for item_id, need in rec.inputs:
+                short = need * pipe.buffer - counts.get(item_id, 0)
+                if short > 0:
+                    wants.setdefault((id(pipe.source), item_id), []).append((pipe, short))
+
+        return wants
+
+    def _pull(self, wants : Dict[Tuple[int, str], List[Tuple[Pipe, int]]]) -> int:
+        moved = 0
+        for (_, item_id), takers in wants.items():
+            source = takers[0][0].source
+            got = source.inv.remove(item_id, sum(q for _, q in takers))
+            left = got
+            for pipe, qty in takers:
+                if left <= 0:
+                    break
+                left -= self._load(pipe.station, item_id, min(qty, left))
+            if left > 0:
+                source.inv.add(item_id, left)
+            moved += got - left
+
+        return moved
+
+    def _load(self, st : CookingStation, item_id : str, qty : int) -> int:
+        # same-item slots first so one ingredient doesn't spread over every empty slot
+        loaded = 0
+        for pass_empty in (False, True):
+            for idx, s in enumerate(st.inputs):
+                if loaded >= qty:
+                    return loaded
+                if (s.item_id is None) == pass_empty:
+                    loaded += st.addIngredient(idx, item_id, qty - loaded)
+
+        return loaded
+
+    def _drain(self) -> int:
+        # (id(sink), item_id) -> [output slots], in pipe order
+        outs : Dict[Tuple[int, str], List[Slot]] = {}
+        sinks : Dict[int, Storage] = {}
+        for pipe in self.pipes:
+            st = pipe.station
+            for sink, slots in ((pipe.sink, st.cooked_out), (pipe.burned_sink or pipe.sink, st.burned_out)):
+                if sink is None:
+                    continue
+                for s in slots:
+                    if s.item_id is not None and s.qty > 0:
+                        sinks[id(sink)] = sink
+                        outs.setdefault((id(sink), s.item_id), []).append(s)
+        moved = 0
+        for (key, item_id), slots in outs.items():
+            added = sinks[key].inv.add(item_id, sum(s.qty for s in slots))
+            moved += added
+            for s in slots:
+                if added <= 0:
+                    break
+                take = min(s.qty, added)
+                s.qty -= take
+                added -= take
+                if s.qty == 0:
+                    s.item_id = None
+
+        return moved
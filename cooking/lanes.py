@@ -0,0 +1,178 @@
+from collections import Counter
+from typing import Dict, List, Optional, Set
+from inventory.items import Items
+from .cooking import CookingStation
+from .recipes import CookingRecipe
+from .scheduler import CookingJob
+
+class MultiLaneStation(CookingStation):
+    """
+    A CookingStation that runs up to 'lanes' cooks at the same time.
+
+    Lanes share the input and output slots. A lane consumes its inputs when it
+    starts and keeps a claim on cooked-output room until it deposits, so a lane
+    never starts a cook that would have nowhere to go. Each lane remembers its
+    own recipe, so queued jobs (enqueue) can switch recipe for idle lanes while
+    others keep cooking.
+
+    Lane state lives in parallel lists (progress, cook time, recipe, job) that
+    advance() steps with whole-list passes; only lanes that actually finish are
+    visited individually. The cooked output is shared, so burning runs on the
+    one station-level burn_elapsed, as in CookingStation: it counts only while
+    every lane is idle and resets whenever a lane starts or finishes.
+    job_elapsed mirrors the furthest-along lane for existing callers.
+    """
+    def __init__(self, items : Items, recipes : Dict[str, CookingRecipe], *, lanes : int = 2,
+                 num_inputs : int = 5, num_outputs : int = 1, burn_enabled : bool = True) -> None:
+        super().__init__(items, recipes, num_inputs = num_inputs, num_outputs = num_outputs,
+                         burn_enabled = burn_enabled)
+        self.lanes = max(1, lanes)
+        self.lane_elapsed : List[float] = [-1.0] * self.lanes
+        self.lane_cook_time : List[float] = [0.0] * self.lanes
+        self.lane_recipe : List[Optional[str]] = [None] * self.lanes
+        self.lane_job : List[Optional[CookingJob]] = [None] * self.lanes
+
+    def isCooking(self) -> bool:
+        return max(self.lane_elapsed) >= 0.0
+
+    def activeLanes(self) -> int:
+        return sum(1 for e in self.lane_elapsed if e >= 0.0)
+
+    def _syncSummary(self) -> None:
+        self.job_elapsed = max(self.lane_elapsed)
+
+    def _freeRoom(self) -> List[tuple]:
+        """Cooked-output slots as (item_id, qty) after the claims of every running lane."""
+        room = [(s.item_id, s.qty) for s in self.cooked_out]
+        running = Counter(k for k, e in zip(self.lane_recipe, self.lane_elapsed) if k and e >= 0.0)
+        for key, n in running.items():
+            out_id, out_qty = self.recipes[key].cooked_output
+            self._reserveRoom(room, out_id, out_qty, n)
+
+        return room
+
+    def _fillLanes(self) -> Set[int]:
+        """Start as many idle lanes on the active recipe as inputs and room allow."""
+        if self.active_recipe is None or (self.queue_mode and self.active_job is None):
+            return set()
+        idle = [i for i, e in enumerate(self.lane_elapsed) if e < 0.0]
+        if not idle:
+            return set()
+        rec = self.recipes[self.active_recipe]
+        n = len(idle)
+        if rec.inputs:
+            n = min(n, self._maxFromIngredients(rec, self._inputCounts()))
+        job = self.active_job
+        if job is not None:
+            n = min(n, job.remaining - self._cooksInProgress(job))
+        if n <= 0:
+            return set()
+        out_id, out_qty = rec.cooked_output
+        n = self._reserveRoom(self._freeRoom(), out_id, out_qty, n)
+        if n <= 0:
+            return set()
+
+        for iid, need in rec.inputs:
+            got = self._consumeInputs(iid, need * n)
+            assert got == need * n
+        lanes = idle[:n]
+        for i in lanes:
+            self.lane_elapsed[i] = 0.0
+            self.lane_cook_time[i] = rec.cook_time
+            self.lane_recipe[i] = self.active_recipe
+            self.lane_job[i] = job
+
+        return set(lanes)
+
+    def _abandonCooks(self, key : str, rec : CookingRecipe) -> None:
+        for i, k in enumerate(self.lane_recipe):
+            if k == key and self.lane_elapsed[i] >= 0.0:
+                self._refundInputs(rec, 1)
+                self.lane_elapsed[i] = -1.0
+                self.lane_recipe[i] = None
+                self.lane_job[i] = None
+        if self.active_recipe == key:
+            self.active_recipe = None
+        self._syncSummary()
+
+    def _cooksInProgress(self, job : CookingJob) -> int:
+        return sum(1 for j, e in zip(self.lane_job, self.lane_elapsed) if j is job and e >= 0.0)
+
+    def _laneJobCooked(self, job : CookingJob) -> None:
+        job.done += 1
+        if job.remaining <= 0:
+            if job in self.jobs:
+                self.jobs.remove(job)
+            if job is self.active_job:
+                self.active_job = None
+
+    def _start(self) -> Set[int]:
+        if self.queue_mode and min(self.lane_elapsed) < 0.0:
+            self._activateNextJob()
+        return self._fillLanes()
+
+    def advance(self, dt : float) -> None:
+        if dt <= 0:
+            return
+
+        # start idle lanes BEFORE ticking time (so this dt applies to them)
+        started = self._start()
+
+        # progress every running lane in one pass
+        self.lane_elapsed = [e + dt if e >= 0.0 else e for e in self.lane_elapsed]
+        finished = [i for i, (e, t) in enumerate(zip(self.lane_elapsed, self.lane_cook_time))
+                    if e >= 0.0 and e >= t]
+
+        cooked : Set[int] = set()
+        for i in finished:
+            rec = self.recipes.get(self.lane_recipe[i])
+            job = self.lane_job[i]
+            self.lane_elapsed[i] = -1.0
+            self.lane_recipe[i] = None
+            self.lane_job[i] = None
+            if rec is None:
+                continue
+            cooked_id, cooked_qty = rec.cooked_output
+            if self._depositCooked(cooked_id, cooked_qty):
+                cooked.add(i)
+                self._emit("cooked", cooked_id, cooked_qty)
+                if job is not None:
+                    self._laneJobCooked(job)
+
+        # refill lanes that just finished
+        started |= self._start()
+
+        if started or cooked:
+            self.burn_elapsed = 0.0
+        elif self.burn_enabled and self.active_recipe and not self.isCooking():
+            self._burnIdle(dt)
+
+        for s in self.burned_out:
+            if s.item_id is not None and s.qty == 0:
+                s.item_id = None
+        self._syncSummary()
+
+    def _burnIdle(self, dt : float) -> None:
+        """Same burn step as CookingStation.advance, for when every lane is idle."""
+        cooked_idx = next((i for i, s in enumerate(self.cooked_out) if s.item_id and s.qty > 0), None)
+        if cooked_idx is None:
+            return
+        r = self.recipes.get(self.cooked_out[cooked_idx].item_id)
+        if not r:
+            return
+        self.burn_elapsed += dt
+        if self.burn_elapsed >= r.burn_time:
+            self._burnOne(cooked_idx, r)
+            self.burn_elapsed = 0.0
+
+    def queuedWork(self) -> float:
+        """Seconds until the queue drains, with work shared across all lanes."""
+        total = 0.0
+        for job in self.jobs:
+            r = self.recipes.get(job.recipe_key)
+            if r:
+                total += r.cook_time * job.remaining
+        total -= sum(min(e, t) for e, t, j in zip(self.lane_elapsed, self.lane_cook_time, self.lane_job)
+                     if e >= 0.0 and j is not None)
+
+        return max(0.0, total) / self.lanes
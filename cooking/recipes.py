@@ -1,5 +1,10 @@
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from inventory.items import Items
+    from crafting.recipebook import RecipeBook
 
 @dataclass(frozen=True)
 class CookingRecipe:
@@ -10,24 +15,23 @@ class CookingRecipe:
     cook_time : float
     burn_time : float
 
-recipes : Dict[str, CookingRecipe] = {
-    "cooked_apple" : CookingRecipe(
-        key = "cooked_apple",
-        inputs = [("apple", 1)],
-        cooked_output = ("cooked_apple", 1),
-        burned_output = ("burned_apple", 1),
-        cook_time = 5.0,
-        burn_time = 5.0
-    ),
-    "apple_pie" : CookingRecipe(
-        key = "apple_pie",
-        inputs = [("apple", 1), ("bread", 1)],
-        cooked_output = ("apple_pie", 1),
-        burned_output = ("burned_apple_pie", 1),
-        cook_time = 10.0,
-        burn_time = 10.0
-    )
-}
+def recipesPath() -> "Path":
+    # pathlib stays off the cooking.cooking import path until a book is loaded
+    from pathlib import Path
+    return Path(__file__).resolve().parent.parent / "inventory" / "cooking_recipes.json"
+
+# one book per catalog its recipes were validated against; None is items.json
+_books : Dict[Optional["Items"], "RecipeBook"] = {}
+
+def getRecipeBook(items : Optional["Items"] = None) -> "RecipeBook":
+    """The cooking_recipes.json book for 'items', loaded on first use (against items.json if no catalog is given)."""
+    book = _books.get(items)
+    if book is None:
+        from inventory.items import Items
+        from crafting.recipebook import RecipeBook
+        path = recipesPath()
+        book = _books[items] = RecipeBook(path, items or Items.load(path.parent / "items.json"), "cooking")
+    return book
 
 def getRecipes() -> Dict[str, CookingRecipe]:
-    return dict(recipes)
\ No newline at end of file
+    return dict(getRecipeBook().recipes)
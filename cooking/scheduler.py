@@ -0,0 +1,79 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cooking import CookingStation
+
+@dataclass
+class CookingJob:
+    """
+    'qty' cooks of one recipe queued on a station.
+    Higher priority runs first; 'done' counts completed cooks. 'job_id' is
+    handed out by the owning station, so ids replay the same run to run.
+    """
+    recipe_key : str
+    qty : int
+    priority : int = 0
+    done : int = 0
+    job_id : int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.qty - self.done
+
+class CookingScheduler:
+    """
+    Spreads cooking jobs across several stations to minimize makespan.
+
+    Jobs are placed longest-first (LPT) and each cook goes to the eligible
+    station whose queue would finish earliest, so a large order is split
+    across stations rather than piled onto one. Stations keep their own
+    queues; this only decides who gets what.
+    """
+    def __init__(self, stations : List["CookingStation"]) -> None:
+        self.stations = stations
+
+    def submit(self, orders : List[Tuple[str, int, int]]) -> Dict[int, List[CookingJob]]:
+        """
+        orders: (recipe_key, qty, priority) tuples.
+        Enqueues onto the stations and returns {station index: jobs added}.
+        """
+        # priority first, then LPT: longest total cook time first
+        def weight(order : Tuple[str, int, int]) -> Tuple[int, float]:
+            key, qty, prio = order
+            rec = self._anyRecipe(key)
+            return (-prio, -(rec.cook_time * qty if rec else 0.0))
+
+        finish = [st.queuedWork() for st in self.stations]
+        placed : Dict[int, List[CookingJob]] = {}
+        for key, qty, prio in sorted(orders, key = weight):
+            eligible = [i for i, st in enumerate(self.stations) if key in st.recipes]
+            if not eligible or qty <= 0:
+                continue
+            cook_time = self.stations[eligible[0]].recipes[key].cook_time
+            heap = [(finish[i], i) for i in eligible]
+            heapq.heapify(heap)
+            units : Dict[int, int] = {}
+            for _ in range(qty):
+                t, i = heapq.heappop(heap)
+                units[i] = units.get(i, 0) + 1
+                heapq.heappush(heap, (t + cook_time, i))
+            for i, n in units.items():
+                finish[i] += n * cook_time
+                ok, _ = self.stations[i].enqueue(key, n, priority = prio)
+                if ok:
+                    placed.setdefault(i, []).append(self.stations[i].jobs[-1])
+
+        return placed
+
+    def makespan(self) -> float:
+        """Projected seconds until every station drains its queue."""
+        return max((st.queuedWork() for st in self.stations), default = 0.0)
+
+    def _anyRecipe(self, key : str):
+        for st in self.stations:
+            rec = st.recipes.get(key)
+            if rec:
+                return rec
+        return None
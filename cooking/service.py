@@ -0,0 +1,215 @@
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+from .cooking import CookingStation, Event
+from .lanes import MultiLaneStation
+
+Subscriber = Callable[["AsyncStation", Event, str, int], None]
+
+class AsyncStation:
+    """
+    Awaitable view of one CookingStation registered with a CookingService.
+    Mutate the station through these wrappers (or call service.wake() after
+    touching station directly) so a newly possible job starts right away.
+    """
+    def __init__(self, service : "CookingService", station : CookingStation) -> None:
+        self.service = service
+        self.station = station
+        self._waiters : Dict[str, List[asyncio.Future]] = {"cooked" : [], "burned" : []}
+        self._subscribers : List[Subscriber] = []
+        station.subscribe(self._onEvent)
+
+    async def nextCooked(self) -> Tuple[str, int]:
+        """Wait for the next cooked output; returns (item_id, qty)."""
+        return await self._wait("cooked")
+
+    async def nextBurned(self) -> Tuple[str, int]:
+        """Wait for the next item to burn; returns (burned_id, qty)."""
+        return await self._wait("burned")
+
+    def subscribe(self, fn : Subscriber) -> None:
+        self._subscribers.append(fn)
+
+    def unsubscribe(self, fn : Subscriber) -> None:
+        if fn in self._subscribers:
+            self._subscribers.remove(fn)
+
+    def addIngredient(self, idx : int, item_id : str, qty : int) -> int:
+        added = self.station.addIngredient(idx, item_id, qty)
+        if added:
+            self.service.wake()
+        return added
+
+    def setRecipe(self, recipe_key : str) -> bool:
+        ok = self.station.setRecipe(recipe_key)
+        if ok:
+            self.service.wake()
+        return ok
+
+    def selectRecipeByKey(self, key : str) -> Tuple[bool, str]:
+        ok, msg = self.station.selectRecipeByKey(key)
+        if ok:
+            self.service.wake()
+        return ok, msg
+
+    def _wait(self, kind : str) -> asyncio.Future:
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters[kind].append(fut)
+        return fut
+
+    def _onEvent(self, station : CookingStation, event : Event, item_id : str, qty : int) -> None:
+        waiters, self._waiters[event] = self._waiters[event], []
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result((item_id, qty))
+        for fn in list(self._subscribers):
+            fn(self, event, item_id, qty)
+        self.service._publish(self, event, item_id, qty)
+
+    def _cancelWaiters(self) -> None:
+        for waiters in self._waiters.values():
+            for fut in waiters:
+                fut.cancel()
+            waiters.clear()
+
+    def _detach(self) -> None:
+        self.station.unsubscribe(self._onEvent)
+        self._cancelWaiters()
+
+def untilNextEvent(st : CookingStation) -> Optional[float]:
+    """
+    Seconds until 'st' would next finish a cook or burn an item, or None if
+    nothing is in progress (idle stations only change when someone feeds them).
+    Mirrors the order of checks in CookingStation.advance; a
+    MultiLaneStation goes by its soonest lane, then the shared burn timer.
+    """
+    if isinstance(st, MultiLaneStation):
+        running = [t - e for e, t in zip(st.lane_elapsed, st.lane_cook_time) if e >= 0.0]
+        if running:
+            return max(0.0, min(running))
+    rec = st.recipes.get(st.active_recipe) if st.active_recipe else None
+    if rec is None:
+        return None
+    if st.job_elapsed >= 0.0:
+        return max(0.0, rec.cook_time - st.job_elapsed)
+    if st.burn_enabled:
+        cooked = next((s for s in st.cooked_out if s.item_id and s.qty > 0), None)
+        r = st.recipes.get(cooked.item_id) if cooked else None
+        if r:
+            return max(0.0, r.burn_time - st.burn_elapsed)
+
+    return None
+
+class CookingService:
+    """
+    Advances every registered station from a single event-loop timer.
+
+    Each wake-up advances all stations by the loop-clock time since the last
+    one, then re-arms the timer for the earliest upcoming cook/burn across all
+    stations (capped by max_interval so newly fed idle stations still start).
+    Thousands of stations cost one TimerHandle, not one task each.
+
+        async with CookingService() as svc:
+            oven = svc.add(CookingStation(items, recipes))
+            oven.addIngredient(0, "apple", 2)
+            oven.setRecipe("cooked_apple")
+            item_id, qty = await oven.nextCooked()
+    """
+    # fire slightly after a deadline so float accumulation lands past it
+    DEADLINE_SLACK = 1e-4
+
+    def __init__(self, *, max_interval : float = 0.25) -> None:
+        self.max_interval = max_interval
+        self.stations : List[AsyncStation] = []
+        self._subscribers : List[Subscriber] = []
+        self._loop : Optional[asyncio.AbstractEventLoop] = None
+        self._handle : Optional[asyncio.Handle] = None
+        self._last = 0.0
+        self.ticks = 0
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def add(self, station : CookingStation) -> AsyncStation:
+        handle = AsyncStation(self, station)
+        self.stations.append(handle)
+        self.wake()
+        return handle
+
+    def remove(self, handle : AsyncStation) -> None:
+        if handle in self.stations:
+            self.stations.remove(handle)
+            handle._detach()
+
+    def subscribe(self, fn : Subscriber) -> None:
+        """fn(handle, event, item_id, qty) for completion/burn events on every station."""
+        self._subscribers.append(fn)
+
+    def unsubscribe(self, fn : Subscriber) -> None:
+        if fn in self._subscribers:
+            self._subscribers.remove(fn)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._last = self._loop.time()
+        self._arm()
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._loop = None
+        for handle in self.stations:
+            handle._cancelWaiters()
+
+    async def __aenter__(self) -> "CookingService":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.stop()
+
+    def wake(self) -> None:
+        """Run a tick as soon as possible, e.g. after feeding an idle station."""
+        if not self.running:
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self._loop.call_soon(self._tick)
+
+    def _tick(self) -> None:
+        self._handle = None
+        loop = self._loop
+        now = loop.time()
+        dt = now - self._last
+        self._last = now
+        self.ticks += 1
+        try:
+            if dt > 0:
+                for handle in list(self.stations):
+                    try:
+                        handle.station.advance(dt)
+                    except Exception as exc:
+                        # one bad station or listener must not stall the rest
+                        loop.call_exception_handler({
+                            "message" : "CookingService: advancing a station failed",
+                            "exception" : exc,
+                            "handle" : handle,
+                        })
+        finally:
+            if self.running and self._handle is None:
+                self._arm()
+
+    def _arm(self) -> None:
+        delay = self.max_interval
+        for handle in self.stations:
+            d = untilNextEvent(handle.station)
+            if d is not None and d < delay:
+                delay = d
+        self._handle = self._loop.call_at(self._last + delay + self.DEADLINE_SLACK, self._tick)
+
+    def _publish(self, handle : AsyncStation, event : Event, item_id : str, qty : int) -> None:
+        for fn in list(self._subscribers):
+            fn(handle, event, item_id, qty)
@@ -0,0 +1,156 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from inventory.items import Items
+
+@dataclass
+class CompiledRecipes:
+    """
+    Recipes flattened onto integer item ordinals.
+
+    rows[r] holds recipe r's requirements as parallel (item ordinals, qtys)
+    tuples, i.e. the nonzero entries of row r of the recipes x items
+    requirement matrix; out_item/out_qty are the output vectors.
+    Feasibility against an inventory is then one pass of integer floor
+    division and min per recipe over a count vector, with no string lookups.
+    """
+    item_ids : List[str]
+    item_index : Dict[str, int]
+    keys : List[str]
+    key_index : Dict[str, int]
+    rows : List[Tuple[Tuple[int, ...], Tuple[int, ...]]]
+    out_item : List[int]
+    out_qty : List[int]
+    source : Optional[Mapping] = field(default = None, repr = False, compare = False)
+    # bumped by every update(), so caches keyed on it drop stale results
+    version : int = field(default = 0, compare = False)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.keys), len(self.item_ids))
+
+    def requirementMatrix(self) -> List[List[int]]:
+        """Dense recipes x items matrix (for export/inspection; evaluation uses rows)."""
+        dense = [[0] * len(self.item_ids) for _ in self.keys]
+        for r, (idx, qty) in enumerate(self.rows):
+            for j, q in zip(idx, qty):
+                dense[r][j] += q
+
+        return dense
+
+    def countVector(self, inv) -> List[int]:
+        """Per-ordinal available totals of an Inventory (reserved quantities excluded) in one pass over its slots."""
+        vec = [0] * len(self.item_ids)
+        index = self.item_index
+        for s in inv.slots:
+            if s is not None:
+                j = index.get(s.item_id)
+                if j is not None:
+                    vec[j] += s.qty
+        for item_id, held in inv.held.items():
+            j = index.get(item_id)
+            if j is not None:
+                vec[j] = max(0, vec[j] - held)
+
+        return vec
+
+    def vectorFromCounts(self, counts : Mapping[str, int]) -> List[int]:
+        vec = [0] * len(self.item_ids)
+        for item_id, qty in counts.items():
+            j = self.item_index.get(item_id)
+            if j is not None:
+                vec[j] += qty
+
+        return vec
+
+    def maxTimes(self, vec : List[int]) -> List[int]:
+        """How many times each recipe can be made from 'vec', ignoring output space."""
+        return [min([vec[j] // q for j, q in zip(idx, qty)]) if idx else 0
+                for idx, qty in self.rows]
+
+    def makeable(self, vec : List[int]) -> Dict[str, int]:
+        """{recipe key: max times} for every recipe that can be made at least once."""
+        return {k : n for k, n in zip(self.keys, self.maxTimes(vec)) if n > 0}
+
+    def outputVector(self, times : List[int]) -> List[int]:
+        """Items produced by making recipe r times[r] times, as a count vector."""
+        vec = [0] * len(self.item_ids)
+        for r, n in enumerate(times):
+            if n:
+                vec[self.out_item[r]] += n * self.out_qty[r]
+
+        return vec
+
+    def update(self, changed : Mapping[str, object], removed : Iterable[str] = ()) -> None:
+        """
+        Apply an edit in place: only rows for 'changed' (new or replaced) and
+        'removed' keys are touched. A removed row is filled by moving the last
+        row into its place, so other ordinals stay put.
+        """
+        self.version += 1
+        for key in removed:
+            r = self.key_index.pop(key, None)
+            if r is None:
+                continue
+            last = len(self.keys) - 1
+            if r != last:
+                moved = self.keys[last]
+                self.keys[r] = moved
+                self.rows[r] = self.rows[last]
+                self.out_item[r] = self.out_item[last]
+                self.out_qty[r] = self.out_qty[last]
+                self.key_index[moved] = r
+            self.keys.pop()
+            self.rows.pop()
+            self.out_item.pop()
+            self.out_qty.pop()
+        for key, rec in changed.items():
+            row, out_j, out_q = self._compileRow(rec)
+            r = self.key_index.get(key)
+            if r is None:
+                self.key_index[key] = len(self.keys)
+                self.keys.append(key)
+                self.rows.append(row)
+                self.out_item.append(out_j)
+                self.out_qty.append(out_q)
+            else:
+                self.rows[r] = row
+                self.out_item[r] = out_j
+                self.out_qty[r] = out_q
+
+    def ordinal(self, item_id : str) -> int:
+        """Ordinal for item_id, appending ids the catalog did not have."""
+        j = self.item_index.get(item_id)
+        if j is None:
+            j = self.item_index[item_id] = len(self.item_ids)
+            self.item_ids.append(item_id)
+        return j
+
+    def _compileRow(self, rec) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], int, int]:
+        inputs, out_id, out_qty = recipeIO(rec)
+        # merge repeated ids so each row has one entry per item
+        need : Dict[int, int] = {}
+        for iid, q in inputs:
+            if q > 0:
+                j = self.ordinal(iid)
+                need[j] = need.get(j, 0) + q
+
+        return (tuple(need), tuple(need.values())), self.ordinal(out_id), out_qty
+
+def recipeIO(rec) -> Tuple[Iterable[Tuple[str, int]], str, int]:
+    """(inputs, output id, output qty) for either a crafting Recipe or a CookingRecipe."""
+    if hasattr(rec, "cooked_output"):
+        out_id, out_qty = rec.cooked_output
+        return rec.inputs, out_id, out_qty
+    return rec.inputs, rec.output_id, rec.output_qty
+
+def compileRecipes(recipes : Mapping[str, object], items : Optional[Items] = None) -> CompiledRecipes:
+    """
+    Compile a recipe dict (crafting.recipes or cooking.recipes shaped).
+    Ordinals follow the Items catalog order, then any ids only recipes mention.
+    """
+    item_ids : List[str] = list(items.defs) if items else []
+    comp = CompiledRecipes(item_ids = item_ids, item_index = {iid : j for j, iid in enumerate(item_ids)},
+                           keys = [], key_index = {}, rows = [], out_item = [], out_qty = [], source = recipes)
+    comp.update(recipes)
+
+    return comp
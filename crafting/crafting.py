@@ -1,51 +1,72 @@
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
 from inventory.items import Items
-from inventory.inventory import Inventory
+from .compiler import CompiledRecipes, compileRecipes
+
+if TYPE_CHECKING:
+    from inventory.inventory import Inventory
+    from inventory.snapshot import InventorySnapshot
 
 @dataclass(frozen=True)
 class Recipe:
     output_id : str
     output_qty : int
     inputs : List[Tuple[str, int]]
+    # seconds per craft when queued (see CraftScheduler); craft() ignores it
+    craft_time : float = 1.0
 
 class Crafting:
+    COMMIT_ATTEMPTS = 8
+
     def __init__(self, items : Items, recipes : Optional[Dict[str, Recipe]] = None) -> None:
         self.items = items
         self.recipes : Dict[str, Recipe] = dict(recipes) if recipes else {}
+        self._compiled : Optional[CompiledRecipes] = None
 
     def addRecipe(self, recipe : Recipe) -> None:
         self.recipes[recipe.output_id] = recipe
+        self._compiled = None
+
+    def applyRecipeEdit(self, changed : Dict[str, Recipe], removed : Dict[str, Recipe]) -> None:
+        """Hot-reload hook (see RecipeBook): patch recipes and the compiled rows in place."""
+        for key in removed:
+            self.recipes.pop(key, None)
+        self.recipes.update(changed)
+        if self._compiled is not None:
+            self._compiled.update(changed, removed)
+
+    @property
+    def compiled(self) -> CompiledRecipes:
+        """Flat-array form of self.recipes, rebuilt after addRecipe."""
+        if self._compiled is None:
+            self._compiled = compileRecipes(self.recipes, self.items)
+        return self._compiled
 
-    def canCraft(self, inv : Inventory, output_id : str, times : int = 1) -> Tuple[bool, str]:
+    def craftable(self, inv : "Inventory") -> Dict[str, int]:
+        """
+        {output_id: max times} for every recipe the inventory has materials for,
+        in one pass over the slots. Output space is not checked; see canCraft.
+        """
+        comp = self.compiled
+        return comp.makeable(comp.countVector(inv))
+
+    def canCraft(self, inv : "Inventory", output_id : str, times : int = 1) -> Tuple[bool, str]:
         rec = self.recipes.get(output_id)
         if not rec:
             return False, f"No recipe for '{output_id}'."
         
-        # check inputs
-        needed : Dict[str, int] = {}
-        for iid, q in rec.inputs:
-            needed[iid] = needed.get(iid, 0) + q * times
-
-        # collect ALL shortages
-        shortages : list[str] = []
-        for iid, req in needed.items():
-            have = inv.count(iid)
-            if have < req:
-                shortages.append(f"{iid}: need {req}, have {have} (short {req - have})")
-
-        if shortages:
-            try:
-                max_craftable = min(inv.count(iid) // q for iid, q in rec.inputs)
-            except ZeroDivisionError:
-                max_craftable = 0
-            hint = f" You can craft at most {max_craftable} right now." if max_craftable > 0 else ""
-            return False, "Missing materials: " + "; ".join(shortages) + "." + hint
+        # cheap count check first: most failed crafts are short of
+        # materials, and only those pay for building the message
+        needed = self._needed(rec, times)
+        haves = {iid : inv.available(iid) for iid in needed}
+        if any(haves[iid] < req for iid, req in needed.items()):
+            return False, self._shortageText(rec, needed, haves)
             
-        # check capacity for outputs
-        total_out = rec.output_qty * times
-        if not self._canAdd(inv, rec.output_id, total_out):
+        # check capacity for outputs by actually placing them on a snapshot
+        snap = self._dryRun(inv, rec, times, needed)
+        if snap is None:
             return False, "Not enough space to place crafted items."
+        snap.discard()
         
         c = self.items.defs.get(rec.output_id)
         if not c or "craftable" not in c.tags:
@@ -53,60 +74,63 @@ class Crafting:
         
         return True, "Yes"
     
-    def craft(self, inv : Inventory, output_id : str, times : int = 1) -> bool:
+    def craft(self, inv : "Inventory", output_id : str, times : int = 1) -> bool:
         """
-        If counts/space insufficient, do nothing.
-        If removing inputs partially succeeds, roll back.
+        Craft on a snapshot and commit it, so a craft that cannot finish
+        leaves the inventory exactly as it was. The dry run that is
+        committed is the only placement check; canCraft is not called.
         """
-        ok, _ = self.canCraft(inv, output_id, times)
-        if not ok:
+        rec = self.recipes.get(output_id)
+        if not rec:
             return False
+        needed = self._needed(rec, times)
+        if any(inv.available(iid) < req for iid, req in needed.items()):
+            return False
+        
+        # a shared (ConcurrentInventory) commit is refused if another thread
+        # touched the same slots meanwhile; redo the dry run on fresh state
+        for _ in range(self.COMMIT_ATTEMPTS):
+            snap = self._dryRun(inv, rec, times, needed)
+            if snap is None:
+                return False
+            if snap.commit():
+                return True
         
-        rec = self.recipes[output_id]
+        return False
+    
+    def _needed(self, rec : Recipe, times : int) -> Dict[str, int]:
         needed : Dict[str, int] = {}
         for iid, q in rec.inputs:
             needed[iid] = needed.get(iid, 0) + q * times
-
-        # remove inputs, tracking what we actually removed to allow rollback
-        removed : Dict[str, int] = {}
-        for iid, req in needed.items():
-            got = inv.remove(iid, req)
-            removed[iid] = got
-            if got < req:
-                # rollback previously removed
-                for rid, qty in removed.items:
-                    if qty > 0:
-                        inv.add(rid, qty)
-                return False
-            
-        # add outputs
-        out_total = rec.output_qty * times
-        added = inv.add(rec.output_id, out_total)
-        if added < out_total:
-            # rollback: remove what we add and give back inputs
-            if added > 0:
-                inv.remove(rec.output_id, added)
-            for rid, qty in removed.items():
-                if qty > 0:
-                    inv.add(rid, qty)
-            return False
-        
-        return True
+        return needed
+    
+    def _shortageText(self, rec : Recipe, needed : Dict[str, int], haves : Dict[str, int]) -> str:
+        # collect ALL shortages (reserved materials are spoken for)
+        shortages = [f"{iid}: need {req}, have {haves[iid]} (short {req - haves[iid]})"
+                     for iid, req in needed.items() if haves[iid] < req]
+        try:
+            max_craftable = min(haves[iid] // q for iid, q in rec.inputs)
+        except ZeroDivisionError:
+            max_craftable = 0
+        hint = f" You can craft at most {max_craftable} right now." if max_craftable > 0 else ""
+        return "Missing materials: " + "; ".join(shortages) + "." + hint
     
-    def _canAdd(self, inv : Inventory, item_id : str, qty : int) -> bool:
+    def _dryRun(self, inv : "Inventory", rec : Recipe, times : int,
+                needed : Optional[Dict[str, int]] = None) -> Optional["InventorySnapshot"]:
         """
-        Estimate if we can fit 'qty' of item_id into the inventory based on:
-        - free space in existing stacks of that item (only for stackables)
-        - number of empty slots * max_stack
+        Remove inputs and add outputs on a copy-on-write snapshot of inv.
+        Returns the snapshot (for commit) if every step fully succeeded, else None.
         """
-        max_stack = inv._maxStack(item_id)
-        # space in existing stacks (only vaid for stackables)
-        space = 0
-        if max_stack > 1:
-            for s in inv.slots:
-                if s and s.item_id == item_id:
-                    space += (max_stack - s.qty)
-        # empty slots capacity
-        empties = sum(1 for s in inv.slots if s is None)
-        capacity = space + empties * max_stack
-        return capacity >= qty
\ No newline at end of file
+        snap = inv.snapshot()
+        if needed is None:
+            needed = self._needed(rec, times)
+        for iid, req in needed.items():
+            if snap.remove(iid, req) < req:
+                snap.discard()
+                return None
+        out_total = rec.output_qty * times
+        if snap.add(rec.output_id, out_total) < out_total:
+            snap.discard()
+            return None
+
+        return snap
@@ -0,0 +1,229 @@
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TYPE_CHECKING
+from .crafting import Crafting, Recipe
+
+if TYPE_CHECKING:
+    from inventory.inventory import Inventory, Reservation
+
+_job_ids = itertools.count(1)
+
+Delivered = Callable[["CraftQueue", str, int], None]
+Failed = Callable[["CraftQueue", "CraftJob"], None]
+
+def _needs(rec : Recipe, times : int) -> Dict[str, int]:
+    needed : Dict[str, int] = {}
+    for iid, q in rec.inputs:
+        needed[iid] = needed.get(iid, 0) + q * times
+    return needed
+
+@dataclass
+class CraftJob:
+    """
+    'qty' crafts of one recipe queued for an owner. Inputs for every craft
+    are reserved in the inventory when the job is queued and spent one
+    craft at a time; 'done' counts crafts delivered. The recipe is kept so
+    a hot reload can't change what each craft spends.
+    """
+    recipe : Recipe
+    qty : int
+    res : "Reservation"
+    done : int = 0
+    job_id : int = field(default_factory = lambda : next(_job_ids))
+
+    @property
+    def output_id(self) -> str:
+        return self.recipe.output_id
+
+    @property
+    def remaining(self) -> int:
+        return self.qty - self.done
+
+class CraftQueue:
+    """
+    One owner's timed crafting queue; jobs run one craft at a time, in order.
+    Create through CraftScheduler.queueFor so the scheduler can drive it.
+    """
+    def __init__(self, scheduler : "CraftScheduler", owner : Hashable, inv : "Inventory") -> None:
+        self.scheduler = scheduler
+        self.owner = owner
+        self.inv = inv
+        self.jobs : List[CraftJob] = []
+        # completion time of the craft in progress (None while idle)
+        self.due : Optional[float] = None
+        self.started = 0.0
+        # bumped whenever 'due' changes, so superseded heap entries are skipped
+        self.gen = 0
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def enqueue(self, output_id : str, times : int = 1) -> Tuple[bool, str]:
+        """Reserve the inputs for 'times' crafts now and queue them."""
+        crafting = self.scheduler.crafting
+        rec = crafting.recipes.get(output_id)
+        if not rec:
+            return False, f"No recipe for '{output_id}'."
+        if times <= 0:
+            return False, "Nothing to craft."
+        res = self.inv.reserve(_needs(rec, times))
+        if res is None:
+            return False, "Missing materials."
+        self.jobs.append(CraftJob(rec, times, res))
+        if self.due is None:
+            self._startNext()
+
+        return True, "Queued."
+
+    def cancel(self, job_id : int) -> bool:
+        """Drop a job and release the inputs of every craft it hasn't delivered."""
+        job = next((j for j in self.jobs if j.job_id == job_id), None)
+        if job is None:
+            return False
+        head = job is self.jobs[0]
+        self.jobs.remove(job)
+        self.inv.release(job.res)
+        if head:
+            self.due = None
+            self.gen += 1
+            self._startNext()
+
+        return True
+
+    def clear(self) -> None:
+        for job in list(self.jobs):
+            self.cancel(job.job_id)
+
+    def progress(self) -> Optional[Tuple[str, float]]:
+        """(output_id, 0..1) for the craft in progress, or None while idle."""
+        if self.due is None or not self.jobs:
+            return None
+        span = self.due - self.started
+
+        return self.jobs[0].output_id, (1.0 if span <= 0 else min(1.0, (self.scheduler.now - self.started) / span))
+
+    def queuedWork(self) -> float:
+        """Seconds until the whole queue is done."""
+        if not self.jobs:
+            return 0.0
+        rest = sum(j.recipe.craft_time * j.remaining for j in self.jobs) - self.jobs[0].recipe.craft_time
+        return max(0.0, (self.due or self.scheduler.now) - self.scheduler.now) + rest
+
+    # <<----------- Internals ----------->>
+    def _startNext(self) -> None:
+        if not self.jobs:
+            return
+        self.started = self.scheduler.now
+        self.due = self.started + self.jobs[0].recipe.craft_time
+        self.gen += 1
+        self.scheduler._push(self)
+
+    def _complete(self) -> bool:
+        """
+        The craft in progress is due: deliver it, or retry later if there's
+        no room. If the held inputs are gone from the inventory (moved out by
+        code that bypassed the reservation) the job can never finish, so it
+        is dropped, its hold released, and the failure reported.
+        """
+        job = self.jobs[0]
+        out_qty = job.recipe.output_qty
+        needs = _needs(job.recipe, 1)
+        if any(self.inv.count(k) < q for k, q in needs.items()):
+            self.cancel(job.job_id)
+            self.scheduler._failed(self, job)
+            return False
+        # spend one craft's inputs and place its output in the same commit
+        snap = self.inv.snapshot()
+        if (not snap.spend(job.res, needs) or snap.add(job.output_id, out_qty) < out_qty
+                or not snap.commit()):
+            snap.discard()
+            self.due = self.scheduler.now + self.scheduler.retry_delay
+            self.gen += 1
+            self.scheduler._push(self)
+            return False
+        job.done += 1
+        if job.remaining <= 0:
+            self.jobs.pop(0)
+        self.due = None
+        self.scheduler._delivered(self, job.output_id, out_qty)
+        self._startNext()
+
+        return True
+
+class CraftScheduler:
+    """
+    Drives every owner's CraftQueue from one heap of (due, seq, queue, gen).
+
+    Only a queue with a craft in progress has an entry, so advance(now)
+    touches just what has come due: idle queues cost nothing, and a world
+    with thousands of players crafting pays per completion, not per queue
+    per tick. Cancelled or rescheduled crafts leave a stale entry that is
+    skipped by its generation.
+
+        crafts = CraftScheduler(crafting)
+        q = crafts.queueFor(player.name, player.inv)
+        q.enqueue("iron_pickaxe", 2)
+        crafts.advance(now)     # each frame / server tick
+    """
+    # output didn't fit: try again this many seconds later
+    RETRY_DELAY = 1.0
+
+    def __init__(self, crafting : Crafting, *, retry_delay : Optional[float] = None) -> None:
+        self.crafting = crafting
+        self.now = 0.0
+        self.retry_delay = self.RETRY_DELAY if retry_delay is None else retry_delay
+        self.queues : Dict[Hashable, CraftQueue] = {}
+        self._heap : List[Tuple[float, int, CraftQueue, int]] = []
+        self._seq = itertools.count()
+        # called as fn(queue, output_id, qty) on every delivered craft
+        self.listeners : List[Delivered] = []
+        # called as fn(queue, job) when a job is dropped because its inputs are gone
+        self.fail_listeners : List[Failed] = []
+
+    def queueFor(self, owner : Hashable, inv : "Inventory") -> CraftQueue:
+        q = self.queues.get(owner)
+        if q is None:
+            q = self.queues[owner] = CraftQueue(self, owner, inv)
+        return q
+
+    def drop(self, owner : Hashable) -> None:
+        """Forget owner's queue, refunding whatever it still had queued."""
+        q = self.queues.pop(owner, None)
+        if q is not None:
+            q.clear()
+
+    def advance(self, now : float) -> int:
+        """Deliver every craft due by 'now'; returns how many were delivered."""
+        heap = self._heap
+        delivered = 0
+        while heap and heap[0][0] <= now:
+            due, _, q, gen = heapq.heappop(heap)
+            if gen != q.gen or q.due is None:
+                continue
+            # completions see the clock at their own due time, so the next
+            # craft in the queue starts then, not at 'now'
+            self.now = due
+            if q._complete():
+                delivered += 1
+        self.now = max(self.now, now)
+
+        return delivered
+
+    def update(self, dt : float) -> int:
+        return self.advance(self.now + dt)
+
+    def nextDue(self) -> Optional[float]:
+        """Earliest pending completion (may be a stale entry), for timer-driven callers."""
+        return self._heap[0][0] if self._heap else None
+
+    def _push(self, q : CraftQueue) -> None:
+        heapq.heappush(self._heap, (q.due, next(self._seq), q, q.gen))
+
+    def _delivered(self, q : CraftQueue, output_id : str, qty : int) -> None:
+        for fn in list(self.listeners):
+            fn(q, output_id, qty)
+
+    def _failed(self, q : CraftQueue, job : CraftJob) -> None:
+        for fn in list(self.fail_listeners):
+            fn(q, job)
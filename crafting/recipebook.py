@@ -0,0 +1,203 @@
+from typing import Dict, List, Literal, Optional, Tuple, TYPE_CHECKING
+from inventory.items import Items
+from .compiler import CompiledRecipes, compileRecipes
+
+# json5 is imported where files are parsed, like loadItemDefs
+if TYPE_CHECKING:
+    from pathlib import Path
+
+Kind = Literal["crafting", "cooking"]
+
+def _pair(value, what : str, errors : List[str]) -> Optional[Tuple[str, int]]:
+    if not (isinstance(value, (list, tuple)) and len(value) == 2 and isinstance(value[0], str)
+            and isinstance(value[1], int) and value[1] > 0):
+        errors.append(f"{what} must be [item_id, positive qty], got {value!r}")
+        return None
+    return (value[0], value[1])
+
+def _time(row : dict, name : str, errors : List[str], where : str) -> float:
+    t = row.get(name)
+    if not isinstance(t, (int, float)) or t <= 0:
+        errors.append(f"{where}: '{name}' must be a positive number")
+        return 0.0
+    return float(t)
+
+def _parseRow(row, kind : Kind, items : Items, errors : List[str], where : str):
+    """One JSON row -> Recipe / CookingRecipe, or None with messages appended to 'errors'."""
+    if not isinstance(row, dict):
+        errors.append(f"{where}: expected an object")
+        return None
+    before = len(errors)
+    inputs : List[Tuple[str, int]] = []
+    for i, pair in enumerate(row.get("inputs") or []):
+        p = _pair(pair, f"{where}: inputs[{i}]", errors)
+        if p:
+            inputs.append(p)
+    if not row.get("inputs"):
+        errors.append(f"{where}: 'inputs' is missing or empty")
+
+    if kind == "crafting":
+        out_id = row.get("output_id")
+        out_qty = row.get("output_qty", 1)
+        if not isinstance(out_id, str):
+            errors.append(f"{where}: 'output_id' is missing")
+        if not isinstance(out_qty, int) or out_qty <= 0:
+            errors.append(f"{where}: 'output_qty' must be a positive integer")
+        craft_time = _time(row, "craft_time", errors, where) if "craft_time" in row else 1.0
+        outputs = [out_id] if isinstance(out_id, str) else []
+    else:
+        if not isinstance(row.get("key"), str):
+            errors.append(f"{where}: 'key' is missing")
+        cooked = _pair(row.get("cooked_output"), f"{where}: cooked_output", errors)
+        if "burned_output" not in row:
+            errors.append(f"{where}: 'burned_output' is missing")
+            burned = None
+        else:
+            burned = _pair(row["burned_output"], f"{where}: burned_output", errors)
+        cook_time = _time(row, "cook_time", errors, where)
+        burn_time = _time(row, "burn_time", errors, where)
+        outputs = [p[0] for p in (cooked, burned) if p]
+
+    for iid in [i for i, _ in inputs] + outputs:
+        if iid not in items.defs:
+            errors.append(f"{where}: unknown item id '{iid}'")
+    if len(errors) > before:
+        return None
+
+    if kind == "crafting":
+        from .crafting import Recipe
+        return Recipe(output_id = out_id, output_qty = out_qty, inputs = inputs, craft_time = craft_time)
+    from cooking.recipes import CookingRecipe
+    return CookingRecipe(key = row["key"], inputs = inputs, cooked_output = cooked, burned_output = burned,
+                         cook_time = cook_time, burn_time = burn_time)
+
+def parseRecipes(data, kind : Kind, items : Items, source : str = "recipes") -> Tuple[Dict[str, object], List[str]]:
+    """
+    Validate a list of recipe rows against the item catalog.
+    Returns (recipes by key, errors); every problem is reported, not just the first.
+    """
+    errors : List[str] = []
+    recipes : Dict[str, object] = {}
+    if not isinstance(data, list):
+        return {}, [f"{source}: expected a list of recipes"]
+    for n, row in enumerate(data):
+        name = row.get("output_id" if kind == "crafting" else "key") if isinstance(row, dict) else None
+        where = f"{source}[{n}]" + (f" ({name})" if name else "")
+        rec = _parseRow(row, kind, items, errors, where)
+        if rec is None:
+            continue
+        key = rec.output_id if kind == "crafting" else rec.key
+        if key in recipes:
+            errors.append(f"{where}: duplicate recipe '{key}'")
+            continue
+        recipes[key] = rec
+
+    return recipes, errors
+
+class RecipeBook:
+    """
+    Recipes loaded from a JSON5 file and kept in sync with it.
+
+    The file is validated against the item catalog and compiled once. reload()
+    (or poll(), which checks the mtime first) re-reads it, works out which
+    recipes were added, changed or removed, and patches only those: the
+    shared 'recipes' dict, 'compiled', and every attached Crafting /
+    CookingStation via their applyRecipeEdit hook. A file that fails
+    validation on reload is ignored and the error kept in 'last_error',
+    so a typo while editing never takes recipes away from a running game.
+
+        book = RecipeBook(root / "inventory" / "cooking_recipes.json", items, "cooking")
+        oven = book.attach(CookingStation(items, book.recipes))
+        book.poll()     # each second or so
+    """
+    def __init__(self, path : "Path", items : Items, kind : Kind) -> None:
+        if kind not in ("crafting", "cooking"):
+            raise ValueError(f"unknown recipe kind '{kind}'")
+        self.path = path
+        self.items = items
+        self.kind = kind
+        self.recipes : Dict[str, object] = {}
+        self.compiled : CompiledRecipes = compileRecipes(self.recipes, items)
+        self.attached : List[object] = []
+        self.last_error : Optional[str] = None
+        self.version = 0
+        self._mtime : Optional[float] = None
+        loaded, errors = self._read()
+        if errors:
+            raise ValueError(f"invalid recipes in {path.name}:\n  " + "\n  ".join(errors))
+        self._apply(loaded)
+
+    def _read(self) -> Tuple[Dict[str, object], List[str]]:
+        import json5
+        try:
+            self._mtime = self.path.stat().st_mtime
+            data = json5.loads(self.path.read_text(encoding = "utf-8"))
+        except (OSError, ValueError) as e:
+            return {}, [f"{self.path.name}: {e}"]
+        return parseRecipes(data, self.kind, self.items, self.path.name)
+
+    def _apply(self, loaded : Dict[str, object]) -> Tuple[List[str], List[str]]:
+        # frozen dataclasses compare by value, so untouched rows are skipped
+        changed = {k : r for k, r in loaded.items() if self.recipes.get(k) != r}
+        removed = {k : r for k, r in self.recipes.items() if k not in loaded}
+        if not changed and not removed:
+            return [], []
+        # attached objects go first: a station may share this very dict and
+        # still needs the old recipe to unwind a cook in progress
+        for obj in self.attached:
+            obj.applyRecipeEdit(changed, removed)
+        for key in removed:
+            self.recipes.pop(key, None)
+        self.recipes.update(changed)
+        self.compiled.update(changed, removed)
+        self.version += 1
+
+        return list(changed), list(removed)
+
+    def attach(self, obj):
+        """Keep obj (a Crafting or CookingStation) in step with this file; returns obj."""
+        if obj not in self.attached:
+            self.attached.append(obj)
+        return obj
+
+    def detach(self, obj) -> None:
+        if obj in self.attached:
+            self.attached.remove(obj)
+
+    def reload(self) -> Tuple[List[str], List[str]]:
+        """Re-read the file; returns (changed keys, removed keys). Invalid files change nothing."""
+        loaded, errors = self._read()
+        if errors:
+            self.last_error = "\n".join(errors)
+            return [], []
+        self.last_error = None
+
+        return self._apply(loaded)
+
+    def poll(self) -> bool:
+        """Reload if the file's mtime moved; True if any recipe changed."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        changed, removed = self.reload()
+
+        return bool(changed or removed)
+
+class RecipeWatcher:
+    """Polls several RecipeBooks at most once per 'interval' seconds of accumulated time."""
+    def __init__(self, books : List[RecipeBook], *, interval : float = 1.0) -> None:
+        self.books = books
+        self.interval = interval
+        self._since = 0.0
+
+    def update(self, dt : float) -> List[RecipeBook]:
+        """Advance by dt; returns the books that changed on this call."""
+        self._since += dt
+        if self._since < self.interval:
+            return []
+        self._since = 0.0
+
+        return [b for b in self.books if b.poll()]
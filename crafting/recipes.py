@@ -1,18 +1,27 @@
-from typing import Dict
+from typing import Dict, Optional, TYPE_CHECKING
+from inventory.items import Items
 from crafting.crafting import Recipe 
 
-recipes : Dict[str, Recipe] = {
-    "wooden_pickaxe" : Recipe(
-        output_id = "wooden_pickaxe",
-        output_qty = 1,
-        inputs = [("wood", 3)]
-    ),
-    "iron_pickaxe" : Recipe(
-        output_id = "iron_pickaxe",
-        output_qty = 1,
-        inputs = [("iron_ingot", 2), ("wood", 1)]
-    )
-}
+if TYPE_CHECKING:
+    from pathlib import Path
+    from crafting.recipebook import RecipeBook
+
+def recipesPath() -> "Path":
+    # pathlib stays off the crafting import path until a book is loaded
+    from pathlib import Path
+    return Path(__file__).resolve().parent.parent / "inventory" / "crafting_recipes.json"
+
+# one book per catalog its recipes were validated against; None is items.json
+_books : Dict[Optional[Items], "RecipeBook"] = {}
+
+def getRecipeBook(items : Optional[Items] = None) -> "RecipeBook":
+    """The crafting_recipes.json book for 'items', loaded on first use (against items.json if no catalog is given)."""
+    book = _books.get(items)
+    if book is None:
+        from crafting.recipebook import RecipeBook
+        path = recipesPath()
+        book = _books[items] = RecipeBook(path, items or Items.load(path.parent / "items.json"), "crafting")
+    return book
 
 def getRecipes() -> Dict[str, Recipe]:
-    return dict(recipes)
\ No newline at end of file
+    return dict(getRecipeBook().recipes)
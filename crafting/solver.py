@@ -0,0 +1,221 @@
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING
+from inventory.cache import LRUCache
+from .compiler import CompiledRecipes
+from .crafting import Crafting
+
+if TYPE_CHECKING:
+    from inventory.inventory import Inventory
+
+@dataclass(frozen=True)
+class Bundle:
+    """
+    A set of crafts to make together: (recipe key, times) pairs, and the
+    value they add (outputs minus inputs consumed). 'optimal' is False
+    when the search hit its node budget and returned its best so far.
+
+    Feasibility assumes like items fully stacked, so a bundle for a
+    fragmented inventory (e.g. several part stacks of one item) can fail
+    BundleSolver.apply for lack of a free slot; the inventory is left
+    untouched and the caller can sort() it and apply again.
+    """
+    crafts : Tuple[Tuple[str, int], ...]
+    gain : float
+    optimal : bool = True
+    nodes : int = 0
+
+    def asDict(self) -> Dict[str, int]:
+        return dict(self.crafts)
+
+class BundleSolver:
+    """
+    Best combination of crafts from one inventory under shared materials.
+
+    Maximizes the total value gained (each craft: output value minus the
+    value of its inputs, from 'values'; unlisted items are worth 0) subject
+    to materials on hand, with reserved items excluded, and to slot
+    capacity: the inventory must still hold the result when like items are
+    stacked. Outputs are not fed into other recipes in the same bundle,
+    and a recipe that loses value is never chosen, even to free up slots.
+
+    Branch and bound over the compiled recipe rows: recipes with a positive
+    gain are tried best gain first, each at its largest feasible count down
+    to 0, so the first leaf is the greedy answer. Subtrees whose bound (each
+    remaining recipe at its own max) can't beat the best so far are cut,
+    and max_nodes caps the work for NPC-scale use. Results are memoized in
+    an LRU keyed on the count vector and capacity, so NPCs sharing a
+    loadout, or one NPC asking again, cost a dict lookup.
+
+        solver = BundleSolver(crafting, {"iron_pickaxe" : 40, "wood" : 1, ...})
+        bundle = solver.solve(npc.inv)
+        solver.apply(npc.inv, bundle)
+
+    apply() places items into the slots as they are, not fully stacked, so
+    it can refuse a bundle that solve() found room for; see Bundle.
+    """
+    MAX_NODES = 2000
+
+    def __init__(self, crafting : Crafting, values : Mapping[str, float], *,
+                 cache_size : int = 4096, max_nodes : Optional[int] = None) -> None:
+        self.crafting = crafting
+        self.values = dict(values)
+        self.max_nodes = self.MAX_NODES if max_nodes is None else max_nodes
+        self.cache : LRUCache[Bundle] = LRUCache(cache_size)
+        # per-ordinal values and stack sizes for one compiled version
+        self._tables : Optional[Tuple[int, int, List[float], List[int]]] = None
+        # compiled table the cache was filled from, and how many we've seen;
+        # held so a rebuilt table never shares a key with the one it replaced
+        self._comp : Optional[CompiledRecipes] = None
+        self._compiles = 0
+
+    def setValues(self, values : Mapping[str, float]) -> None:
+        self.values = dict(values)
+        self._tables = None
+        self.cache.clear()
+
+    def solve(self, inv : "Inventory") -> Bundle:
+        comp, _ = self._compiledStamp()
+        held = comp.vectorFromCounts(inv.held) if inv.held else None
+        return self.solveVector(comp.countVector(inv), inv.capacity, held = held)
+
+    def solveVector(self, vec : List[int], capacity : int, *, held : Optional[List[int]] = None) -> Bundle:
+        """
+        Solve for an available-count vector (CompiledRecipes.countVector
+        order). 'held' is the reserved count vector: not craftable, but it
+        still takes up slots.
+        """
+        comp, stamp = self._compiledStamp()
+        key = (stamp, comp.version, capacity, tuple(vec), tuple(held) if held else ())
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        return self.cache.put(key, self._search(comp, list(vec), held, capacity))
+
+    def apply(self, inv : "Inventory", bundle : Bundle) -> bool:
+        """
+        Make every craft in the bundle in one snapshot commit.
+        False (inventory untouched) if anything is short or doesn't fit;
+        outputs go into the slots as they are, so a fragmented inventory
+        can refuse a bundle solve() planned fully stacked.
+        """
+        recipes = self.crafting.recipes
+        for _ in range(Crafting.COMMIT_ATTEMPTS):
+            snap = inv.snapshot()
+            ok = True
+            for key, times in bundle.crafts:
+                rec = recipes.get(key)
+                if rec is None:
+                    ok = False
+                    break
+                for iid, q in rec.inputs:
+                    if snap.remove(iid, q * times) < q * times:
+                        ok = False
+                        break
+                if ok and snap.add(rec.output_id, rec.output_qty * times) < rec.output_qty * times:
+                    ok = False
+                if not ok:
+                    break
+            if not ok:
+                snap.discard()
+                return False
+            if snap.commit():
+                return True
+
+        return False
+
+    # <<----------- Search ----------->>
+    def _compiledStamp(self) -> Tuple[CompiledRecipes, int]:
+        """The current compiled table and a counter that changes whenever it is rebuilt."""
+        comp = self.crafting.compiled
+        if comp is not self._comp:
+            # rebuilt after addRecipe/setRecipes: ordinals may differ
+            self._comp = comp
+            self._compiles += 1
+            self._tables = None
+            self.cache.clear()
+        return comp, self._compiles
+
+    def _valueTables(self, comp : CompiledRecipes) -> Tuple[List[float], List[int]]:
+        t = self._tables
+        if t is None or t[0] != self._compiles or t[1] != comp.version or len(t[2]) != len(comp.item_ids):
+            defs = self.crafting.items.defs
+            vals = [float(self.values.get(iid, 0.0)) for iid in comp.item_ids]
+            stacks = [max(1, defs[iid].stack_size) if iid in defs else 1 for iid in comp.item_ids]
+            t = self._tables = (self._compiles, comp.version, vals, stacks)
+        return t[2], t[3]
+
+    def _search(self, comp : CompiledRecipes, avail : List[int], held : Optional[List[int]],
+                capacity : int) -> Bundle:
+        vals, stacks = self._valueTables(comp)
+        # candidates: (gain per craft, recipe row, input ordinals, input qtys, output ordinal, output qty)
+        cand : List[Tuple[float, int, Tuple[int, ...], Tuple[int, ...], int, int]] = []
+        for r, (idx, qty) in enumerate(comp.rows):
+            if not idx:
+                continue
+            out_j, out_q = comp.out_item[r], comp.out_qty[r]
+            gain = out_q * vals[out_j] - sum(q * vals[j] for j, q in zip(idx, qty))
+            if gain > 0 and min(avail[j] // q for j, q in zip(idx, qty)) > 0:
+                cand.append((gain, r, idx, qty, out_j, out_q))
+        if not cand:
+            return Bundle((), 0.0, True, 0)
+        cand.sort(key = lambda c : (-c[0], c[1]))
+
+        # slot use with like items fully stacked; held items take room too
+        count = [a + h for a, h in zip(avail, held)] if held else list(avail)
+        used = sum(-(-c // s) for c, s in zip(count, stacks) if c)
+        times = [0] * len(cand)
+        best_gain = 0.0
+        best : List[int] = list(times)
+        nodes = 0
+        budget = self.max_nodes
+        n_cand = len(cand)
+
+        def bound(i : int) -> float:
+            total = 0.0
+            for gain, _, idx, qty, _, _ in cand[i:]:
+                m = min(avail[j] // q for j, q in zip(idx, qty))
+                if m > 0:
+                    total += gain * m
+            return total
+
+        def dfs(i : int, gain_so_far : float) -> None:
+            nonlocal best_gain, best, nodes, used
+            nodes += 1
+            # slots are only checked here: a later recipe may free what an earlier one filled
+            if gain_so_far > best_gain and used <= capacity:
+                best_gain = gain_so_far
+                best = list(times)
+            if i == n_cand or nodes > budget:
+                return
+            if gain_so_far + bound(i) <= best_gain + 1e-9:
+                return
+            gain, _, idx, qty, out_j, out_q = cand[i]
+            m = min(avail[j] // q for j, q in zip(idx, qty))
+            touched = set(idx)
+            touched.add(out_j)
+            for n in range(m, -1, -1):
+                if n:
+                    before = sum(-(-count[j] // stacks[j]) for j in touched)
+                    for j, q in zip(idx, qty):
+                        avail[j] -= n * q
+                        count[j] -= n * q
+                    count[out_j] += n * out_q
+                    delta = sum(-(-count[j] // stacks[j]) for j in touched) - before
+                    used += delta
+                    times[i] = n
+                    dfs(i + 1, gain_so_far + n * gain)
+                    times[i] = 0
+                    used -= delta
+                    for j, q in zip(idx, qty):
+                        avail[j] += n * q
+                        count[j] += n * q
+                    count[out_j] -= n * out_q
+                else:
+                    dfs(i + 1, gain_so_far)
+                if nodes > budget:
+                    return
+
+        dfs(0, 0.0)
+        crafts = tuple(sorted((comp.keys[cand[k][1]], n) for k, n in enumerate(best) if n))
+
+        return Bundle(crafts, best_gain, nodes <= budget, nodes)
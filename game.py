@@ -1,17 +1,22 @@
 # import modules
 import sys
+import time
+from collections import deque
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import pygame
 
 # my modules
 from player.player import Player
+from player.effects import EffectTable
 from storage.storage import Storage
 from inventory.items import Items
 from inventory.inventory import Inventory
 from crafting.crafting import Crafting
-from crafting.recipes import getRecipes as getCraftingRecipes
+from crafting.recipes import getRecipeBook as getCraftingBook
+from crafting.recipebook import RecipeWatcher
 from cooking.cooking import CookingStation
-from cooking.recipes import getRecipes as getCookingRecipes
+from cooking.recipes import getRecipeBook as getCookingBook
 
 # variables
 WIDTH, HEIGHT = 1024, 640
@@ -64,6 +69,13 @@ LIST_Y = RIGHT_GRID_Y
 LIST_W = WIDTH - RIGHT_GRID_X - 24
 ROW_H = 28
 
+OVERLAY_X = 24
+OVERLAY_Y = HEIGHT - 28
+OVERLAY_W = 560
+OVERLAY_H = 20
+OVERLAY_REFRESH = 0.25  # seconds between overlay text updates
+FPS = 60
+
 # Functions
 def makeInv(items, capacity=16):
     return Inventory(capacity=capacity, items=items)
@@ -75,59 +87,161 @@ def nameOf(items : Items, item_id : str) -> str:
 def clamp(v, lo, hi):
     return lo if v < lo else hi if v > hi else v
 
-def moveBetweenInventories(items : Items, src_inv : Inventory, src_idx : int,
-                           dst_inv : Inventory, dst_idx : int) -> bool:
-    if not (0 <= src_idx < src_inv.capacity and 0 <= dst_idx < dst_inv.capacity):
-        return False
-    
-    src = src_inv.slots[src_idx]
-    dst = dst_inv.slots[dst_idx]
-
-    # Nothing to move
-    if src is None:
-        return False
-    
-    def maxStack(inv, iid):
-        return inv._maxStack(iid)
-    
-    # if dest empty -> move stack
-    if dst is None:
-        dst_inv.slots[dst_idx] = src
-        src_inv.slots[src_idx] = None
+class GridPanel:
+    """
+    A block of equally sized cells laid out in rows.
+    Geometry is fixed when the panel is built, so hit() is pure arithmetic:
+    no rects and no loop over cells.
+    """
+    def __init__(self, name : str, x : int, y : int, cols : int, count : int, *,
+                 cell_w : int = SLOT_SIZE, cell_h : int = SLOT_SIZE,
+                 pad_x : int = SLOT_PAD, pad_y : int = SLOT_PAD) -> None:
+        self.name = name
+        self.x, self.y = x, y
+        self.cols = max(1, cols)
+        self.count = count
+        self.rows = (count + self.cols - 1) // self.cols
+        self.cell_w, self.cell_h = cell_w, cell_h
+        self.pitch_x, self.pitch_y = cell_w + pad_x, cell_h + pad_y
+        self.w = self.cols * self.pitch_x - pad_x
+        self.h = max(0, self.rows * self.pitch_y - pad_y)
+
+    def hit(self, px : int, py : int) -> Optional[int]:
+        rx, ry = px - self.x, py - self.y
+        if rx < 0 or ry < 0 or rx >= self.w or ry >= self.h:
+            return None
+        col, off_x = divmod(rx, self.pitch_x)
+        row, off_y = divmod(ry, self.pitch_y)
+        # the gutter between cells belongs to no slot
+        if off_x >= self.cell_w or off_y >= self.cell_h:
+            return None
+        idx = int(row * self.cols + col)
+
+        return idx if idx < self.count else None
+
+    def cellRect(self, idx : int) -> Tuple[int, int, int, int]:
+        row, col = divmod(idx, self.cols)
+        return (self.x + col * self.pitch_x, self.y + row * self.pitch_y, self.cell_w, self.cell_h)
+
+# panels that take input in each mode, in hit-test order
+MODE_PANELS = {
+    "menu" : ("menu", "player"),
+    "storage" : ("menu", "player", "storage"),
+    "crafting" : ("menu", "player", "recipes"),
+    "cooking" : ("menu", "player", "cook_in", "cook_out"),
+}
+
+class Layout:
+    """
+    Screen geometry for every panel, rebuilt only on resize or when a panel's
+    cell count changes. hit() maps a point to (panel, index).
+    Right-hand panels stay anchored to the right edge of the window.
+    """
+    def __init__(self, width : int, height : int, *, player_slots : int, storage_slots : int,
+                 cook_inputs : int, recipe_rows : int) -> None:
+        self.counts : Dict[str, int] = {
+            "player" : player_slots,
+            "storage" : storage_slots,
+            "cook_in" : cook_inputs,
+            "recipes" : recipe_rows,
+        }
+        self.resize(width, height)
+
+    def resize(self, width : int, height : int) -> None:
+        self.width, self.height = width, height
+        right_x = max(RIGHT_GRID_X, width - (WIDTH - RIGHT_GRID_X))
+        list_w = max(BTN_W, width - right_x - 24)
+        cook_out_y = COOK_OUT_Y - COOK_INPUT_Y + RIGHT_GRID_Y
+
+        p : Dict[str, GridPanel] = {}
+        p["menu"] = GridPanel("menu", LEFT_GRID_X, MENU_Y, 3, 3, cell_w=BTN_W, cell_h=BTN_H, pad_x=BTN_PAD)
+        p["player"] = GridPanel("player", LEFT_GRID_X, LEFT_GRID_Y, GRID_COLS, self.counts["player"])
+        p["storage"] = GridPanel("storage", right_x, RIGHT_GRID_Y, GRID_COLS, self.counts["storage"])
+        p["recipes"] = GridPanel("recipes", right_x, LIST_Y, 1, self.counts["recipes"],
+                                 cell_w=list_w, cell_h=ROW_H - 4, pad_y=4)
+        p["cook_in"] = GridPanel("cook_in", right_x, COOK_INPUT_Y, COOK_INPUT_COLS, self.counts["cook_in"])
+        p["cook_out"] = GridPanel("cook_out", right_x, cook_out_y, 2, 2)
+        self.panels = p
+        self.by_mode = {mode : tuple(p[n] for n in names) for mode, names in MODE_PANELS.items()}
+
+        self.cook_bar = (right_x, COOK_BAR_Y, COOK_BAR_W, COOK_BAR_H)
+        self.cook_status = (right_x, cook_out_y + SLOT_SIZE + 12, list_w, 20)
+        self.msg = (LEFT_GRID_X, height - 56, width - 48, 20)
+        self.overlay = (OVERLAY_X, height - 28, OVERLAY_W, OVERLAY_H)
+
+    def setCount(self, panel : str, count : int) -> bool:
+        """Rebuild if panel's cell count changed; returns True if it did."""
+        if self.counts.get(panel) == count:
+            return False
+        self.counts[panel] = count
+        self.resize(self.width, self.height)
         return True
-    
-    # same item -> merge if stackable and no per instance iid
-    if src.item_id == dst.item_id:
-        m = maxStack(dst_inv, dst.item_id)
-        if getattr(src, "iid", None) is None and getattr(dst, "iid", None) is None:
-            space = m - dst.qty
-            if space <= 0:
-                # no space
-                src_inv[src_idx], dst_inv.slots[dst_idx] = dst, src
-                return True
-            moved = min(space, src.qty)
-            dst.qty += moved
-            src.qty -= moved
-            if src.qty == 0:
-                src_inv.slots[src_idx] = None
-            return moved > 0
-        else:
-            src_inv.slots[src_idx], dst_inv.slots[dst_idx] = dst, src
-            return True
-        
-    # Different items -> swap stacks
-    src_inv.slots[src_idx], dst_inv.slots[dst_idx] = dst, src
-    return True
+
+    def hit(self, pos, mode : str) -> Optional[Tuple[str, int]]:
+        px, py = pos
+        for panel in self.by_mode.get(mode, ()):
+            idx = panel.hit(px, py)
+            if idx is not None:
+                return panel.name, idx
+
+        return None
+
+class LabelCache:
+    """
+    Rendered text surfaces keyed by (text, color, font).
+    Labels in this UI come from a small vocabulary (item names, quantities,
+    button captions), so the cache is simply cleared once it grows past max_entries.
+    """
+    def __init__(self, max_entries : int = 1024) -> None:
+        self.max_entries = max_entries
+        self._surfaces : Dict[tuple, "pygame.Surface"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text : str, color) -> "pygame.Surface":
+        key = (text, tuple(color), font)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        if len(self._surfaces) >= self.max_entries:
+            self._surfaces.clear()
+        surf = font.render(text, True, color)
+        self._surfaces[key] = surf
+
+        return surf
+
+class FrameStats:
+    """Rolling frame time plus per-frame blit and dirty-rect counts."""
+    def __init__(self, window : int = 60) -> None:
+        self.samples : deque = deque(maxlen=window)
+        self.blits = 0
+        self.last_blits = 0
+        self.last_dirty = 0
+        self._t0 = 0.0
+
+    def begin(self) -> None:
+        self._t0 = time.perf_counter()
+        self.blits = 0
+
+    def end(self, dirty_count : int) -> None:
+        self.samples.append((time.perf_counter() - self._t0) * 1000.0)
+        self.last_blits = self.blits
+        self.last_dirty = dirty_count
+
+    def avgMs(self) -> float:
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
 
 class Button:
     def __init__(self, rect, label):
         self.rect = pygame.Rect(rect)
         self.label = label
 
-    def draw(self, surf, font, mouse):
+    def draw(self, surf, font, mouse, labels : Optional[LabelCache] = None):
         hovered = self.rect.collidepoint(mouse)
         pygame.draw.rect(surf, SLOT_HOVER if hovered else SLOT, self.rect, border_radius=6)
-        text = font.render(self.label, True, TEXT)
+        text = labels.render(font, self.label, TEXT) if labels else font.render(self.label, True, TEXT)
         surf.blit(text, text.get_rect(center=self.rect.center))
 
     def hit(self, pos):
@@ -136,7 +250,7 @@ class Button:
 class Game:
     def __init__(self):
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("freesansbold.ttf", FONT_SIZE)
         self.title_font = pygame.font.SysFont("freesansbold.ttf", TITLE_SIZE, bold=True)
@@ -144,8 +258,10 @@ class Game:
         # Data
         root = Path(__file__).parent
         self.items = Items.load(root / "inventory" / "items.json")
+        # Timed effects (food buffs), expired from the frame loop
+        self.effects = EffectTable()
         # Inventories
-        self.player = Player("Player", self.items, capacity=16)
+        self.player = Player("Player", self.items, inv_capacity=16, effects=self.effects)
         self.storage = Storage(self.items, capacity=16, name="Storage")
 
         # Seed some stuff
@@ -156,20 +272,36 @@ class Game:
         self.player.addInv("iron_sword", 1)
 
         # Crafting
-        self.crafting = Crafting(self.items, recipes=getCraftingRecipes())
+        crafting_book = getCraftingBook(self.items)
+        self.crafting = crafting_book.attach(Crafting(self.items, recipes=crafting_book.recipes))
 
         # Cooking station
-        self.cookingStation = CookingStation(self.items, recipes=getCookingRecipes(),
-                                             num_inputs=5, num_outputs=1, burn_enabled=False)
+        cooking_book = getCookingBook(self.items)
+        self.cookingStation = cooking_book.attach(CookingStation(self.items, recipes=dict(cooking_book.recipes),
+                                                                 num_inputs=5, num_outputs=1, burn_enabled=False))
+
+        # edits to the recipe files show up live
+        self.recipe_watcher = RecipeWatcher([crafting_book, cooking_book], interval=1.0)
         
         # UI state
         self.mode = "menu"
         self.msg = ""
 
+        # Geometry + current hover target, (panel, index) or None
+        self.layout = Layout(WIDTH, HEIGHT,
+                             player_slots=self.player.inv.capacity,
+                             storage_slots=self.storage.inv.capacity,
+                             cook_inputs=len(self.cookingStation.inputs),
+                             recipe_rows=len(self.crafting.recipes))
+        self.hover : Optional[Tuple[str, int]] = None
+
         # Menu buttons
-        self.btn_storage = Button((24, MENU_Y, BTN_W, BTN_H), "Go to Storage")
-        self.btn_crafting = Button((24 + BTN_W + BTN_PAD, MENU_Y, BTN_W, BTN_H), "Go to Crafting")
-        self.btn_cooking = Button((24 + 2*(BTN_W + BTN_PAD), MENU_Y, BTN_W, BTN_H), "Go to Cooking")
+        menu = self.layout.panels["menu"]
+        self.btn_storage = Button(menu.cellRect(0), "Go to Storage")
+        self.btn_crafting = Button(menu.cellRect(1), "Go to Crafting")
+        self.btn_cooking = Button(menu.cellRect(2), "Go to Cooking")
+        self.buttons = (self.btn_storage, self.btn_crafting, self.btn_cooking)
+        self.button_modes = ("storage", "crafting", "cooking")
 
         # Drag state
         self.dragging = False
@@ -183,55 +315,230 @@ class Game:
         # cooking: show recipe options list for selection
         self.show_cook_options = True
 
-    def gridRect(self, x, y, cols, rows):
-        w = cols * SLOT_SIZE + (cols - 1) * SLOT_PAD
-        h = rows * SLOT_SIZE + (rows - 1) * SLOT_PAD
-        
-        return pygame.Rect(x, y, w, h)
-    
-    def slotRect(self, gx, gy, col, row):
-        x = gx + col * (SLOT_SIZE + SLOT_PAD)
-        y = gy + row * (SLOT_SIZE + SLOT_PAD)
-
-        return pygame.Rect(x, y, SLOT_SIZE, SLOT_SIZE)
-    
-    def hitInvSlot(self, pos, origin_x, origin_y, inv):
-        cols = GRID_COLS
-        rows = (inv.capacity + cols - 1) // cols
-        grid = self.gridRect(origin_x, origin_y, cols, rows)
-        if not grid.collidepoint(pos):
-            return None
-        # Which slot
-        relx, rely = pos[0] - origin_x, pos[1] - origin_y
-        col = relx // (SLOT_SIZE + SLOT_PAD)
-        row = rely // (SLOT_SIZE + SLOT_PAD)
-        if col >= cols or row >= rows:
-            return None
-        idx = int(row * cols + col)
-        if idx >= inv.capacity:
-            return None
-        
-        return idx
-    
-    def hitCookInputSlot(self, pos):
-        # 5 input slots laid out in a row at COOK_INPUT_X/Y
-        for i in range(5):
-            r = self.slotRect(COOK_INPUT_X, COOK_INPUT_Y, i, 0)
-            if r.collidepoint(pos):
-                return i
-            
-        return None
-        
-    def hitCookOutputSlot(self, pos):
-        cooked_r = self.slotRect(COOK_OUT_X, COOK_OUT_Y, 0, 0)
-        burned_r = self.slotRect(COOK_OUT_X + SLOT_SIZE + SLOT_PAD, COOK_OUT_Y, 0, 0)
-        if cooked_r.collidepoint(pos):
-            return ("cooked", 0)
-        if burned_r.collidepoint(pos):
-            return ("burned", 0)
-        
-        return None
-    
-    
-
-
+        # Rendering: cached labels, per-region signatures for dirty-rect redraws
+        self.labels = LabelCache()
+        self.stats = FrameStats()
+        self.show_overlay = True
+        self.full_redraw = True
+        self._sigs : Dict[tuple, object] = {}
+        self._dirty : List[pygame.Rect] = []
+        self._overlay_text = ""
+        self._overlay_next = 0.0
+
+    def cellRect(self, panel : str, idx : int) -> pygame.Rect:
+        return pygame.Rect(self.layout.panels[panel].cellRect(idx))
+
+    def hitTest(self, pos) -> Optional[Tuple[str, int]]:
+        return self.layout.hit(pos, self.mode)
+
+    def isHovered(self, panel : str, idx : int) -> bool:
+        return self.hover == (panel, idx)
+
+    # <<----------- Rendering ----------->>
+    def blit(self, surf, pos) -> None:
+        self.screen.blit(surf, pos)
+        self.stats.blits += 1
+
+    def text(self, font, label : str, color, pos, *, center : bool = False) -> None:
+        surf = self.labels.render(font, label, color)
+        self.blit(surf, surf.get_rect(center=pos) if center else pos)
+
+    def paintIfChanged(self, key : tuple, sig : object, rect, painter) -> None:
+        """
+        Repaint a screen region only when its signature differs from the last frame.
+        """
+        if not self.full_redraw and self._sigs.get(key) == sig:
+            return
+        painter()
+        self._sigs[key] = sig
+        self._dirty.append(pygame.Rect(rect))
+
+    def slotSig(self, item_id : Optional[str], qty : int, iid : Optional[str], hovered : bool) -> tuple:
+        ratio = self.items.durabilityRatio(iid)
+        # quantize durability so small wear does not repaint the slot every hit
+        return (item_id, qty, None if ratio is None else int(ratio * 20), hovered)
+
+    def drawSlot(self, rect, item_id : Optional[str], qty : int, iid : Optional[str], hovered : bool) -> None:
+        pygame.draw.rect(self.screen, BG, rect.inflate(2, 2))
+        pygame.draw.rect(self.screen, SLOT_HOVER if hovered else SLOT, rect, border_radius=6)
+        if not item_id:
+            return
+        name = nameOf(self.items, item_id)
+        self.text(self.font, name[:9], TEXT, (rect.centerx, rect.y + 18), center=True)
+        if qty > 1:
+            self.text(self.font, f"x{qty}", TEXT_DIM, (rect.right - 26, rect.bottom - 18))
+        ratio = self.items.durabilityRatio(iid)
+        if ratio is not None:
+            bar = pygame.Rect(rect.x + 6, rect.bottom - 8, int((rect.w - 12) * clamp(ratio, 0.0, 1.0)), 4)
+            pygame.draw.rect(self.screen, ACCENT if ratio > 0.25 else ALERT, bar)
+
+    def drawInvGrid(self, panel : str, title : str, inv : Inventory) -> None:
+        grid = self.layout.panels[panel]
+        self.paintIfChanged((panel, "title"), (title, grid.x), (grid.x, grid.y - 28, 200, 24),
+                            lambda: self.text(self.title_font, title, TEXT, (grid.x, grid.y - 28)))
+        for i, s in enumerate(inv.slots):
+            rect = self.cellRect(panel, i)
+            hovered = self.isHovered(panel, i)
+            item_id, qty, iid = (s.item_id, s.qty, s.iid) if s else (None, 0, None)
+            self.paintIfChanged((panel, i), self.slotSig(item_id, qty, iid, hovered), rect.inflate(2, 2),
+                                lambda: self.drawSlot(rect, item_id, qty, iid, hovered))
+
+    def drawButtons(self) -> None:
+        for i, b in enumerate(self.buttons):
+            hovered = self.isHovered("menu", i)
+            self.paintIfChanged(("button", b.label), hovered, b.rect,
+                                lambda: self.drawButton(b, hovered))
+
+    def drawButton(self, b : Button, hovered : bool) -> None:
+        # Button.draw hit-tests the mouse itself; hand it a point that matches our hover state
+        b.draw(self.screen, self.font, b.rect.center if hovered else (-1, -1), self.labels)
+        self.stats.blits += 1
+
+    def drawCraftingList(self) -> None:
+        inv = self.player.inv
+        for row, key in enumerate(sorted(self.crafting.recipes)):
+            rect = self.cellRect("recipes", row)
+            rec = self.crafting.recipes[key]
+            ok, _ = self.crafting.canCraft(inv, key)
+            hovered = self.isHovered("recipes", row)
+            needs = ", ".join(f"{nameOf(self.items, iid)} x{q}" for iid, q in rec.inputs)
+            label = f"{nameOf(self.items, key)} x{rec.output_qty}  <-  {needs}"
+
+            def paint():
+                pygame.draw.rect(self.screen, SLOT_HOVER if hovered else PANEL, rect, border_radius=4)
+                self.text(self.font, label, ACCENT if ok else TEXT_DIM, (rect.x + 8, rect.y + 6))
+            self.paintIfChanged(("craft", key), (label, ok, hovered, rect.topleft), rect, paint)
+
+    def drawCooking(self) -> None:
+        st = self.cookingStation
+        for i, s in enumerate(st.inputs):
+            rect = self.cellRect("cook_in", i)
+            hovered = self.isHovered("cook_in", i)
+            self.paintIfChanged(("cook_in", i), (s.item_id, s.qty, hovered, rect.topleft), rect.inflate(2, 2),
+                                lambda: self.drawSlot(rect, s.item_id, s.qty, None, hovered))
+
+        rec = st.recipes.get(st.active_recipe) if st.active_recipe else None
+        progress = 0.0
+        if rec and st.isCooking():
+            progress = clamp(st.job_elapsed / rec.cook_time, 0.0, 1.0)
+        bar = pygame.Rect(self.layout.cook_bar)
+
+        def paintBar():
+            pygame.draw.rect(self.screen, GRID_BG, bar)
+            pygame.draw.rect(self.screen, YELLOW, (bar.x, bar.y, int(bar.w * progress), bar.h))
+        # one repaint per whole percent is plenty for a progress bar
+        self.paintIfChanged(("cook_bar",), (int(progress * 100), bar.topleft), bar, paintBar)
+
+        for idx, (kind, arr) in enumerate((("cooked", st.cooked_out), ("burned", st.burned_out))):
+            s = arr[0]
+            rect = self.cellRect("cook_out", idx)
+            hovered = self.isHovered("cook_out", idx)
+            self.paintIfChanged(("cook_out", kind), (s.item_id, s.qty, hovered, rect.topleft), rect.inflate(2, 2),
+                                lambda: self.drawSlot(rect, s.item_id, s.qty, None, hovered))
+
+        status = st.statusText()
+        status_rect = pygame.Rect(self.layout.cook_status)
+
+        def paintStatus():
+            pygame.draw.rect(self.screen, BG, status_rect)
+            self.text(self.font, status, TEXT_DIM, status_rect.topleft)
+        self.paintIfChanged(("cook_status",), status, status_rect, paintStatus)
+
+    def drawOverlay(self) -> None:
+        now = time.perf_counter()
+        if now >= self._overlay_next:
+            self._overlay_next = now + OVERLAY_REFRESH
+            self._overlay_text = (f"frame {self.stats.avgMs():.2f} ms | fps {self.clock.get_fps():.0f} | "
+                                  f"blits {self.stats.last_blits} | dirty {self.stats.last_dirty} | "
+                                  f"labels {self.labels.hits}/{self.labels.misses}")
+        rect = pygame.Rect(self.layout.overlay)
+
+        def paint():
+            pygame.draw.rect(self.screen, PANEL, rect)
+            # overlay text changes constantly, keep it out of the label cache
+            self.blit(self.font.render(self._overlay_text, True, YELLOW), (rect.x + 6, rect.y + 3))
+        self.paintIfChanged(("overlay",), self._overlay_text, rect, paint)
+
+    def draw(self) -> None:
+        self.stats.begin()
+        if self.full_redraw:
+            self.screen.fill(BG)
+            self._sigs.clear()
+            self._dirty.append(self.screen.get_rect())
+
+        if self.layout.setCount("recipes", len(self.crafting.recipes)):
+            self.hover = self.hitTest(pygame.mouse.get_pos())
+        self.drawButtons()
+        self.drawInvGrid("player", self.player.name, self.player.inv)
+        if self.mode == "storage":
+            self.drawInvGrid("storage", self.storage.name, self.storage.inv)
+        elif self.mode == "crafting":
+            self.drawCraftingList()
+        elif self.mode == "cooking":
+            self.drawCooking()
+
+        msg_rect = pygame.Rect(self.layout.msg)
+
+        def paintMsg():
+            pygame.draw.rect(self.screen, BG, msg_rect)
+            self.text(self.font, self.msg, ALERT, msg_rect.topleft)
+        self.paintIfChanged(("msg",), self.msg, msg_rect, paintMsg)
+
+        if self.show_overlay:
+            self.drawOverlay()
+
+        self.full_redraw = False
+        dirty_count = len(self._dirty)
+        if self._dirty:
+            pygame.display.update(self._dirty)
+            self._dirty = []
+        self.stats.end(dirty_count)
+
+    # <<----------- Input ----------->>
+    def setMode(self, mode : str) -> None:
+        if mode != self.mode:
+            self.mode = mode
+            self.hover = None
+            self.full_redraw = True
+
+    def resize(self, width : int, height : int) -> None:
+        self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+        self.layout.resize(width, height)
+        # panels moved under a still cursor
+        self.hover = self.hitTest(pygame.mouse.get_pos())
+        self.full_redraw = True
+
+    def handleClick(self, pos) -> None:
+        target = self.hitTest(pos)
+        if target is not None and target[0] == "menu":
+            self.setMode(self.button_modes[target[1]])
+
+    def run(self) -> None:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.VIDEORESIZE:
+                    self.resize(event.w, event.h)
+                if event.type == pygame.MOUSEMOTION:
+                    self.hover = self.hitTest(event.pos)
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        self.setMode("menu")
+                    elif event.key == pygame.K_F3:
+                        self.show_overlay = not self.show_overlay
+                        self.full_redraw = True
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    self.handleClick(event.pos)
+
+            dt = self.clock.tick(FPS) / 1000.0
+            self.cookingStation.advance(dt)
+            self.effects.update(dt)
+            if self.recipe_watcher.update(dt):
+                self.msg = "Recipes reloaded."
+                self.full_redraw = True
+            self.draw()
+
+if __name__ == "__main__":
+    Game().run()
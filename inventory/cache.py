@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+class LRUCache(Generic[V]):
+    """
+    Bounded least-recently-used cache with hit/miss/eviction counters.
+    get() refreshes an entry; put() evicts the oldest once max_entries is reached.
+    """
+    def __init__(self, max_entries : int = 512) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._data : "OrderedDict[Hashable, V]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key : Hashable) -> Optional[V]:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key : Hashable, value : V) -> V:
+        data = self._data
+        if key in data:
+            data.move_to_end(key)
+        elif len(data) >= self.max_entries:
+            data.popitem(last = False)
+            self.evictions += 1
+        data[key] = value
+
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def resize(self, max_entries : int) -> None:
+        """Change the limit, evicting the oldest entries if it shrank."""
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        while len(self._data) > max_entries:
+            self._data.popitem(last = False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key : Hashable) -> bool:
+        return key in self._data
+
+    @property
+    def hitRate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {"entries" : len(self._data), "max_entries" : self.max_entries, "hits" : self.hits,
+                "misses" : self.misses, "evictions" : self.evictions, "hit_rate" : self.hitRate}
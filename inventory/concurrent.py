@@ -0,0 +1,103 @@
+import threading
+from typing import Callable, Dict, Optional, TypeVar
+from .items import Items
+from .inventory import Inventory, Reservation
+from .snapshot import CopySlots, InventorySnapshot
+
+T = TypeVar("T")
+
+class LockedSnapshot(InventorySnapshot):
+    """
+    Snapshot of a ConcurrentInventory; commit() holds the inventory's lock.
+    Reads come from a point-in-time copy of the slot list (pointers only), so
+    the stack a write was computed from is exactly what commit validates.
+    """
+    def __init__(self, base : "ConcurrentInventory") -> None:
+        super().__init__(base)
+        self.slots = CopySlots(base.slots)
+
+    def commit(self) -> bool:
+        base : "ConcurrentInventory" = self.base
+        with base.lock:
+            ok = super().commit()
+        if not ok:
+            base.conflicts += 1
+
+        return ok
+
+class ConcurrentInventory(Inventory):
+    """
+    Inventory safe to share between threads, behind one lock.
+
+    Every operation runs under a single reentrant lock, so each one is
+    atomic and totals never drift. On a standard CPython build the
+    interpreter lock serializes the work anyway, and one uncontended lock
+    is the cheapest way to get that guarantee (see bench/contention.py).
+
+    Multi-step sequences work on snapshot() and commit once, which is what
+    Crafting.craft does: the scan runs without the lock, and a commit that
+    finds one of its slots replaced meanwhile is refused (counted in
+    'conflicts') so the caller reruns it. atomic() runs a sequence
+    entirely under the lock instead. Code outside the class that writes
+    slots directly (moveBetweenInventories, Equipment) takes 'lock' too.
+    """
+    def __init__(self, capacity : int, items : Items) -> None:
+        super().__init__(capacity, items)
+        self.lock = threading.RLock()
+        # refused snapshot commits, for contention stats
+        self.conflicts = 0
+
+    def snapshot(self) -> LockedSnapshot:
+        return LockedSnapshot(self)
+
+    def atomic(self, fn : Callable[[InventorySnapshot], T]) -> T:
+        """Run fn on a snapshot and commit it, all under the lock; returns fn's result."""
+        with self.lock:
+            snap = self.snapshot()
+            result = fn(snap)
+            if snap.slots.own or snap._spent:
+                snap.commit()
+            else:
+                snap.discard()
+
+        return result
+
+    def reserve(self, needs : Dict[str, int]) -> Optional[Reservation]:
+        with self.lock:
+            return super().reserve(needs)
+
+    def _settle(self, res : Reservation, needs : Dict[str, int]) -> None:
+        with self.lock:
+            super()._settle(res, needs)
+
+    def count(self, item_id : str) -> int:
+        with self.lock:
+            return super().count(item_id)
+
+    def add(self, item_id : str, qty : int) -> int:
+        with self.lock:
+            return super().add(item_id, qty)
+
+    def remove(self, item_id : str, qty : int) -> int:
+        with self.lock:
+            return super().remove(item_id, qty)
+
+    def move(self, src : int, dst : int) -> bool:
+        with self.lock:
+            return super().move(src, dst)
+
+    def split(self, src : int, dst : int, amount : int) -> bool:
+        with self.lock:
+            return super().split(src, dst, amount)
+
+    def splitHalf(self, src : int, dst : int) -> bool:
+        with self.lock:
+            return super().splitHalf(src, dst)
+
+    def sort(self) -> None:
+        with self.lock:
+            super().sort()
+
+    def setSlot(self, index : int, item_id : str, qty : int, *, current_durability : Optional[float] = None):
+        with self.lock:
+            super().setSlot(index, item_id, qty, current_durability = current_durability)
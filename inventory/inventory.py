@@ -1,19 +1,50 @@
+import contextlib
+import itertools
+import math
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from typing import ContextManager, Optional, Dict, List, Tuple, TYPE_CHECKING
 from .items import ItemDef, Items
 
+if TYPE_CHECKING:
+    from .snapshot import InventorySnapshot
+
 @dataclass
 class ItemStack:
     item_id : str
     qty : int
     iid : Optional[str] = None
 
+@dataclass
+class Reservation:
+    """
+    Quantities held on one Inventory for a pending job (see Inventory.reserve).
+    'left' is what is still held; it shrinks as the job spends it.
+    """
+    res_id : int
+    left : Dict[str, int]
+
+    @property
+    def active(self) -> bool:
+        return bool(self.left)
+
+_reservation_ids = itertools.count(1)
+
 class Inventory:
+    # spend() redoes its snapshot this many times if a shared commit conflicts
+    COMMIT_ATTEMPTS = 8
+
     def __init__(self, capacity : int, items : Items) -> None:
         self.capacity = capacity
         self.slots : List[Optional[ItemStack]] = [None] * capacity
         self.items = items
         self.item_defs = items.defs
+        # item_id -> qty held by reservations; bumped on every new hold
+        self.held : Dict[str, int] = {}
+        self.reservations : Dict[int, Reservation] = {}
+        self.reserve_gen = 0
+        # held around direct slot writes from outside (moveBetweenInventories,
+        # Equipment); a no-op here, a real lock on ConcurrentInventory
+        self.lock : ContextManager = contextlib.nullcontext()
 
     def add(self, item_id : str, qty : int) -> int:
         """
@@ -29,11 +60,13 @@ class Inventory:
 
         # Fill existing stacks first
         if max_stack > 1:
-            for slot in self.slots:
-                if slot and self._canStack(slot, ItemStack(item_id, 1, None)):
+            probe = ItemStack(item_id, 1, None)
+            for i, slot in enumerate(self.slots):
+                if slot and self._canStack(slot, probe):
                     space = max_stack - slot.qty
                     take = min(space, to_add)
-                    slot.qty += take
+                    if take > 0:
+                        self.slots[i] = ItemStack(item_id, slot.qty + take, slot.iid)
                     to_add -= take
                     if to_add == 0:
                         return qty
@@ -46,7 +79,7 @@ class Inventory:
                     iid = None
                 else:
                     place = 1
-                    iid = self.items.newInstance(item_id)
+                    iid = self._newInstance(item_id)
                 self.slots[i] = ItemStack(item_id, place, iid)
                 to_add -= place
                 if to_add == 0:
@@ -57,8 +90,15 @@ class Inventory:
     def remove(self, item_id : str, qty : int) -> int:
         """
         Try to remove up to 'qty' of 'item_id'.
+        Reserved quantities are left alone (see reserve/spend).
         Returns how many were actually removed.
         """
+        held = self.held.get(item_id) if self.held else None
+        if held:
+            qty = min(qty, self.count(item_id) - held)
+        return self._removeRaw(item_id, qty)
+
+    def _removeRaw(self, item_id : str, qty : int) -> int:
         if qty <= 0:
             return 0
         
@@ -69,13 +109,14 @@ class Inventory:
                 s = self.slots[i]
                 if s and s.item_id == item_id:
                     take = min(s.qty, to_remove)
-                    s.qty -= take
                     to_remove -= take
 
                     # Clear empty stacks
-                    if s.qty == 0:
-                        self.items.destroyInstance(s.iid)
+                    if s.qty == take:
+                        self._destroyInstance(s.iid)
                         self.slots[i] = None
+                    else:
+                        self.slots[i] = ItemStack(item_id, s.qty - take, s.iid)
 
                     if to_remove == 0:
                         break
@@ -119,11 +160,12 @@ class Inventory:
             space = max_stack - destination.qty
             if space > 0:
                 moved = min(space, source.qty)
-                destination.qty += moved
-                source.qty -= moved
-                if source.qty == 0:
-                    self.items.destroyInstance(source.iid)
+                self.slots[dst] = ItemStack(destination.item_id, destination.qty + moved, destination.iid)
+                if source.qty == moved:
+                    self._destroyInstance(source.iid)
                     self.slots[src] = None
+                else:
+                    self.slots[src] = ItemStack(source.item_id, source.qty - moved, source.iid)
                 return moved > 0
             # no space: swap them
             self.slots[src], self.slots[dst] = destination, source
@@ -162,10 +204,10 @@ class Inventory:
         
         # create new stack in destination
         self.slots[dst] = ItemStack(source.item_id, move_qty, source.iid)
-        source.qty -= move_qty
-        if source.qty == 0:
-            self.items.destroyInstance(s.iid)
+        if source.qty == move_qty:
             self.slots[src] = None
+        else:
+            self.slots[src] = ItemStack(source.item_id, source.qty - move_qty, source.iid)
 
         return True
     
@@ -257,6 +299,18 @@ class Inventory:
             self.slots[i] = None
             i += 1
 
+    # stacks are replaced, never edited in place, so a snapshot can share them
+    def _newInstance(self, item_id : str, *, current : Optional[float] = None) -> Optional[str]:
+        return self.items.newInstance(item_id, current = current)
+
+    def _destroyInstance(self, iid : Optional[str]) -> None:
+        self.items.destroyInstance(iid)
+
+    def snapshot(self) -> "InventorySnapshot":
+        """Copy-on-write view for what-if checks; see InventorySnapshot."""
+        from .snapshot import InventorySnapshot
+        return InventorySnapshot(self)
+
     def _maxStack(self, item_id : str) -> int:
         return self.item_defs[item_id].stack_size if item_id in self.item_defs else 1
     
@@ -282,7 +336,7 @@ class Inventory:
         return " | ".join(parts)
     
     def count(self, item_id : str) -> int:
-        """Return the total quantity of an item across all slots"""
+        """Return the total quantity of an item across all slots (reserved included)"""
         total = 0
         for s in self.slots:
             if s and s.item_id == item_id:
@@ -290,6 +344,84 @@ class Inventory:
         
         return total
     
+    def reserved(self, item_id : str) -> int:
+        return self.held.get(item_id, 0)
+    
+    def available(self, item_id : str) -> int:
+        """count() minus what reservations hold: what remove() or a new reserve() can take."""
+        return max(0, self.count(item_id) - self.held.get(item_id, 0))
+    
+    def canTakeOut(self, stack : ItemStack, back : Optional[ItemStack] = None) -> bool:
+        """
+        True if 'stack' can leave this inventory (with 'back' coming in, for
+        a swap) and still cover every reservation. For code that moves
+        stacks out by writing slots directly rather than through remove().
+        """
+        held = self.held.get(stack.item_id) if self.held else None
+        if not held:
+            return True
+        net = stack.qty - (back.qty if back is not None and back.item_id == stack.item_id else 0)
+        return self.count(stack.item_id) - net >= held
+    
+    # <<----------- Reservations ----------->>
+    def reserve(self, needs : Dict[str, int]) -> Optional[Reservation]:
+        """
+        Hold 'needs' ({item_id: qty}) for a pending job, all or nothing.
+        Held items stay in their slots (move/sort still work) but remove()
+        and later reserve() calls can't take them, so a plan checked now
+        can be spent later without rescanning or rolling back.
+        Returns None if any item is short.
+        """
+        needs = {k : q for k, q in needs.items() if q > 0}
+        if any(self.available(k) < q for k, q in needs.items()):
+            return None
+        for k, q in needs.items():
+            self._adjustHeld(k, q)
+        self.reserve_gen += 1
+        res = Reservation(next(_reservation_ids), dict(needs))
+        if res.left:
+            self.reservations[res.res_id] = res
+
+        return res
+    
+    def release(self, res : Reservation) -> None:
+        """Give back whatever 'res' still holds."""
+        self._settle(res, dict(res.left))
+    
+    def spend(self, res : Reservation, needs : Optional[Dict[str, int]] = None) -> bool:
+        """
+        Remove 'needs' (default: all it still holds) from the slots and the
+        reservation in one commit. False, with nothing changed, if the
+        reservation doesn't hold that much.
+        """
+        for _ in range(self.COMMIT_ATTEMPTS):
+            snap = self.snapshot()
+            if not snap.spend(res, needs):
+                snap.discard()
+                return False
+            if snap.commit():
+                return True
+        
+        return False
+    
+    def _settle(self, res : Reservation, needs : Dict[str, int]) -> None:
+        for k, q in needs.items():
+            self._adjustHeld(k, -q)
+            left = res.left.get(k, 0) - q
+            if left > 0:
+                res.left[k] = left
+            else:
+                res.left.pop(k, None)
+        if not res.left:
+            self.reservations.pop(res.res_id, None)
+    
+    def _adjustHeld(self, item_id : str, delta : int) -> None:
+        qty = self.held.get(item_id, 0) + delta
+        if qty > 0:
+            self.held[item_id] = qty
+        else:
+            self.held.pop(item_id, None)
+    
     def setSlot(self, index : int, item_id : str, qty : int, *, current_durability : Optional[float] = None):
         """Directly place an item in a slot (ignores stacking rules)."""
         if not (0 <= index < self.capacity):
@@ -298,7 +430,7 @@ class Inventory:
         if self._maxStack(item_id) <= 1 and (self.items.isWeapon(item_id) or self.items.isArmor(item_id)):
             if qty != 1:
                 raise ValueError("Non-stacable items should have qty=1 per slot")
-            iid = self.items.newInstance(item_id, current=current_durability)
+            iid = self._newInstance(item_id, current = current_durability)
         self.slots[index] = ItemStack(item_id, qty, iid)
 
     def describeSlot(self, index : int) -> str:
@@ -306,20 +438,30 @@ class Inventory:
         if not s:
             return f"{index:02d} : empty"
         
-        d = self.item_defs.get(s.item_id)
-        name = d.name if d else s.item_id
+        # everything but index and qty depends only on the item and its
+        # durability as displayed (whole points, rounded up so only a broken
+        # item shows 0), so it is formatted once per such pair and wear
+        # below a point reuses the cached text
+        cur = self.items.getDurability(s.iid)
+        key = (s.item_id, None if cur is None else math.ceil(cur - 1e-9))
+        cache = self.items.describe_cache
+        frag = cache.get(key)
+        if frag is None:
+            frag = cache.put(key, self._describeItem(*key))
+        name, stack_size, rest = frag
+
+        return f"{index:02d} : {name} (id={s.item_id}) | qty = {s.qty}/{stack_size} | {rest}"
+
+    def _describeItem(self, item_id : str, cur : Optional[int]) -> Tuple[str, int, str]:
+        """(name, stack size, text after qty) for describeSlot."""
+        d = self.item_defs.get(item_id)
+        name = d.name if d else item_id
         stack_size = d.stack_size if d else 1
         weight = d.weight if d else 0.0
         tags = list(d.tags) if d else []
 
-        # recognize types from tags
-        is_weapon = ("weapon" in tags)
-        is_armor = ("armor" in tags)
-
         # core attrs
         attrs = [
-            f"{index:02d} : {name} (id={s.item_id})",
-            f"qty = {s.qty}/{stack_size}",
             f"weight = {weight:.2f}",
             f"tags = [{', '.join(tags)}]" if tags else "tags = []",
         ]
@@ -333,14 +475,77 @@ class Inventory:
             attrs.append(f"effects = [{', '.join(d.status_effects)}]")
 
         # durability 
-        cur = self.items.getDurability(s.iid)
         max_dur = d.max_durability if d else None
-        ratio = self.items.durabilityRatio(s.iid)
+        ratio = cur / float(max_dur) if cur is not None and max_dur else None
 
         # only show durability if relevant (weapon/armor or any durability present)
-        cur_txt = f"{cur:.2f}" if cur is not None else "n/a"
-        max_txt = f"{max_dur:.2f}" if isinstance(max_dur, (int, float)) and max_dur is not None else "n/a"
+        cur_txt = f"{cur}" if cur is not None else "n/a"
+        max_txt = f"{max_dur:.0f}" if isinstance(max_dur, (int, float)) and max_dur is not None else "n/a"
         ratio_txt = f"{ratio:.1%}" if ratio is not None else "n/a"
         attrs.append(f"dur = {cur_txt}/{max_txt} ({ratio_txt})")
 
-        return " | ".join(attrs)
\ No newline at end of file
+        return name, stack_size, " | ".join(attrs)
+
+def moveBetweenInventories(items : Items, src_inv : Inventory, src_idx : int,
+                           dst_inv : Inventory, dst_idx : int) -> bool:
+    """
+    Move/merge/swap a stack between two inventories, keeping per-instance
+    state (iid) with the stack. Lives here rather than in game.py so the
+    headless server can use it without importing pygame.
+    Reserved quantities never leave their inventory: a merge moves only
+    what is free, and a move or swap that would take held items is refused.
+    """
+    if not (0 <= src_idx < src_inv.capacity and 0 <= dst_idx < dst_inv.capacity):
+        return False
+    # the reservation checks and the writes happen under both locks, taken
+    # in a fixed order so two opposite moves can't deadlock
+    first, second = sorted((src_inv, dst_inv), key = id)
+    with first.lock, second.lock:
+        return _moveLocked(src_inv, src_idx, dst_inv, dst_idx)
+
+def _moveLocked(src_inv : Inventory, src_idx : int, dst_inv : Inventory, dst_idx : int) -> bool:
+    src = src_inv.slots[src_idx]
+    dst = dst_inv.slots[dst_idx]
+
+    # Nothing to move
+    if src is None:
+        return False
+    
+    def swap() -> bool:
+        if src_inv is not dst_inv and not (src_inv.canTakeOut(src, dst)
+                                           and (dst is None or dst_inv.canTakeOut(dst, src))):
+            return False
+        src_inv.slots[src_idx], dst_inv.slots[dst_idx] = dst, src
+        return True
+    
+    def maxStack(inv, iid):
+        return inv._maxStack(iid)
+    
+    # if dest empty -> move stack
+    if dst is None:
+        return swap()
+    
+    # same item -> merge if stackable and no per instance iid
+    if src.item_id == dst.item_id:
+        m = maxStack(dst_inv, dst.item_id)
+        if getattr(src, "iid", None) is None and getattr(dst, "iid", None) is None:
+            space = m - dst.qty
+            if space <= 0:
+                # no space
+                return swap()
+            moved = min(space, src.qty)
+            if src_inv is not dst_inv and src_inv.held:
+                moved = min(moved, src_inv.available(src.item_id))
+                if moved <= 0:
+                    return False
+            dst_inv.slots[dst_idx] = ItemStack(dst.item_id, dst.qty + moved, dst.iid)
+            if src.qty == moved:
+                src_inv.slots[src_idx] = None
+            else:
+                src_inv.slots[src_idx] = ItemStack(src.item_id, src.qty - moved, src.iid)
+            return moved > 0
+        else:
+            return swap()
+        
+    # Different items -> swap stacks
+    return swap()
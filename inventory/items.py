@@ -1,8 +1,12 @@
 from dataclasses import dataclass
-from typing import Dict, Optional
-from pathlib import Path
-from uuid import uuid4
-import json5
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from .cache import LRUCache
+
+# json5, pathlib and uuid are imported where they are used so a headless
+# server pays for them only when it actually parses a catalog or mints an iid
+if TYPE_CHECKING:
+    from pathlib import Path
+    from .shared import SharedCatalog
 
 @dataclass(frozen=True)
 class ItemDef:
@@ -17,8 +21,10 @@ class ItemDef:
     status_effects : tuple[str, ...] = ()
     hunger_fill : Optional[float] = None
     health_fill : Optional[float] = None
+    effect_duration : Optional[float] = None
 
-def loadItemDefs(path: Path) -> Dict[str, ItemDef]:
+def loadItemDefs(path: "Path") -> Dict[str, ItemDef]:
+    import json5
     data = json5.loads(path.read_text(encoding = "utf-8"))
     defs : Dict[str, ItemDef] = {}
     for row in data:
@@ -31,21 +37,42 @@ def loadItemDefs(path: Path) -> Dict[str, ItemDef]:
             base_damage = (int(row["base_damage"]) if "base_damage" in row else None),
             max_durability = (int(row["max_durability"]) if "max_durability" in row else None),
             base_protection = (float(row["base_protection"]) if "base_protection" in row else None),
-            status_effects = tuple(row.get("staus_effects", [])),
+            # older catalogs spell the key "staus_effects"
+            status_effects = tuple(row.get("status_effects", row.get("staus_effects", []))),
             hunger_fill = (float(row["hunger_fill"]) if "hunger_fill" in row else None),
-            health_fill = (float(row["health_fill"]) if "health_fill" in row else None)
+            health_fill = (float(row["health_fill"]) if "health_fill" in row else None),
+            effect_duration = (float(row["effect_duration"]) if "effect_duration" in row else None)
         )
     return defs
 
+def _newIid() -> str:
+    from uuid import uuid4
+    return str(uuid4())
+
 class Items:
     def __init__(self, defs : Dict[str, ItemDef]) -> None:
         self.defs = defs
         self._instances: Dict[str, tuple[str, float]] = {}
+        # describeSlot text per (item_id, whole durability points shown, rounded up), shared by every inventory
+        self.describe_cache : LRUCache[Tuple[str, int, str]] = LRUCache(512)
+        # iid -> fn(iid, old, new) called when that instance's durability changes
+        self._watchers : Dict[str, List[Callable[[str, float, float], None]]] = {}
         
     @classmethod
-    def load(cls, path : Path) -> "Items":
+    def load(cls, path : "Path") -> "Items":
         return cls(loadItemDefs(path))
 
+    @classmethod
+    def fromShared(cls, name : str) -> "Items":
+        """Items over a catalog another process published with publish(); defs are read-only."""
+        from .shared import attachDefs
+        return cls(attachDefs(name))
+
+    def publish(self, name : Optional[str] = None) -> "SharedCatalog":
+        """Copy the catalog into a shared memory block workers can attach to by name."""
+        from .shared import SharedCatalog
+        return SharedCatalog.publish(dict(self.defs), name)
+
     def isWeapon(self, item_id : str) -> bool:
         """
         True if the item has the 'weapon' tag.
@@ -76,17 +103,19 @@ class Items:
             return None
         return float(d.max_durability) if d.max_durability is not None else 100.0
     
+    def needsInstance(self, item_id : str) -> bool:
+        """True if newInstance would mint an iid (non-stackable weapon/armor)."""
+        d = self.defs.get(item_id)
+        return bool(d and d.stack_size <= 1 and (("weapon" in d.tags) or ("armor" in d.tags)))
+
     def newInstance(self, item_id : str, *, current : Optional[float] = None) -> Optional[str]:
         """
         Create and register a per-instance durability record.
         Returns an iid or None for stackable/non-weapon items.
         """
-        d = self.defs.get(item_id)
-        if not d:
-            return None
-        if d.stack_size <= 1 and (("weapon" in d.tags) or ("armor" in d.tags)):
+        if self.needsInstance(item_id):
             cur = float(current) if current is not None else float(self.initialDurability(item_id) or 0.0)
-            iid = str(uuid4())
+            iid = _newIid()
             self._instances[iid] = (item_id, cur)
             return iid
         
@@ -131,11 +160,64 @@ class Items:
             return None
         
         item_id, cur = rec
-        dec = max(0.0, float(rate))
-        new_val = max(0.0, float(cur) - dec)
+        new_val = max(0.0, float(cur) - self._wearPoints(item_id, rate))
         self._instances[iid] = (item_id, new_val)
+        if iid in self._watchers:
+            self._notify(iid, cur, new_val)
 
         return new_val
+
+    def _wearPoints(self, item_id : str, rate : float) -> float:
+        if rate <= 0:
+            return 0.0
+        d = self.defs.get(item_id)
+        max_dur = d.max_durability if d and d.max_durability else 0.0
+
+        return max(1.0, float(rate) * max_dur)
+
+    def wearMany(self, iids : Sequence[Optional[str]], rates : Sequence[float]) -> List[str]:
+        """
+        Batch loseDurability for combat: hit i wears iids[i] by rates[i] (same
+        fraction-of-max, 1-point-minimum rule, applied per hit) in one loop
+        with no per-call overhead. Watchers are notified once per instance
+        per batch, after every hit has landed. Unknown iids are skipped.
+        Returns the iids that broke (reached 0) in this batch.
+        """
+        instances = self._instances
+        defs = self.defs
+        watchers = self._watchers
+        # item_id -> max durability, looked up once per batch
+        maxes : Dict[str, float] = {}
+        # watched iid -> durability before the batch, notified once at the end
+        before : Dict[str, float] = {}
+        broken : List[str] = []
+        # one pass, writing each hit straight back: no per-iid sums to build
+        # and walk again, which cost as much as the call overhead saved
+        for iid, rate in zip(iids, rates):
+            if rate <= 0:
+                continue
+            rec = instances.get(iid)
+            if rec is None:
+                continue
+            item_id, cur = rec
+            m = maxes.get(item_id)
+            if m is None:
+                d = defs.get(item_id)
+                m = maxes[item_id] = float(d.max_durability) if d and d.max_durability else 0.0
+            dec = rate * m
+            if dec < 1.0:
+                dec = 1.0
+            if cur > dec:
+                instances[iid] = (item_id, cur - dec)
+            elif cur > 0.0:
+                instances[iid] = (item_id, 0.0)
+                broken.append(iid)
+            if iid in watchers and iid not in before:
+                before[iid] = cur
+        for iid, old in before.items():
+            self._notify(iid, old, instances[iid][1])
+
+        return broken
     
     def setDurability(self, iid : Optional[str], value : float) -> None:
         if iid is None:
@@ -143,8 +225,25 @@ class Items:
         rec = self._instances.get(iid)
         if rec is None:
             return None
-        item_id, _ = rec
+        item_id, cur = rec
         new_val = max(0.0, float(value))
         self._instances[iid] = (item_id, new_val)
+        if iid in self._watchers:
+            self._notify(iid, cur, new_val)
         
-        return new_val
\ No newline at end of file
+        return new_val
+
+    def watchDurability(self, iid : str, fn : Callable[[str, float, float], None]) -> None:
+        """Call fn(iid, old, new) whenever iid's durability changes (e.g. equipped gear)."""
+        self._watchers.setdefault(iid, []).append(fn)
+
+    def unwatchDurability(self, iid : str, fn : Callable[[str, float, float], None]) -> None:
+        fns = self._watchers.get(iid)
+        if fns and fn in fns:
+            fns.remove(fn)
+            if not fns:
+                del self._watchers[iid]
+
+    def _notify(self, iid : str, old : float, new : float) -> None:
+        for fn in list(self._watchers.get(iid, ())):
+            fn(iid, old, new)
\ No newline at end of file
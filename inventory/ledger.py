@@ -0,0 +1,147 @@
+import threading
+from typing import Dict, Hashable, List, Optional, Protocol, Tuple, TYPE_CHECKING
+from .inventory import ItemStack
+
+if TYPE_CHECKING:
+    from .inventory import Inventory
+
+def _addTo(book : Dict[str, int], key : str, delta : int) -> None:
+    qty = book.get(key, 0) + delta
+    if qty:
+        book[key] = qty
+    else:
+        book.pop(key, None)
+
+def _addNested(books : Dict[str, Dict[str, int]], outer : str, inner : str, delta : int) -> None:
+    book = books.setdefault(outer, {})
+    _addTo(book, inner, delta)
+    if not book:
+        del books[outer]
+
+class LedgerSlots(list):
+    """
+    Slot list of a tapped Inventory. Every Inventory mutation ends in a
+    slot assignment (stacks are replaced, never edited), so reporting the
+    old and new stack here to each tap (a WorldLedger, a StorageNetwork)
+    keeps them exact with no other hooks.
+    """
+    __slots__ = ("taps",)
+
+    def __setitem__(self, i : int, stack : Optional[ItemStack]) -> None:
+        old = list.__getitem__(self, i)
+        list.__setitem__(self, i, stack)
+        if old is not stack:
+            for sink, owner in self.taps:
+                sink._slotChanged(owner, old, stack)
+
+class SlotSink(Protocol):
+    def _slotChanged(self, owner : Hashable, old : Optional[ItemStack], new : Optional[ItemStack]) -> None: ...
+
+def tapSlots(inv : "Inventory", sink : SlotSink, owner : Hashable) -> None:
+    """Report every slot change of inv to sink._slotChanged(owner, old, new)."""
+    if not isinstance(inv.slots, LedgerSlots):
+        slots = LedgerSlots(inv.slots)
+        slots.taps = []
+        inv.slots = slots
+    inv.slots.taps.append((sink, owner))
+
+def untapSlots(inv : "Inventory", sink : SlotSink) -> None:
+    slots = inv.slots
+    if not isinstance(slots, LedgerSlots):
+        return
+    slots.taps = [t for t in slots.taps if t[0] is not sink]
+    if not slots.taps:
+        inv.slots = list(slots)
+
+class WorldLedger:
+    """
+    Running per-item totals across every registered Inventory, with a
+    per-owner breakdown, updated incrementally as slots change.
+
+        ledger = WorldLedger()
+        ledger.register(player.inv, player.name)
+        ledger.register(chest.inv, "chest@12,4")
+        ledger.total("iron_ingot")           # O(1)
+        ledger.holders("iron_ingot")         # {owner: qty}
+
+    Unregistered inventories pay nothing. audit() recounts everything from
+    the slots and reports any drift, for anti-dupe checks.
+    """
+    def __init__(self) -> None:
+        self.totals : Dict[str, int] = {}
+        # item_id -> {owner: qty}; owner -> {item_id: qty}
+        self._holders : Dict[str, Dict[str, int]] = {}
+        self._owned : Dict[str, Dict[str, int]] = {}
+        # id(inv) -> (inv, owner)
+        self._invs : Dict[int, Tuple["Inventory", str]] = {}
+        # concurrent inventories write their slots under their own locks
+        self._lock = threading.Lock()
+
+    def register(self, inv : "Inventory", owner : str) -> None:
+        """
+        Start tracking inv under 'owner' (several inventories may share one).
+        Anything with a 'slots' list of stacks works, e.g. player Equipment.
+        """
+        if id(inv) in self._invs:
+            raise ValueError(f"inventory already registered to '{self._invs[id(inv)][1]}'")
+        tapSlots(inv, self, owner)
+        self._invs[id(inv)] = (inv, owner)
+        for s in inv.slots:
+            if s is not None:
+                self._slotChanged(owner, None, s)
+
+    def unregister(self, inv : "Inventory") -> None:
+        entry = self._invs.pop(id(inv), None)
+        if entry is None:
+            return
+        for s in inv.slots:
+            if s is not None:
+                self._slotChanged(entry[1], s, None)
+        untapSlots(inv, self)
+
+    def _slotChanged(self, owner : str, old : Optional[ItemStack], new : Optional[ItemStack]) -> None:
+        with self._lock:
+            if old is not None:
+                self._bump(owner, old.item_id, -old.qty)
+            if new is not None:
+                self._bump(owner, new.item_id, new.qty)
+
+    def _bump(self, owner : str, item_id : str, delta : int) -> None:
+        _addTo(self.totals, item_id, delta)
+        _addNested(self._holders, item_id, owner, delta)
+        _addNested(self._owned, owner, item_id, delta)
+
+    # <<----------- Queries ----------->>
+    def total(self, item_id : str) -> int:
+        return self.totals.get(item_id, 0)
+
+    def holders(self, item_id : str) -> Dict[str, int]:
+        return dict(self._holders.get(item_id, {}))
+
+    def ownerTotal(self, owner : str, item_id : str) -> int:
+        return self._owned.get(owner, {}).get(item_id, 0)
+
+    def owned(self, owner : str) -> Dict[str, int]:
+        return dict(self._owned.get(owner, {}))
+
+    def owners(self) -> List[str]:
+        return list(self._owned)
+
+    def audit(self) -> List[str]:
+        """Recount every registered inventory; returns a line per mismatch (empty if exact)."""
+        recount : Dict[str, Dict[str, int]] = {}
+        for inv, owner in self._invs.values():
+            book = recount.setdefault(owner, {})
+            for s in inv.slots:
+                if s is not None:
+                    book[s.item_id] = book.get(s.item_id, 0) + s.qty
+        problems : List[str] = []
+        with self._lock:
+            for owner in set(recount) | set(self._owned):
+                have, want = self._owned.get(owner, {}), recount.get(owner, {})
+                for item_id in set(have) | set(want):
+                    if have.get(item_id, 0) != want.get(item_id, 0):
+                        problems.append(f"{owner}: {item_id} ledger {have.get(item_id, 0)}, "
+                                        f"slots {want.get(item_id, 0)}")
+
+        return problems
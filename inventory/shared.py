@@ -0,0 +1,192 @@
+import struct
+import sys
+from bisect import bisect_left
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Optional
+from .items import ItemDef
+
+# block layout: header, fixed-size records sorted by id, then a utf-8 string heap.
+# string fields are (offset into heap, byte length); tags/effects are joined by SEP
+MAGIC = b"ITEMCAT2"
+HEADER = struct.Struct("<8sIII")    # magic, count, records offset, heap offset
+RECORD = struct.Struct("<8I i q 6d I")
+SEP = "\x1f"
+
+# which optional fields are present in a record
+HAS_DAMAGE, HAS_DURABILITY, HAS_PROTECTION, HAS_HUNGER, HAS_HEALTH, HAS_EFFECT_DURATION = (1, 2, 4, 8, 16, 32)
+
+def _encodeCatalog(defs : Dict[str, ItemDef]) -> bytes:
+    heap = bytearray()
+    def put(text : str) -> tuple:
+        raw = text.encode("utf-8")
+        off = len(heap)
+        heap.extend(raw)
+        return off, len(raw)
+
+    records = bytearray()
+    for item_id in sorted(defs, key = lambda k : k.encode("utf-8")):
+        d = defs[item_id]
+        flags = ((HAS_DAMAGE if d.base_damage is not None else 0)
+                 | (HAS_DURABILITY if d.max_durability is not None else 0)
+                 | (HAS_PROTECTION if d.base_protection is not None else 0)
+                 | (HAS_HUNGER if d.hunger_fill is not None else 0)
+                 | (HAS_HEALTH if d.health_fill is not None else 0)
+                 | (HAS_EFFECT_DURATION if d.effect_duration is not None else 0))
+        records += RECORD.pack(*put(d.id), *put(d.name), *put(SEP.join(d.tags)), *put(SEP.join(d.status_effects)),
+                               d.stack_size, d.base_damage or 0, d.weight, float(d.max_durability or 0.0),
+                               float(d.base_protection or 0.0), float(d.hunger_fill or 0.0),
+                               float(d.health_fill or 0.0), float(d.effect_duration or 0.0), flags)
+    rec_off = HEADER.size
+    heap_off = rec_off + len(records)
+
+    return HEADER.pack(MAGIC, len(defs), rec_off, heap_off) + bytes(records) + bytes(heap)
+
+class SharedDefs(Mapping):
+    """
+    Read-only Dict[str, ItemDef] view over a published catalog block.
+
+    Nothing is decoded up front: lookups binary-search the id-sorted records
+    in place and build the ItemDef on first use (then keep it, so the frozen
+    dataclasses a worker actually touches are built once). Attaching is
+    therefore O(1) in catalog size.
+    """
+    def __init__(self, shm : shared_memory.SharedMemory) -> None:
+        self._shm = shm
+        self._buf = shm.buf
+        magic, self._count, self._rec_off, self._heap_off = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"shared block '{shm.name}' is not an item catalog")
+        self._cache : Dict[str, ItemDef] = {}
+
+    def _field(self, rec : tuple, k : int) -> bytes:
+        off, ln = rec[2 * k], rec[2 * k + 1]
+        start = self._heap_off + off
+        return bytes(self._buf[start:start + ln])
+
+    def _record(self, row : int) -> tuple:
+        return RECORD.unpack_from(self._buf, self._rec_off + row * RECORD.size)
+
+    def _idAt(self, row : int) -> bytes:
+        off, ln = struct.unpack_from("<2I", self._buf, self._rec_off + row * RECORD.size)
+        start = self._heap_off + off
+        return bytes(self._buf[start:start + ln])
+
+    def _find(self, item_id : str) -> int:
+        key = item_id.encode("utf-8")
+        rows = _RowIds(self)
+        row = bisect_left(rows, key)
+        return row if row < self._count and rows[row] == key else -1
+
+    def __contains__(self, item_id : object) -> bool:
+        if not isinstance(item_id, str):
+            return False
+        return item_id in self._cache or self._find(item_id) >= 0
+
+    def __getitem__(self, item_id : str) -> ItemDef:
+        d = self._cache.get(item_id)
+        if d is not None:
+            return d
+        row = self._find(item_id) if isinstance(item_id, str) else -1
+        if row < 0:
+            raise KeyError(item_id)
+        d = self._cache[item_id] = self._decode(self._record(row))
+        return d
+
+    def _decode(self, rec : tuple) -> ItemDef:
+        text = [self._field(rec, k).decode("utf-8") for k in range(4)]
+        stack_size, damage, weight, durability, protection, hunger, health, effect_duration, flags = rec[8:]
+        return ItemDef(
+            id = text[0],
+            name = text[1],
+            stack_size = stack_size,
+            weight = weight,
+            tags = tuple(text[2].split(SEP)) if text[2] else (),
+            base_damage = damage if flags & HAS_DAMAGE else None,
+            max_durability = int(durability) if flags & HAS_DURABILITY else None,
+            base_protection = protection if flags & HAS_PROTECTION else None,
+            status_effects = tuple(text[3].split(SEP)) if text[3] else (),
+            hunger_fill = hunger if flags & HAS_HUNGER else None,
+            health_fill = health if flags & HAS_HEALTH else None,
+            effect_duration = effect_duration if flags & HAS_EFFECT_DURATION else None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(self._count):
+            yield self._idAt(row).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Detach; ItemDefs already built stay valid."""
+        self._buf = None
+        self._shm.close()
+
+class _RowIds:
+    """Sequence of record ids as bytes, so bisect can search the block in place."""
+    def __init__(self, defs : SharedDefs) -> None:
+        self.defs = defs
+
+    def __len__(self) -> int:
+        return self.defs._count
+
+    def __getitem__(self, row : int) -> bytes:
+        return self.defs._idAt(row)
+
+class SharedCatalog:
+    """
+    Owner of a published catalog block. Keep it alive for as long as workers
+    use the catalog, then close() and unlink() it (or use it as a context manager).
+
+        with SharedCatalog.publish(items.defs) as cat:
+            pool = Pool(64, initializer = initWorker, initargs = (cat.name,))
+        # in each worker: items = Items.fromShared(name)
+    """
+    def __init__(self, shm : shared_memory.SharedMemory) -> None:
+        self.shm = shm
+
+    @classmethod
+    def publish(cls, defs : Dict[str, ItemDef], name : Optional[str] = None) -> "SharedCatalog":
+        data = _encodeCatalog(defs)
+        shm = shared_memory.SharedMemory(name = name, create = True, size = max(1, len(data)))
+        shm.buf[:len(data)] = data
+        return cls(shm)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def size(self) -> int:
+        return self.shm.size
+
+    def close(self) -> None:
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedCatalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        self.unlink()
+
+def attachDefs(name : str) -> SharedDefs:
+    """Attach to a published catalog by block name; the publisher owns its lifetime."""
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name = name, track = False)
+    else:
+        # before 3.13 attaching also registers the block with this process's
+        # resource tracker, which would unlink it when the worker exits
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda n, rtype : None if rtype == "shared_memory" else register(n, rtype)
+        try:
+            shm = shared_memory.SharedMemory(name = name)
+        finally:
+            resource_tracker.register = register
+
+    return SharedDefs(shm)
@@ -0,0 +1,178 @@
+import itertools
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from .inventory import Inventory, ItemStack, Reservation
+
+_MISSING = object()
+_pending_ids = itertools.count(1)
+
+class CowSlots:
+    """
+    Slot list that reads through to a base list and keeps its own writes.
+    Only written indices are stored, so taking and dropping one is
+    O(touched slots) no matter the capacity. 'seen' keeps the base stack each
+    written index held at its first write, to spot the base changing under us.
+    """
+    __slots__ = ("base", "own", "seen")
+
+    def __init__(self, base : Sequence[Optional[ItemStack]]) -> None:
+        self.base = base
+        self.own : Dict[int, Optional[ItemStack]] = {}
+        self.seen : Dict[int, Optional[ItemStack]] = {}
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __getitem__(self, i : int) -> Optional[ItemStack]:
+        if i < 0:
+            i += len(self.base)
+        s = self.own.get(i, _MISSING)
+        return self.base[i] if s is _MISSING else s
+
+    def __setitem__(self, i : int, stack : Optional[ItemStack]) -> None:
+        if i < 0:
+            i += len(self.base)
+        if not 0 <= i < len(self.base):
+            raise IndexError("slot index out of range")
+        if i not in self.seen:
+            self.seen[i] = self.base[i]
+        self.own[i] = stack
+
+    def __iter__(self) -> Iterator[Optional[ItemStack]]:
+        own = self.own
+        for i, s in enumerate(self.base):
+            yield own.get(i, s)
+
+class CopySlots(list):
+    """
+    Point-in-time copy of a slot list that records writes like CowSlots
+    ('own' and 'seen'). Costs one pointer copy up front, but reads run at
+    plain list speed and never see later changes to the base.
+    """
+    def __init__(self, base : Sequence[Optional[ItemStack]]) -> None:
+        super().__init__(base)
+        self.own : Dict[int, Optional[ItemStack]] = {}
+        self.seen : Dict[int, Optional[ItemStack]] = {}
+
+    def __setitem__(self, i : int, stack : Optional[ItemStack]) -> None:
+        if i < 0:
+            i += len(self)
+        if i not in self.seen:
+            self.seen[i] = list.__getitem__(self, i)
+        list.__setitem__(self, i, stack)
+        self.own[i] = stack
+
+class InventorySnapshot(Inventory):
+    """
+    Copy-on-write view of an Inventory for exact what-if checks.
+
+    Every Inventory operation works on a snapshot and places items exactly as
+    it would on the real thing, but the base is untouched until commit().
+    Stacks are shared with the base until written (Inventory replaces stacks
+    rather than editing them), and instance records are not minted or
+    destroyed in the Items registry until commit, so discarding costs nothing.
+    New weapon/armor instances carry a placeholder iid until then.
+
+        snap = inv.snapshot()
+        if snap.add("iron_sword", 2) == 2:
+            snap.commit()
+    """
+    def __init__(self, base : Inventory) -> None:
+        self.base = base
+        self.capacity = base.capacity
+        self.items = base.items
+        self.item_defs = base.item_defs
+        self.slots = CowSlots(base.slots)
+        self._created : Dict[str, Tuple[str, Optional[float]]] = {}
+        self._destroyed : List[str] = []
+        # the base's holds until spend() first adjusts them (then a private
+        # copy); spends are settled on the base at commit
+        self.held = base.held
+        self.reservations = base.reservations
+        self._gen = base.reserve_gen
+        self._spent : List[Tuple[Reservation, Dict[str, int]]] = []
+        self.closed = False
+
+    def _newInstance(self, item_id : str, *, current : Optional[float] = None) -> Optional[str]:
+        if not self.items.needsInstance(item_id):
+            return None
+        iid = f"pending:{next(_pending_ids)}"
+        self._created[iid] = (item_id, current)
+        return iid
+
+    def _destroyInstance(self, iid : Optional[str]) -> None:
+        if iid is None:
+            return
+        if self._created.pop(iid, None) is None:
+            self._destroyed.append(iid)
+
+    def reserve(self, needs : Dict[str, int]) -> Optional[Reservation]:
+        raise RuntimeError("reserve on the inventory itself, not a snapshot")
+
+    def spend(self, res : Reservation, needs : Optional[Dict[str, int]] = None) -> bool:
+        needs = dict(res.left) if needs is None else {k : q for k, q in needs.items() if q > 0}
+        if any(res.left.get(k, 0) < q for k, q in needs.items()):
+            return False
+        if self.held is self.base.held:
+            self.held = dict(self.held)
+        for k, q in needs.items():
+            if self._removeRaw(k, q) < q:
+                return False
+            self._adjustHeld(k, -q)
+        self._spent.append((res, needs))
+
+        return True
+
+    def touched(self) -> List[int]:
+        """Indices this snapshot has written, in order."""
+        return sorted(self.slots.own)
+
+    def conflicts(self) -> List[int]:
+        """Touched indices whose base slot has been replaced since the snapshot read it."""
+        base = self.base.slots
+        return [i for i, s in self.slots.seen.items() if base[i] is not s]
+
+    def heldChanged(self) -> bool:
+        """
+        True if a reservation was made on the base since this snapshot was
+        taken: its removals may now eat into held items, so commit refuses.
+        """
+        return self._gen != self.base.reserve_gen
+
+    def commit(self) -> bool:
+        """
+        Write touched slots back to the base and settle instance records.
+        Returns False (and applies nothing) if a touched base slot changed
+        meanwhile. Either way the snapshot is closed.
+        """
+        if self.closed:
+            raise RuntimeError("snapshot already committed or discarded")
+        self.closed = True
+        if self.conflicts() or self.heldChanged():
+            return False
+        real : Dict[str, Optional[str]] = {iid : self.base._newInstance(item_id, current = cur)
+                                           for iid, (item_id, cur) in self._created.items()}
+        for i, s in self.slots.own.items():
+            if s is not None and s.iid in real:
+                s = ItemStack(s.item_id, s.qty, real[s.iid])
+            self.base.slots[i] = s
+        for iid in self._destroyed:
+            self.base._destroyInstance(iid)
+        for res, needs in self._spent:
+            self.base._settle(res, needs)
+
+        return True
+
+    def discard(self) -> None:
+        self.closed = True
+        self.slots.own.clear()
+        self.slots.seen.clear()
+        self._created.clear()
+        self._destroyed.clear()
+        self._spent.clear()
+
+    def __enter__(self) -> "InventorySnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self.closed:
+            self.discard()
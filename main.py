@@ -1,3 +1,4 @@
+import sys
 from pathlib import Path
 from inventory.items import Items
 from inventory.inventory import Inventory
@@ -13,10 +14,12 @@ MODES = {
     "inventory" : 0,
     "cooking" : 1
 }
-# Choose what section to run
+# Default section to run; override from the command line:
+#   python main.py inventory 3
+#   python main.py cooking
 state = MODES["cooking"]
 
-def runInventory():
+def runInventory(test : int = 6):
     root = Path(__file__).parent
     items_path = root / "inventory" / "items.json"
     items = Items.load(items_path)
@@ -26,7 +29,6 @@ def runInventory():
     chest = Storage(items = items, capacity = 8, name = "Chest")
     crafting = Crafting(items, recipes = getCraftingRecipes())
 
-    test = 6
     match test:
         case 0:
             print("\n=== Seed exact test state with setSlot ===")
@@ -147,7 +149,7 @@ def runInventory():
             print(inv.describeSlot(0))
             print(inv.describeSlot(1))
             # wear down slot 0 a bit
-            items.loseDurability(inv.slots[0].iid, 0.5)
+            items.loseDurability(inv.slots[0].iid, 0.01)
             print("after small wear:")
             print(inv.describeSlot(0))
         case 4:
@@ -214,7 +216,7 @@ def runInventory():
             print(f"slot2 sword dur(after): {dur2_after}")
 
             # wear down armor in slot 5 by a small amount
-            items.loseDurability(chest.inv.slots[5].iid, 0.5)
+            items.loseDurability(chest.inv.slots[5].iid, 0.01)
             print("\nafter slight armor wear on slot 5:")
             if hasattr(chest.inv, "describeSlot"):
                 print(chest.inv.describeSlot(5))
@@ -271,6 +273,52 @@ def runInventory():
             if ok:
                 print("craft iron_pickaxe ->", crafting.craft(inv, "iron_pickaxe", 5))
                 print("After iron:", inv)
+        case 7:
+            # reserved materials must not leave the inventory behind a queued craft
+            from crafting.queue import CraftScheduler
+            from inventory.inventory import moveBetweenInventories
+
+            def expect(name, cond):
+                print(f"[{'PASS' if cond else 'FAIL'}] {name}")
+
+            crafts = CraftScheduler(crafting)
+            q = crafts.queueFor(player.name, player.inv)
+            failed = []
+            crafts.fail_listeners.append(lambda queue, job : failed.append(job.output_id))
+
+            player.addInv("wood", 3)
+            ok, msg = q.enqueue("wooden_pickaxe")
+            print("enqueue wooden_pickaxe ->", ok, "|", msg, "| held:", player.inv.held)
+            moved = moveBetweenInventories(items, player.inv, 0, chest.inv, 0)
+            print("move held wood to chest ->", moved)
+            expect("held wood cannot be moved out", not moved and player.count("wood") == 3)
+            player.addInv("wood", 2)
+            moved = moveBetweenInventories(items, player.inv, 0, chest.inv, 0)
+            print("move wood stack with 2 free ->", moved, "| chest wood:", chest.count("wood"))
+            expect("a move that would take held wood is refused", not moved and chest.count("wood") == 0)
+
+            # bypass the reservation entirely: the queue must notice, not retry forever
+            player.inv.slots[0] = None
+            crafts.advance(q.due)
+            print("after advance | held:", player.inv.held, "| failed:", failed, "| queued:", len(q))
+            expect("job with vanished inputs is dropped", failed == ["wooden_pickaxe"] and len(q) == 0)
+            expect("its hold is released", player.inv.held == {})
+            player.addInv("wood", 2)
+            expect("new wood can be removed again", player.removeInv("wood", 2) == 2)
+
+            # sorting a network must leave each chest's held items in that chest
+            from storage.network import StorageNetwork
+
+            a, b = Storage(items, 4, "a"), Storage(items, 4, "b")
+            a.addInv("stone", 3)
+            b.addInv("wood", 5)
+            net = StorageNetwork(items, [a, b])
+            res = b.inv.reserve({"wood" : 5})
+            net.sort()
+            print("after net.sort |", a.inv, "|", b.inv, "| b held:", b.inv.held)
+            expect("reserved wood stays in its chest", b.count("wood") == 5 and a.count("wood") == 0)
+            expect("the hold can still be spent", b.inv.spend(res))
+
 
 def runCooking():
     root = Path(__file__).parent
@@ -403,7 +451,9 @@ def runCooking():
     print("\nAll tests above executed.\n")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        state = MODES[sys.argv[1]]
     if state == MODES["inventory"]:
-        runInventory()
+        runInventory(int(sys.argv[2]) if len(sys.argv) > 2 else 6)
     if state == MODES["cooking"]:
         runCooking()
\ No newline at end of file
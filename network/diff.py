@@ -0,0 +1,168 @@
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from inventory.items import Items
+
+if TYPE_CHECKING:
+    from inventory.inventory import Inventory
+
+# wire format (little-endian):
+#   header   kind u8 | seq u32 | count u16
+#   FULL     header | fingerprint u32 | count x (ordinal u16, qty u16, dur u16)       slots 0..count-1
+#   DIFF     header | count x (slot u16, ordinal u16, qty u16, dur u16)               changed slots only
+# ordinal 0 is an empty slot; dur is the durability ratio scaled to 0..DUR_MAX,
+# or DUR_NONE for items without durability
+FULL, DIFF = 1, 2
+HEADER = struct.Struct("<BIH")
+FINGERPRINT = struct.Struct("<I")
+DUR_MAX = 0xFFFE
+DUR_NONE = 0xFFFF
+MAX_U16 = 0xFFFF
+
+SlotState = Tuple[int, int, int]    # (ordinal, qty, quantized durability)
+EMPTY : SlotState = (0, 0, DUR_NONE)
+
+def quantizeDurability(ratio : Optional[float]) -> int:
+    if ratio is None:
+        return DUR_NONE
+    return int(round(min(1.0, max(0.0, ratio)) * DUR_MAX))
+
+def dequantizeDurability(q : int) -> Optional[float]:
+    return None if q == DUR_NONE else q / DUR_MAX
+
+class Codebook:
+    """
+    item_id <-> u16 ordinal shared by both ends: catalog ids in sorted order,
+    starting at 1. The fingerprint (crc32 of the id list) travels in every
+    FULL message so a client built from a different catalog notices.
+    """
+    def __init__(self, items : Items) -> None:
+        self.ids : List[Optional[str]] = [None] + sorted(items.defs)
+        if len(self.ids) > MAX_U16:
+            raise ValueError("catalog too large for 16-bit item ordinals")
+        self.ordinals : Dict[str, int] = {iid : n for n, iid in enumerate(self.ids) if iid is not None}
+        self.fingerprint = zlib.crc32("\n".join(self.ids[1:]).encode("utf-8"))
+
+@dataclass
+class Message:
+    kind : int
+    seq : int
+    # FULL: one state per slot; DIFF: (slot, state) pairs
+    slots : List[SlotState] = field(default_factory = list)
+    changes : List[Tuple[int, SlotState]] = field(default_factory = list)
+    fingerprint : int = 0
+
+def encodeFull(seq : int, slots : List[SlotState], fingerprint : int) -> bytes:
+    flat = [v for s in slots for v in s]
+    return (HEADER.pack(FULL, seq, len(slots)) + FINGERPRINT.pack(fingerprint)
+            + struct.pack(f"<{len(flat)}H", *flat))
+
+def encodeDiff(seq : int, changes : List[Tuple[int, SlotState]]) -> bytes:
+    flat = [v for idx, (o, q, d) in changes for v in (idx, o, q, d)]
+    return HEADER.pack(DIFF, seq, len(changes)) + struct.pack(f"<{len(flat)}H", *flat)
+
+def decode(data : bytes) -> Message:
+    kind, seq, count = HEADER.unpack_from(data, 0)
+    off = HEADER.size
+    if kind == FULL:
+        (fingerprint,) = FINGERPRINT.unpack_from(data, off)
+        flat = struct.unpack_from(f"<{count * 3}H", data, off + FINGERPRINT.size)
+        it = iter(flat)
+        return Message(FULL, seq, slots = list(zip(it, it, it)), fingerprint = fingerprint)
+    if kind == DIFF:
+        flat = struct.unpack_from(f"<{count * 4}H", data, off)
+        it = iter(flat)
+        return Message(DIFF, seq, changes = [(i, (o, q, d)) for i, o, q, d in zip(it, it, it, it)])
+    raise ValueError(f"unknown message kind {kind}")
+
+class InventoryPublisher:
+    """
+    Server side of one Inventory's stream.
+
+    poll() compares the slots with what was last sent and encodes only the
+    changed ones as a DIFF (None if nothing changed); the same bytes go to
+    every client. full() encodes a FULL resync at the current sequence number,
+    cached until the next change, so any number of lagging clients share it.
+    """
+    def __init__(self, inv : "Inventory", codebook : Codebook) -> None:
+        self.inv = inv
+        self.codebook = codebook
+        self.seq = 0
+        self._sent : List[SlotState] = [EMPTY] * inv.capacity
+        self._full : Optional[bytes] = None
+        self.poll()
+
+    def slotState(self, idx : int) -> SlotState:
+        s = self.inv.slots[idx]
+        if s is None:
+            return EMPTY
+        return (self.codebook.ordinals.get(s.item_id, 0), min(s.qty, MAX_U16),
+                quantizeDurability(self.inv.items.durabilityRatio(s.iid)))
+
+    def poll(self) -> Optional[bytes]:
+        sent = self._sent
+        changes : List[Tuple[int, SlotState]] = []
+        for idx in range(self.inv.capacity):
+            state = self.slotState(idx)
+            if state != sent[idx]:
+                sent[idx] = state
+                changes.append((idx, state))
+        if not changes:
+            return None
+        self.seq += 1
+        self._full = None
+
+        return encodeDiff(self.seq, changes)
+
+    def full(self) -> bytes:
+        if self._full is None:
+            self._full = encodeFull(self.seq, self._sent, self.codebook.fingerprint)
+        return self._full
+
+class InventoryMirror:
+    """
+    Client side: rebuilds slot state from FULL and DIFF messages.
+
+    A DIFF is applied only if its seq directly follows the last one seen;
+    otherwise (a dropped packet, or no FULL yet) the mirror sets
+    needs_resync and ignores DIFFs until a FULL arrives.
+    """
+    def __init__(self, codebook : Codebook) -> None:
+        self.codebook = codebook
+        self.slots : List[SlotState] = []
+        self.seq = -1
+        self.needs_resync = True
+
+    def apply(self, data : bytes) -> bool:
+        """True if the message was applied."""
+        msg = decode(data)
+        if msg.kind == FULL:
+            if msg.fingerprint != self.codebook.fingerprint:
+                raise ValueError("server item catalog does not match this client's")
+            self.slots = msg.slots
+            self.seq = msg.seq
+            self.needs_resync = False
+            return True
+        if self.needs_resync or msg.seq != self.seq + 1:
+            self.needs_resync = True
+            return False
+        for idx, state in msg.changes:
+            self.slots[idx] = state
+        self.seq = msg.seq
+
+        return True
+
+    def slot(self, idx : int) -> Optional[Tuple[str, int, Optional[float]]]:
+        """(item_id, qty, durability ratio) or None for an empty slot."""
+        ordinal, qty, dur = self.slots[idx]
+        if ordinal == 0:
+            return None
+        return self.codebook.ids[ordinal], qty, dequantizeDurability(dur)
+
+    def __str__(self) -> str:
+        parts = []
+        for i in range(len(self.slots)):
+            s = self.slot(i)
+            parts.append(f"{i:02d}: empty" if s is None else f"{i:02d}: {s[0]} x{s[1]}")
+        return " | ".join(parts)
@@ -0,0 +1,68 @@
+import random
+from typing import List, Optional
+from .diff import Codebook, InventoryMirror, InventoryPublisher
+
+class LoopbackClient:
+    """
+    In-process stand-in for a remote client: a mirror behind a lossy channel.
+    'drop_rate' of the messages sent to it are lost (seeded, so runs repeat).
+    """
+    def __init__(self, codebook : Codebook, *, drop_rate : float = 0.0, seed : int = 0) -> None:
+        self.mirror = InventoryMirror(codebook)
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.received = 0
+        self.dropped = 0
+        self.bytes_in = 0
+
+    def deliver(self, data : bytes) -> None:
+        if self.drop_rate and self.rng.random() < self.drop_rate:
+            self.dropped += 1
+            return
+        self.received += 1
+        self.bytes_in += len(data)
+        self.mirror.apply(data)
+
+class LoopbackServer:
+    """
+    Broadcasts one publisher's stream to local clients. Each tick sends the
+    new DIFF (if any) to everyone, then a FULL to whoever is out of sync.
+
+        server = LoopbackServer(InventoryPublisher(chest.inv, codebook))
+        client = server.connect()
+        chest.addInv("apple", 3)
+        server.tick()
+        assert str(client.mirror) == str(chest.inv)
+    """
+    def __init__(self, publisher : InventoryPublisher) -> None:
+        self.publisher = publisher
+        self.clients : List[LoopbackClient] = []
+        self.resyncs = 0
+
+    def connect(self, *, drop_rate : float = 0.0, seed : Optional[int] = None) -> LoopbackClient:
+        client = LoopbackClient(self.publisher.codebook, drop_rate = drop_rate,
+                                seed = len(self.clients) if seed is None else seed)
+        self.clients.append(client)
+        client.deliver(self.publisher.full())
+        return client
+
+    def disconnect(self, client : LoopbackClient) -> None:
+        if client in self.clients:
+            self.clients.remove(client)
+
+    def tick(self) -> int:
+        """Send pending changes; returns bytes sent."""
+        sent = 0
+        diff = self.publisher.poll()
+        if diff is not None:
+            for c in self.clients:
+                c.deliver(diff)
+            sent += len(diff) * len(self.clients)
+        for c in self.clients:
+            if c.mirror.needs_resync or c.mirror.seq != self.publisher.seq:
+                full = self.publisher.full()
+                c.deliver(full)
+                sent += len(full)
+                self.resyncs += 1
+
+        return sent
@@ -0,0 +1,149 @@
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class Effect:
+    """A parsed status effect string such as "+5% movement speed"."""
+    stat : str
+    value : float
+    percent : bool
+
+_EFFECT_RE = re.compile(r"^\s*([+-]?\d+(?:\.\d+)?)\s*(%?)\s*(.+?)\s*$")
+_parsed : Dict[str, Optional[Effect]] = {}
+
+def parseEffect(text : str) -> Optional[Effect]:
+    """'+5% movement speed' -> Effect('movement speed', 5.0, True); None if it doesn't parse."""
+    eff = _parsed.get(text, _parsed)
+    if eff is _parsed:
+        m = _EFFECT_RE.match(text)
+        eff = _parsed[text] = Effect(m.group(3).lower(), float(m.group(1)), bool(m.group(2))) if m else None
+    return eff
+
+Expired = Callable[[Hashable, str], None]
+
+class EffectTable:
+    """
+    Timed status effects for every owner (player, NPC) in one place.
+
+    Rows live in parallel lists (owner, stat, value, percent, expiry) with a
+    free list, so the table stays compact as effects come and go. Expiry is
+    driven by a single heap of (expires_at, row, generation): advance(now)
+    pops only what is due, never scanning owners. Re-applying an effect an
+    owner already has refreshes it in place (later expiry, and the stronger
+    value by magnitude, so a -20% debuff beats a -5% one); the superseded
+    heap entry is skipped by its stale generation. Drive it with
+    advance(now) or update(dt) from the game or server tick.
+    """
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.owner : List[Optional[Hashable]] = []
+        self.stat : List[str] = []
+        self.value : List[float] = []
+        self.percent : List[bool] = []
+        self.expires : List[float] = []
+        self.gen : List[int] = []
+        self._free : List[int] = []
+        self._heap : List[Tuple[float, int, int]] = []
+        # owner -> {stat: row}
+        self._by_owner : Dict[Hashable, Dict[str, int]] = {}
+        self.listeners : List[Expired] = []
+
+    def __len__(self) -> int:
+        return len(self.owner) - len(self._free)
+
+    def apply(self, owner : Hashable, effect : Effect, duration : float, *, now : Optional[float] = None) -> int:
+        """Give owner 'effect' for 'duration' seconds from now; returns its row."""
+        entry = self._place(owner, effect, (self.now if now is None else now) + duration)
+        heapq.heappush(self._heap, entry)
+        return entry[1]
+
+    def applyMany(self, grants : List[Tuple[Hashable, Effect, float]], *, now : Optional[float] = None) -> None:
+        """Batch apply: heap entries are merged with one heapify instead of a push each."""
+        t = self.now if now is None else now
+        entries = [self._place(owner, eff, t + duration) for owner, eff, duration in grants]
+        if len(entries) > len(self._heap):
+            self._heap.extend(entries)
+            heapq.heapify(self._heap)
+        else:
+            for e in entries:
+                heapq.heappush(self._heap, e)
+
+    def _place(self, owner : Hashable, effect : Effect, expires : float) -> Tuple[float, int, int]:
+        rows = self._by_owner.setdefault(owner, {})
+        row = rows.get(effect.stat)
+        if row is not None:
+            if abs(effect.value) > abs(self.value[row]):
+                self.value[row], self.percent[row] = effect.value, effect.percent
+            self.expires[row] = max(self.expires[row], expires)
+            self.gen[row] += 1
+        elif self._free:
+            row = self._free.pop()
+            self.owner[row], self.stat[row], self.value[row] = owner, effect.stat, effect.value
+            self.percent[row], self.expires[row] = effect.percent, expires
+            self.gen[row] += 1
+        else:
+            row = len(self.owner)
+            self.owner.append(owner)
+            self.stat.append(effect.stat)
+            self.value.append(effect.value)
+            self.percent.append(effect.percent)
+            self.expires.append(expires)
+            self.gen.append(0)
+        rows[effect.stat] = row
+
+        return (self.expires[row], row, self.gen[row])
+
+    def advance(self, now : float) -> int:
+        """Expire everything due by 'now'; returns how many effects ended."""
+        self.now = now
+        heap = self._heap
+        ended = 0
+        while heap and heap[0][0] <= now:
+            _, row, gen = heapq.heappop(heap)
+            if gen != self.gen[row] or self.owner[row] is None:
+                continue
+            owner, stat = self.owner[row], self.stat[row]
+            self._clear(row)
+            ended += 1
+            for fn in list(self.listeners):
+                fn(owner, stat)
+
+        return ended
+
+    def update(self, dt : float) -> int:
+        return self.advance(self.now + dt)
+
+    def _clear(self, row : int) -> None:
+        owner = self.owner[row]
+        rows = self._by_owner.get(owner)
+        if rows is not None:
+            rows.pop(self.stat[row], None)
+            if not rows:
+                del self._by_owner[owner]
+        self.owner[row] = None
+        self.gen[row] += 1
+        self._free.append(row)
+
+    def remove(self, owner : Hashable, stat : Optional[str] = None) -> None:
+        """Drop one of owner's effects, or all of them."""
+        rows = self._by_owner.get(owner, {})
+        for s in ([stat] if stat is not None else list(rows)):
+            row = rows.get(s)
+            if row is not None:
+                self._clear(row)
+
+    def active(self, owner : Hashable) -> Dict[str, Tuple[float, bool, float]]:
+        """{stat: (value, percent, seconds left)} for owner."""
+        return {s : (self.value[r], self.percent[r], max(0.0, self.expires[r] - self.now))
+                for s, r in self._by_owner.get(owner, {}).items()}
+
+    def modifier(self, owner : Hashable, stat : str) -> Tuple[float, bool]:
+        """(value, percent) of owner's active effect on 'stat', or (0.0, False)."""
+        row = self._by_owner.get(owner, {}).get(stat)
+        return (0.0, False) if row is None else (self.value[row], self.percent[row])
+
+    def nextExpiry(self) -> Optional[float]:
+        """Earliest pending expiry time (may be a stale entry), for timer-driven callers."""
+        return self._heap[0][0] if self._heap else None
@@ -0,0 +1,154 @@
+import math
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from inventory.items import ItemDef, Items
+from inventory.inventory import ItemStack
+
+if TYPE_CHECKING:
+    from inventory.inventory import Inventory
+
+SLOTS : Tuple[str, ...] = ("head", "body", "legs", "feet", "weapon", "offhand")
+SLOT_INDEX : Dict[str, int] = {s : i for i, s in enumerate(SLOTS)}
+# wear is tracked in steps of 1/WEAR_STEPS of max durability
+WEAR_STEPS = 20
+
+def allowedSlots(d : Optional[ItemDef]) -> Tuple[str, ...]:
+    """
+    Equipment slots an item may go in: its slot-name tags, else weapon ->
+    weapon and armor -> body. Empty if it can't be equipped.
+    """
+    if d is None:
+        return ()
+    tagged = tuple(tag for tag in d.tags if tag in SLOTS)
+    if tagged:
+        return tagged
+    if "weapon" in d.tags:
+        return ("weapon",)
+    if "armor" in d.tags:
+        return ("body",)
+    return ()
+
+def slotFor(d : Optional[ItemDef]) -> Optional[str]:
+    """Default equipment slot for an item (the first of allowedSlots), or None."""
+    allowed = allowedSlots(d)
+    return allowed[0] if allowed else None
+
+class Equipment:
+    """
+    What a player is wearing and wielding, with the totals combat reads.
+
+    'damage' and 'protection' are plain attributes holding the sums of
+    base_damage / base_protection over equipped items, each scaled by its
+    durability ratio rounded up to the next 1/WEAR_STEPS. They are
+    recomputed only when gear is equipped or removed, or when an equipped
+    item's wear crosses into another step (Items durability watchers), so
+    reading them costs nothing per hit.
+
+    'slots' is a plain slot list in SLOTS order, so a WorldLedger can
+    register it like an Inventory and equipped stacks stay in its totals.
+    """
+    def __init__(self, items : Items) -> None:
+        self.items = items
+        self.slots : List[Optional[ItemStack]] = [None] * len(SLOTS)
+        self.damage = 0.0
+        self.protection = 0.0
+        self.recomputes = 0
+        # iid -> wear step last used in the totals
+        self._steps : Dict[str, int] = {}
+
+    def _step(self, iid : Optional[str]) -> int:
+        ratio = self.items.durabilityRatio(iid)
+        if ratio is None:
+            return WEAR_STEPS
+        return max(0, min(WEAR_STEPS, math.ceil(ratio * WEAR_STEPS - 1e-9)))
+
+    def _recompute(self) -> None:
+        damage = protection = 0.0
+        for s in self.slots:
+            if s is None:
+                continue
+            d = self.items.defs.get(s.item_id)
+            if d is None:
+                continue
+            scale = self._steps.get(s.iid, WEAR_STEPS) / WEAR_STEPS if s.iid else 1.0
+            if d.base_damage is not None:
+                damage += d.base_damage * scale
+            if d.base_protection is not None:
+                protection += d.base_protection * scale
+        self.damage = damage
+        self.protection = protection
+        self.recomputes += 1
+
+    def _onWear(self, iid : str, old : float, new : float) -> None:
+        step = self._step(iid)
+        if step != self._steps.get(iid):
+            self._steps[iid] = step
+            self._recompute()
+
+    def _attach(self, stack : ItemStack) -> None:
+        if stack.iid:
+            self._steps[stack.iid] = self._step(stack.iid)
+            self.items.watchDurability(stack.iid, self._onWear)
+
+    def _detach(self, stack : ItemStack) -> None:
+        if stack.iid:
+            self._steps.pop(stack.iid, None)
+            self.items.unwatchDurability(stack.iid, self._onWear)
+
+    def equip(self, inv : "Inventory", idx : int, slot : Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Move the item in inv slot 'idx' into its equipment slot, or into
+        'slot' if that is one the item allows. Whatever was equipped there
+        goes back into inv at 'idx'. Items a reservation holds stay put.
+        """
+        if not (0 <= idx < inv.capacity):
+            return False, "Invalid slot index."
+        # check and write under one hold of the lock (see ConcurrentInventory)
+        with inv.lock:
+            return self._equipLocked(inv, idx, slot)
+
+    def _equipLocked(self, inv : "Inventory", idx : int, slot : Optional[str]) -> Tuple[bool, str]:
+        stack = inv.slots[idx]
+        if stack is None:
+            return False, "Nothing to equip."
+        allowed = allowedSlots(self.items.defs.get(stack.item_id))
+        if not allowed:
+            return False, f"'{stack.item_id}' cannot be equipped."
+        target = slot or allowed[0]
+        if target not in allowed:
+            return False, f"'{stack.item_id}' does not go in the {target} slot."
+        if stack.qty != 1:
+            return False, "Equip one item at a time."
+        k = SLOT_INDEX[target]
+        old = self.slots[k]
+        if not inv.canTakeOut(stack, old):
+            return False, f"'{stack.item_id}' is reserved."
+        inv.slots[idx] = old
+        if old is not None:
+            self._detach(old)
+        self.slots[k] = stack
+        self._attach(stack)
+        self._recompute()
+
+        return True, "Equipped."
+
+    def unequip(self, slot : str, inv : "Inventory") -> Tuple[bool, str]:
+        """Put the item in 'slot' into the first empty inventory slot (keeping its iid)."""
+        k = SLOT_INDEX.get(slot)
+        stack = None if k is None else self.slots[k]
+        if stack is None:
+            return False, "Nothing equipped there."
+        with inv.lock:
+            idx = next((i for i, s in enumerate(inv.slots) if s is None), None)
+            if idx is None:
+                return False, "No free inventory slot."
+            inv.slots[idx] = stack
+        self.slots[k] = None
+        self._detach(stack)
+        self._recompute()
+
+        return True, "Unequipped."
+
+    def equipped(self, slot : str) -> Optional[str]:
+        i = SLOT_INDEX.get(slot)
+        s = None if i is None else self.slots[i]
+        return s.item_id if s else None
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from inventory.items import ItemDef
+from .effects import Effect, EffectTable, parseEffect
+
+if TYPE_CHECKING:
+    from .player import Player
+
+# food whose def has status effects but no effect_duration
+DEFAULT_EFFECT_DURATION = 30.0
+
+@dataclass
+class Stats:
+    health : float = 20.0
+    max_health : float = 20.0
+    hunger : float = 20.0
+    max_hunger : float = 20.0
+
+@dataclass(frozen=True)
+class FoodProfile:
+    """What eating one item does, worked out once per item id."""
+    hunger_fill : float
+    health_fill : float
+    effects : Tuple[Effect, ...]
+    duration : float
+
+_profiles : Dict[ItemDef, Optional[FoodProfile]] = {}
+
+def foodProfile(d : Optional[ItemDef]) -> Optional[FoodProfile]:
+    """None if the item is not something you can eat."""
+    if d is None:
+        return None
+    prof = _profiles.get(d, _profiles)
+    if prof is _profiles:
+        if d.hunger_fill is None and d.health_fill is None:
+            prof = None
+        else:
+            effects = tuple(e for e in (parseEffect(t) for t in d.status_effects) if e)
+            duration = d.effect_duration if d.effect_duration is not None else DEFAULT_EFFECT_DURATION
+            prof = FoodProfile(d.hunger_fill or 0.0, d.health_fill or 0.0, effects, duration)
+        _profiles[d] = prof
+    return prof
+
+def applyFood(stats : Stats, prof : FoodProfile) -> None:
+    stats.hunger = min(stats.max_hunger, stats.hunger + prof.hunger_fill)
+    stats.health = min(stats.max_health, stats.health + prof.health_fill)
+
+def eat(player : "Player", item_id : str) -> Tuple[bool, str]:
+    prof = foodProfile(player.inv.item_defs.get(item_id))
+    if prof is None:
+        return False, f"'{item_id}' is not edible."
+    if player.inv.remove(item_id, 1) < 1:
+        return False, f"No {item_id} to eat."
+    applyFood(player.stats, prof)
+    if prof.effects and player.effects is not None:
+        for eff in prof.effects:
+            player.effects.apply(player, eff, prof.duration)
+
+    return True, "Ate."
+
+def consumeMany(eaters : List[Tuple["Player", str]], effects : Optional[EffectTable] = None) -> List[bool]:
+    """
+    Batched eat for NPC crowds: one (player, item_id) per entry, results in order.
+    Food profiles are resolved once per item id, and every granted effect
+    goes into the table in a single applyMany (one heapify, not a push each).
+    Each eater's own table is used when 'effects' is not given.
+    """
+    results : List[bool] = []
+    grants : Dict[int, List[Tuple["Player", Effect, float]]] = {}
+    tables : Dict[int, EffectTable] = {}
+    cache : Dict[str, Optional[FoodProfile]] = {}
+    for player, item_id in eaters:
+        prof = cache.get(item_id, cache)
+        if prof is cache:
+            prof = cache[item_id] = foodProfile(player.inv.item_defs.get(item_id))
+        if prof is None or player.inv.remove(item_id, 1) < 1:
+            results.append(False)
+            continue
+        applyFood(player.stats, prof)
+        table = effects if effects is not None else player.effects
+        if prof.effects and table is not None:
+            tables[id(table)] = table
+            batch = grants.setdefault(id(table), [])
+            batch.extend((player, eff, prof.duration) for eff in prof.effects)
+        results.append(True)
+    for key, batch in grants.items():
+        tables[key].applyMany(batch)
+
+    return results
@@ -1,11 +1,27 @@
-from typing import Optional
+from typing import Optional, Tuple, TYPE_CHECKING
 from inventory.items import Items
 from inventory.inventory import Inventory
+from .food import Stats, eat
+from .equipment import Equipment
+
+if TYPE_CHECKING:
+    from inventory.ledger import WorldLedger
+    from .effects import EffectTable
 
 class Player:
-    def __init__(self, name : str, items : Items, inv_capacity : int = 30) -> None:
+    def __init__(self, name : str, items : Items, inv_capacity : int = 30, *,
+                 ledger : Optional["WorldLedger"] = None, effects : Optional["EffectTable"] = None) -> None:
         self.name = name
         self.inv = Inventory(capacity = inv_capacity, items = items)
+        if ledger is not None:
+            ledger.register(self.inv, name)
+        self.stats = Stats()
+        # shared world table of timed effects; None means food gives fills only
+        self.effects = effects
+        self.equipment = Equipment(items)
+        if ledger is not None:
+            # worn gear still counts toward the owner's totals
+            ledger.register(self.equipment, name)
 
     # <<----------- Inventory pass-through functions ----------->>
     def addInv(self, item_id : str, qty : int) -> int:
@@ -29,6 +45,31 @@ class Player:
     def count(self, item_id : str) -> int:
         return self.inv.count(item_id)
     
+    # <<----------- Food / effects ----------->>
+    def eat(self, item_id : str) -> Tuple[bool, str]:
+        """Eat one item_id from the inventory: apply its fills and timed effects."""
+        return eat(self, item_id)
+    
+    def modifier(self, stat : str) -> Tuple[float, bool]:
+        """(value, percent) of the active effect on 'stat', e.g. ("movement speed")."""
+        if self.effects is None:
+            return (0.0, False)
+        return self.effects.modifier(self, stat)
+    
+    # <<----------- Equipment ----------->>
+    def equip(self, idx : int, slot : Optional[str] = None) -> Tuple[bool, str]:
+        return self.equipment.equip(self.inv, idx, slot)
+    
+    def unequip(self, slot : str) -> Tuple[bool, str]:
+        return self.equipment.unequip(slot, self.inv)
+    
+    def attackDamage(self) -> float:
+        """Equipped damage scaled by wear; cached, so cheap to read per hit."""
+        return self.equipment.damage
+    
+    def totalProtection(self) -> float:
+        return self.equipment.protection
+    
     # additional inventory functions
     def showInventory(self, *, detailed : bool = False) -> None:
         """
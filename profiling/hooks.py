@@ -0,0 +1,130 @@
+import functools
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# (module, class) -> methods wrapped when profiling is enabled
+HOT_PATHS : Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("inventory.inventory", "Inventory") : ("add", "remove", "count", "sort"),
+    ("crafting.crafting", "Crafting") : ("canCraft", "craft"),
+    ("cooking.cooking", "CookingStation") : ("advance", "recipeOptions"),
+    ("inventory.items", "Items") : ("newInstance", "loseDurability"),
+}
+
+class Profiler:
+    """
+    Call counts and wall time for the HOT_PATHS methods.
+
+    Nothing is wrapped until enable(): the methods are swapped for timing
+    wrappers on their classes and swapped back by disable(), so a disabled
+    profiler costs nothing on the hot path.
+    Nested hot-path calls are tracked per thread, which gives self time per
+    method and per call stack (for flamegraph collapsed output).
+    """
+    def __init__(self, targets : Optional[Dict[Tuple[str, str], Tuple[str, ...]]] = None) -> None:
+        self.targets = targets if targets is not None else HOT_PATHS
+        self.calls : Dict[str, int] = {}
+        self.total_ns : Dict[str, int] = {}
+        self.self_ns : Dict[str, int] = {}
+        self.stacks : Dict[Tuple[str, ...], int] = {}
+        self._originals : List[Tuple[type, str, Callable]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        for (mod_name, cls_name), methods in self.targets.items():
+            cls = getattr(importlib.import_module(mod_name), cls_name)
+            for m in methods:
+                original = cls.__dict__[m]
+                self._originals.append((cls, m, original))
+                setattr(cls, m, self._wrap(f"{cls_name}.{m}", original))
+
+    def disable(self) -> None:
+        for cls, m, original in reversed(self._originals):
+            setattr(cls, m, original)
+        self._originals = []
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.total_ns.clear()
+            self.self_ns.clear()
+            self.stacks.clear()
+
+    def _stack(self) -> List[list]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _wrap(self, name : str, fn : Callable) -> Callable:
+        clock = time.perf_counter_ns
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            # frame = [name, time spent in nested hot-path calls]
+            frame = [name, 0]
+            stack.append(frame)
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - t0
+                path = tuple(f[0] for f in stack)
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                own = elapsed - frame[1]
+                with self._lock:
+                    self.calls[name] = self.calls.get(name, 0) + 1
+                    self.total_ns[name] = self.total_ns.get(name, 0) + elapsed
+                    self.self_ns[name] = self.self_ns.get(name, 0) + own
+                    self.stacks[path] = self.stacks.get(path, 0) + own
+
+        return wrapper
+
+    def table(self) -> str:
+        """Text table sorted by total time, slowest first."""
+        lines = [f"{'method':<30} {'calls':>10} {'total ms':>11} {'self ms':>11} {'avg us':>9}"]
+        for name in sorted(self.total_ns, key = self.total_ns.get, reverse = True):
+            calls = self.calls[name]
+            total = self.total_ns[name]
+            lines.append(f"{name:<30} {calls:>10} {total / 1e6:>11.3f} {self.self_ns[name] / 1e6:>11.3f} "
+                         f"{total / calls / 1e3:>9.2f}")
+
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """
+        Brendan Gregg's collapsed stack format, one 'a;b;c <self microseconds>'
+        line per distinct stack; feed to flamegraph.pl or speedscope.
+        """
+        return "\n".join(f"{';'.join(path)} {ns // 1000}"
+                         for path, ns in sorted(self.stacks.items()) if ns >= 1000)
+
+    def writeCollapsed(self, path : Path) -> None:
+        path.write_text(self.collapsed() + "\n", encoding = "utf-8")
+
+@contextmanager
+def profiled(profiler : Optional[Profiler] = None) -> Iterator[Profiler]:
+    """
+    with profiled() as prof:
+        ...
+    print(prof.table())
+    """
+    prof = profiler or Profiler()
+    prof.enable()
+    try:
+        yield prof
+    finally:
+        prof.disable()
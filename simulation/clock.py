@@ -0,0 +1,201 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from inventory.inventory import Inventory
+from cooking.cooking import CookingStation
+from cooking.lanes import MultiLaneStation
+
+# methods a command may call, per target kind; replay logs are data, not code
+ALLOWED_OPS : Dict[str, Tuple[str, ...]] = {
+    "inventory" : ("add", "remove", "move", "split", "splitHalf", "sort", "setSlot"),
+    "station" : ("addIngredient", "setRecipe", "selectRecipeByKey", "setBurningEnabled",
+                 "enqueue", "cancelJob", "clearQueue", "collectCooked", "collectBurned"),
+}
+
+@dataclass
+class ReplayLog:
+    """
+    Everything needed to rerun a simulation: the step size, the commands
+    (tick, target, op, args, kwargs) in submission order, and how many ticks ran.
+    Object references in args are stored as {"$ref": name}.
+    """
+    step : float
+    commands : List[list] = field(default_factory = list)
+    ticks : int = 0
+    digest : Optional[str] = None
+
+    def save(self, path : Path) -> None:
+        path.write_text(json.dumps({"step" : self.step, "ticks" : self.ticks, "digest" : self.digest,
+                                    "commands" : self.commands}, separators = (",", ":")),
+                        encoding = "utf-8")
+
+    @classmethod
+    def load(cls, path : Path) -> "ReplayLog":
+        doc = json.loads(path.read_text(encoding = "utf-8"))
+        return cls(step = float(doc["step"]), commands = doc["commands"],
+                   ticks = int(doc["ticks"]), digest = doc.get("digest"))
+
+class SimClock:
+    """
+    Fixed-timestep driver for stations and inventory operations.
+
+    update(frame_dt) accumulates wall/frame time and runs whole ticks of
+    'step' seconds, so CookingStation.advance always sees the same dt no
+    matter the frame rate. Inventory and station operations are submitted as
+    commands and applied at the start of the next tick, in submission order,
+    and every command is recorded so the run can be replayed exactly.
+
+        clock = SimClock(step = 0.05)
+        clock.register("chest", chest.inv)
+        clock.register("oven", oven)
+        clock.submit("oven", "addIngredient", 0, "apple", 3)
+        clock.update(frame_dt)          # each frame
+        clock.log.save(Path("bug.replay"))
+    """
+    def __init__(self, step : float = 0.05, *, max_ticks_per_update : int = 8) -> None:
+        if step <= 0:
+            raise ValueError("step must be positive")
+        self.step = step
+        self.max_ticks_per_update = max_ticks_per_update
+        self.tick = 0
+        self.accumulator = 0.0
+        self.dropped = 0.0
+        self.targets : Dict[str, object] = {}
+        self.kinds : Dict[str, str] = {}
+        self.pending : List[list] = []
+        self.log = ReplayLog(step = step)
+        # return values of the commands applied by the last tick
+        self.results : List[object] = []
+
+    def register(self, name : str, target : object) -> None:
+        if name in self.targets:
+            raise ValueError(f"target '{name}' already registered")
+        self.targets[name] = target
+        self.kinds[name] = self._kindOf(target)
+
+    def _kindOf(self, target : object) -> str:
+        if isinstance(target, Inventory):
+            return "inventory"
+        if isinstance(target, CookingStation):
+            return "station"
+        raise TypeError(f"cannot simulate {type(target).__name__}; register its Inventory or CookingStation")
+
+    def submit(self, target : str, op : str, *args, **kwargs) -> None:
+        """Queue target.op(*args, **kwargs) for the start of the next tick."""
+        kind = self.kinds.get(target)
+        if kind is None:
+            raise KeyError(f"unknown target '{target}'")
+        if op not in ALLOWED_OPS[kind]:
+            raise ValueError(f"'{op}' is not a simulated {kind} operation")
+        self.pending.append([target, op, [self._encode(a) for a in args],
+                             {k : self._encode(v) for k, v in kwargs.items()}])
+
+    def _encode(self, value : object) -> object:
+        for name, t in self.targets.items():
+            if value is t:
+                return {"$ref" : name}
+        return value
+
+    def _decode(self, value : object) -> object:
+        if isinstance(value, dict) and "$ref" in value:
+            return self.targets[value["$ref"]]
+        return value
+
+    def update(self, frame_dt : float) -> int:
+        """
+        Add frame time and run as many whole ticks as it covers.
+        Time beyond max_ticks_per_update is dropped (and counted in 'dropped')
+        rather than letting a slow frame snowball. Returns ticks run.
+        """
+        if frame_dt > 0:
+            self.accumulator += frame_dt
+        ran = 0
+        while self.accumulator >= self.step and ran < self.max_ticks_per_update:
+            self.accumulator -= self.step
+            self.runTick()
+            ran += 1
+        if self.accumulator >= self.step:
+            self.dropped += self.accumulator
+            self.accumulator = 0.0
+
+        return ran
+
+    def runTick(self) -> None:
+        pending, self.pending = self.pending, []
+        self.results = []
+        for target, op, args, kwargs in pending:
+            self._apply(target, op, args, kwargs)
+            self.log.commands.append([self.tick, target, op, args, kwargs])
+        for name, t in self.targets.items():
+            if self.kinds[name] == "station":
+                t.advance(self.step)
+        self.tick += 1
+        self.log.ticks = self.tick
+
+    def runTicks(self, n : int) -> None:
+        for _ in range(n):
+            self.runTick()
+
+    def _apply(self, target : str, op : str, args : list, kwargs : dict) -> None:
+        fn = getattr(self.targets[target], op)
+        self.results.append(fn(*[self._decode(a) for a in args],
+                               **{k : self._decode(v) for k, v in kwargs.items()}))
+
+    # <<----------- State digest ----------->>
+    def snapshot(self) -> list:
+        """
+        Comparable state of every target. Instance ids (uuid) differ between
+        runs, so per-instance state is captured by durability instead.
+        A MultiLaneStation adds each lane's progress, recipe and job.
+        """
+        state = []
+        for name in sorted(self.targets):
+            t = self.targets[name]
+            if self.kinds[name] == "inventory":
+                state.append((name, [None if s is None else (s.item_id, s.qty, t.items.getDurability(s.iid))
+                                     for s in t.slots]))
+            else:
+                entry = (name, t.active_recipe, round(t.job_elapsed, 9), round(t.burn_elapsed, 9),
+                         [(s.item_id, s.qty) for s in t.inputs],
+                         [(s.item_id, s.qty) for s in t.cooked_out],
+                         [(s.item_id, s.qty) for s in t.burned_out],
+                         [(j.job_id, j.recipe_key, j.qty, j.priority, j.done) for j in t.jobs],
+                         t.next_job_id)
+                if isinstance(t, MultiLaneStation):
+                    entry += ([(round(e, 9), round(c, 9), k, None if j is None else j.job_id)
+                               for e, c, k, j in zip(t.lane_elapsed, t.lane_cook_time,
+                                                     t.lane_recipe, t.lane_job)],)
+                state.append(entry)
+
+        return state
+
+    def digest(self) -> str:
+        return hashlib.sha256(repr((self.tick, self.snapshot())).encode("utf-8")).hexdigest()
+
+    def seal(self) -> ReplayLog:
+        """Stamp the log with the current state digest, ready to save."""
+        self.log.digest = self.digest()
+        return self.log
+
+def replay(log : ReplayLog, build : Callable[[SimClock], None]) -> SimClock:
+    """
+    Rerun a recorded simulation. 'build' must register the same targets,
+    in the same starting state, on the fresh clock it is given.
+    Raises RuntimeError if the log carries a digest that does not match.
+    """
+    clock = SimClock(step = log.step)
+    build(clock)
+    by_tick : Dict[int, List[list]] = {}
+    for tick, target, op, args, kwargs in log.commands:
+        by_tick.setdefault(tick, []).append([target, op, args, kwargs])
+    for tick in range(log.ticks):
+        for target, op, args, kwargs in by_tick.get(tick, ()):
+            clock.pending.append([target, op, args, kwargs])
+        clock.runTick()
+    if log.digest is not None and clock.digest() != log.digest:
+        raise RuntimeError("replay diverged from the recorded run")
+
+    return clock
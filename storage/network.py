@@ -0,0 +1,244 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+from inventory.items import Items
+from inventory.inventory import Inventory, ItemStack
+from inventory.ledger import tapSlots, untapSlots
+from .storage import Storage
+
+def _addNested(books : Dict[str, Dict[int, int]], outer : str, inner : int, delta : int) -> None:
+    book = books.setdefault(outer, {})
+    n = book.get(inner, 0) + delta
+    if n:
+        book[inner] = n
+    else:
+        book.pop(inner, None)
+        if not book:
+            del books[outer]
+
+def _splitHeld(inv : Inventory) -> Tuple[List[ItemStack], List[ItemStack]]:
+    """(stacks covering inv.held, everything else) from inv's slots, splitting the stack a hold ends in."""
+    need = dict(inv.held)
+    held : List[ItemStack] = []
+    rest : List[ItemStack] = []
+    for s in inv.slots:
+        if s is None:
+            continue
+        n = need.get(s.item_id, 0)
+        if n <= 0:
+            rest.append(s)
+            continue
+        take = min(n, s.qty)
+        need[s.item_id] = n - take
+        if take == s.qty:
+            held.append(s)
+        else:
+            held.append(ItemStack(s.item_id, take, s.iid))
+            rest.append(ItemStack(s.item_id, s.qty - take, s.iid))
+
+    return held, rest
+
+def _sortedStacks(items : Items, stacks : List[ItemStack]) -> List[ItemStack]:
+    """stacks merged and ordered by Inventory.sort, with the empty slots dropped."""
+    tmp = Inventory(len(stacks), items)
+    tmp.slots = list(stacks)
+    tmp.sort()
+    return [s for s in tmp.slots if s is not None]
+
+class StorageNetwork:
+    """
+    Linked Storage chests used as one logical inventory.
+
+        net = StorageNetwork(items, chests)
+        net.add("wood", 500)        # tops up chests already holding wood first
+        net.count("wood")           # O(1)
+        net.remove("wood", 120)
+        net.sort()                  # merge and order across every chest
+
+    Each chest's slot list is tapped (see inventory.ledger), so a merged
+    index of item -> {chest: qty} and each chest's free slot count stay
+    exact whether items move through the network or straight through a
+    chest. add/remove only visit chests the index points at, never every
+    chest's slots (holders whose stacks are all full are skipped by a
+    per-chest count of partial stacks). Positions are stable link order; free space is handed
+    out from the lowest linked chest first.
+    """
+    def __init__(self, items : Items, chests : Iterable[Storage] = (), name : str = "Network") -> None:
+        self.items = items
+        self.name = name
+        self.totals : Dict[str, int] = {}
+        # position -> chest, in link order; id(chest) -> position
+        self._chests : Dict[int, Storage] = {}
+        self._pos : Dict[int, int] = {}
+        self._next = 0
+        # item_id -> {position: qty}; item_id -> {position: stacks below max size}
+        self._holders : Dict[str, Dict[int, int]] = {}
+        self._partial : Dict[str, Dict[int, int]] = {}
+        # position -> empty slot count (chests with none are absent); heap of candidates
+        self._free : Dict[int, int] = {}
+        self._free_heap : List[int] = []
+        for chest in chests:
+            self.link(chest)
+
+    def __len__(self) -> int:
+        return len(self._chests)
+
+    @property
+    def capacity(self) -> int:
+        return sum(c.inv.capacity for c in self._chests.values())
+
+    def chests(self) -> List[Storage]:
+        return list(self._chests.values())
+
+    # <<----------- Linking ----------->>
+    def link(self, chest : Storage) -> int:
+        """Add chest to the network; returns its position."""
+        if id(chest) in self._pos:
+            raise ValueError(f"'{chest.name}' is already linked to {self.name}")
+        pos = self._next
+        self._next += 1
+        self._chests[pos] = chest
+        self._pos[id(chest)] = pos
+        tapSlots(chest.inv, self, pos)
+        empty = 0
+        for s in chest.inv.slots:
+            if s is None:
+                empty += 1
+            else:
+                self._bump(pos, s, 1)
+        self._addFree(pos, empty)
+
+        return pos
+
+    def unlink(self, chest : Storage) -> None:
+        pos = self._pos.pop(id(chest), None)
+        if pos is None:
+            return
+        for s in chest.inv.slots:
+            if s is not None:
+                self._bump(pos, s, -1)
+        untapSlots(chest.inv, self)
+        del self._chests[pos]
+        self._free.pop(pos, None)
+
+    def _slotChanged(self, pos : int, old : Optional[ItemStack], new : Optional[ItemStack]) -> None:
+        if old is not None:
+            self._bump(pos, old, -1)
+        elif new is not None:
+            self._addFree(pos, -1)
+        if new is not None:
+            self._bump(pos, new, 1)
+        elif old is not None:
+            self._addFree(pos, 1)
+
+    def _bump(self, pos : int, stack : ItemStack, sign : int) -> None:
+        item_id = stack.item_id
+        delta = sign * stack.qty
+        qty = self.totals.get(item_id, 0) + delta
+        if qty:
+            self.totals[item_id] = qty
+        else:
+            self.totals.pop(item_id, None)
+        _addNested(self._holders, item_id, pos, delta)
+        d = self.items.defs.get(item_id)
+        if d is not None and stack.qty < d.stack_size:
+            _addNested(self._partial, item_id, pos, sign)
+
+    def _addFree(self, pos : int, delta : int) -> None:
+        n = self._free.get(pos, 0) + delta
+        if n > 0:
+            if pos not in self._free:
+                heapq.heappush(self._free_heap, pos)
+            self._free[pos] = n
+        else:
+            self._free.pop(pos, None)
+
+    def _firstFree(self) -> Optional[int]:
+        # lazy heap: drop positions that have since filled up or been unlinked
+        heap = self._free_heap
+        while heap and heap[0] not in self._free:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    # <<----------- Network operations ----------->>
+    def add(self, item_id : str, qty : int) -> int:
+        """
+        Add qty across the network: chests already holding item_id first,
+        then free slots. Returns how many were added.
+        """
+        if item_id not in self.items.defs:
+            print(f"Unkown item: {item_id}")
+            return 0
+        left = qty
+        # holders with room: a stack below max size, or an empty slot of their own
+        partial = self._partial.get(item_id, {})
+        for pos in [p for p in self._holders.get(item_id, ()) if p in partial or p in self._free]:
+            left -= self._chests[pos].inv.add(item_id, left)
+            if left <= 0:
+                return qty
+        while left > 0:
+            pos = self._firstFree()
+            if pos is None:
+                break
+            added = self._chests[pos].inv.add(item_id, left)
+            if added <= 0:
+                break
+            left -= added
+
+        return qty - left
+
+    def remove(self, item_id : str, qty : int) -> int:
+        """Remove up to qty from whichever chests hold it. Returns how many were removed."""
+        left = qty
+        for pos in list(self._holders.get(item_id, ())):
+            left -= self._chests[pos].inv.remove(item_id, left)
+            if left <= 0:
+                break
+
+        return qty - left
+
+    def count(self, item_id : str) -> int:
+        return self.totals.get(item_id, 0)
+
+    def find(self, item_id : str) -> List[Tuple[Storage, int]]:
+        """(chest, qty) for every chest holding item_id, in link order."""
+        return [(self._chests[pos], qty) for pos, qty in sorted(self._holders.get(item_id, {}).items())]
+
+    def freeSlots(self) -> int:
+        return sum(self._free.values())
+
+    def sort(self) -> None:
+        """
+        Inventory.sort over the whole network as if it were one long slot
+        list: like items are merged across chests, then packed from the
+        first chest onward in name order. What a chest's reservations hold
+        stays in that chest, sorted at its front; if pinning it leaves too
+        few slots for the rest, each chest is sorted on its own instead.
+        """
+        chests = list(self._chests.values())
+        pinned : List[List[ItemStack]] = []
+        loose : List[ItemStack] = []
+        for c in chests:
+            held, rest = _splitHeld(c.inv)
+            pinned.append(_sortedStacks(self.items, held))
+            loose.extend(rest)
+        loose = _sortedStacks(self.items, loose)
+        if len(loose) + sum(len(p) for p in pinned) > sum(c.inv.capacity for c in chests):
+            for c in chests:
+                c.inv.sort()
+            return
+        i = 0
+        for c, pins in zip(chests, pinned):
+            slots = c.inv.slots
+            for j in range(c.inv.capacity):
+                if j < len(pins):
+                    slots[j] = pins[j]
+                elif i < len(loose):
+                    slots[j] = loose[i]
+                    i += 1
+                else:
+                    slots[j] = None
+
+    def __str__(self) -> str:
+        if not self.totals:
+            return f"{self.name}: empty"
+        return f"{self.name}: " + ", ".join(f"{k} x{v}" for k, v in sorted(self.totals.items()))
@@ -1,11 +1,22 @@
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from inventory.items import Items
 from inventory.inventory import Inventory
 
+if TYPE_CHECKING:
+    from inventory.ledger import WorldLedger
+
 class Storage:
-    def __init__(self, items : Items, capacity : int = 20, name : str = "Storage") -> None:
+    def __init__(self, items : Items, capacity : int = 20, name : str = "Storage", *,
+                 concurrent : bool = False, ledger : Optional["WorldLedger"] = None) -> None:
         self.name = name
-        self.inv = Inventory(capacity = capacity, items = items)
+        if concurrent:
+            # shared chest: safe for many handler threads at once
+            from inventory.concurrent import ConcurrentInventory
+            self.inv = ConcurrentInventory(capacity = capacity, items = items)
+        else:
+            self.inv = Inventory(capacity = capacity, items = items)
+        if ledger is not None:
+            ledger.register(self.inv, name)
 
     # <<----------- Inventory pass-through functions ----------->>
     def addInv(self, item_id : str, qty : int) -> int: